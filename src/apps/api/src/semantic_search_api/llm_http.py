@@ -0,0 +1,104 @@
+"""Shared HTTP client for LLM provider calls.
+
+One `httpx.AsyncClient` is kept for the lifetime of the app so chat turns
+reuse keep-alive (and, for HTTPS providers, HTTP/2) connections instead of
+paying a new TCP and TLS handshake each time. Requests answered with 429 or
+503 are retried with exponential backoff, honouring `Retry-After` up to
+`LLM_RETRY_MAX_DELAY`; a provider asking for a longer wait gets its
+response passed straight back.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+import structlog
+
+from semantic_search_api.settings import get_settings
+
+logger = structlog.get_logger()
+
+RETRY_STATUSES = {429, 503}
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_llm_client() -> httpx.AsyncClient:
+    """Get the shared LLM HTTP client (created on first use)."""
+    global _client
+    if _client is None:
+        settings = get_settings()
+        _client = httpx.AsyncClient(
+            http2=settings.llm_http2,
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections,
+                keepalive_expiry=settings.llm_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(120.0, connect=10.0),
+        )
+    return _client
+
+
+async def close_llm_client() -> None:
+    """Close the shared LLM HTTP client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float | None:
+    """
+    Seconds to wait before retrying, from Retry-After or exponential backoff.
+
+    None if Retry-After asks for longer than `llm_retry_max_delay`.
+    """
+    settings = get_settings()
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        delay = float(retry_after)
+        return delay if delay <= settings.llm_retry_max_delay else None
+    return min(settings.llm_retry_backoff * (2 ** attempt), settings.llm_retry_max_delay)
+
+
+async def post_with_retry(url: str, **kwargs) -> httpx.Response:
+    """POST to an LLM provider, retrying on 429/503."""
+    client = get_llm_client()
+    max_retries = get_settings().llm_max_retries
+    for attempt in range(max_retries + 1):
+        response = await client.post(url, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+            return response
+        delay = _retry_delay(response, attempt)
+        if delay is None:
+            logger.warning("llm_retry_after_too_long", status=response.status_code)
+            return response
+        logger.warning("llm_request_retry", status=response.status_code, attempt=attempt + 1, delay=delay)
+        await asyncio.sleep(delay)
+    return response
+
+
+@asynccontextmanager
+async def stream_with_retry(url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+    """Open a streaming POST to an LLM provider, retrying on 429/503 before any output."""
+    client = get_llm_client()
+    max_retries = get_settings().llm_max_retries
+    for attempt in range(max_retries + 1):
+        request = client.build_request("POST", url, **kwargs)
+        response = await client.send(request, stream=True)
+        delay = None
+        if response.status_code in RETRY_STATUSES and attempt < max_retries:
+            delay = _retry_delay(response, attempt)
+            if delay is None:
+                logger.warning("llm_retry_after_too_long", status=response.status_code)
+        if delay is not None:
+            await response.aclose()
+            logger.warning("llm_request_retry", status=response.status_code, attempt=attempt + 1, delay=delay)
+            await asyncio.sleep(delay)
+            continue
+        try:
+            yield response
+        finally:
+            await response.aclose()
+        return
@@ -3,8 +3,10 @@ import structlog
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from semantic_search_api.llm_http import close_llm_client, get_llm_client
 from semantic_search_api.logging import configure_logging
-from semantic_search_api.routers import health, collections, uploads, jobs, search, chat
+from semantic_search_api.routers import health, collections, uploads, jobs, search, chat, metrics
+from semantic_search_api.settings import get_settings
 from semantic_search_core.jobs import init_db
 
 configure_logging()
@@ -17,6 +19,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
 
 app.include_router(health.router, prefix="/api")
@@ -25,6 +28,8 @@ app.include_router(uploads.router, prefix="/api")
 app.include_router(jobs.router, prefix="/api")
 app.include_router(search.router, prefix="/api")
 app.include_router(chat.router, prefix="/api")
+# Scraped by Prometheus inside the network, outside the /api prefix
+app.include_router(metrics.router)
 
 
 @app.on_event("startup")
@@ -32,6 +37,7 @@ def startup():
     """Initialize on startup."""
     logger.info("initializing_database")
     init_db()
+    get_llm_client()
     logger.info("preloading_embedding_model_this_may_take_a_minute")
     try:
         from semantic_search_core.embed import get_embedding_model
@@ -40,3 +46,20 @@ def startup():
         logger.info("embedding_model_ready")
     except Exception as e:
         logger.warning("embedding_model_preload_failed", error=str(e))
+    if get_settings().rerank_enabled:
+        try:
+            from semantic_search_core.search.rerank import get_rerank_model
+
+            get_rerank_model()
+            logger.info("rerank_model_ready")
+        except Exception as e:
+            logger.warning("rerank_model_preload_failed", error=str(e))
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release shared connection pools on shutdown."""
+    from semantic_search_core.search.opensearch import close_client
+
+    close_client()
+    await close_llm_client()
@@ -0,0 +1,45 @@
+"""Optional cross-encoder rerank stage for search and chat retrieval."""
+import structlog
+
+from semantic_search_api.settings import get_settings
+from semantic_search_core.metrics import add_timing, timed
+from semantic_search_core.search.rerank import get_rerank_model, rerank
+
+logger = structlog.get_logger()
+
+
+def rerank_enabled(requested: bool | None = None) -> bool:
+    """Whether to rerank: the request's choice, else the deployment default."""
+    return get_settings().rerank_enabled if requested is None else requested
+
+
+def candidate_count(k: int, enabled: bool) -> int:
+    """Number of candidates to retrieve for `k` results."""
+    return max(k, get_settings().rerank_candidates) if enabled else k
+
+
+@timed("rerank")
+def rerank_hits(query: str, hits: list[dict], k: int) -> list[dict]:
+    """
+    Rerank the top candidates and keep `k`.
+
+    Past the time budget, unscored candidates keep their fused order; an
+    overrun is reported as the `rerank_over_budget` timing.
+    """
+    settings = get_settings()
+    try:
+        model = get_rerank_model()
+    except Exception as e:
+        logger.warning("rerank_model_unavailable", error=str(e))
+        return hits[:k]
+    ranked, stats = rerank(
+        query,
+        hits,
+        model,
+        top_n=settings.rerank_candidates,
+        batch_size=settings.rerank_batch_size,
+        time_budget=settings.rerank_timeout_ms / 1000,
+    )
+    if stats["over_budget_ms"]:
+        add_timing("rerank_over_budget", stats["over_budget_ms"])
+    return ranked[:k]
@@ -1,23 +1,74 @@
 """Chat endpoint with RAG (Retrieval-Augmented Generation)."""
+import asyncio
+import hashlib
+import json
 import os
-from typing import Any
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator
 
 import httpx
 import structlog
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from semantic_search_core.search.opensearch import (
-    get_client,
-    safe_index_name,
-    search_hybrid,
+from semantic_search_api.llm_http import post_with_retry, stream_with_retry
+from semantic_search_api.reranking import candidate_count, rerank_enabled, rerank_hits
+from semantic_search_api.settings import get_settings
+from semantic_search_core.jobs import get_collection_generation
+from semantic_search_core.metrics import (
+    LLM_SECONDS,
+    LLM_TOKENS,
+    QUERY_EMBED_SECONDS,
+    collect_timings,
+    format_server_timing,
+    timed,
 )
+from semantic_search_core.rag import (
+    compress_history,
+    estimate_tokens,
+    lookup_answer,
+    pack_context,
+    prefix_keys,
+    put_summary,
+    store_answer,
+    summary_due,
+    summary_source,
+)
+from semantic_search_core.search import Filters, get_backend
+from semantic_search_core.util import CollectionNotFoundError
 from semantic_search_core.embed import get_embedding_model
 
 logger = structlog.get_logger()
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+GEMINI_CACHE_URL = "https://generativelanguage.googleapis.com/v1beta/cachedContents"
+# Gemini rejects cached content smaller than the model's minimum, by model
+# name prefix (longest match wins)
+GEMINI_CACHE_MIN_TOKENS = {
+    "gemini-1.5": 32_768,
+    "gemini-2.5-flash": 1_024,
+}
+GEMINI_CACHE_DEFAULT_MIN_TOKENS = 4_096
+# Cached content names kept locally; the least recently used are dropped first
+GEMINI_CACHE_MAX_ENTRIES = 256
+# Seconds before creating a cache for a prompt is tried again after a failure
+GEMINI_CACHE_FAILURE_TTL = 60
+HISTORY_SUMMARY_PROMPT = """Summarize the conversation you are given in at most 120 words.
+Keep names, facts, decisions and open questions the user may refer back to. Reply with the summary only."""
+
+# Keep references to background summary tasks so they are not garbage collected
+_summary_tasks: dict[str, asyncio.Task] = {}
+
+# Gemini cached contents by prompt prefix hash: (local expiry, cache name),
+# with a None name while creating one recently failed
+_gemini_caches: OrderedDict[str, tuple[float, str | None]] = OrderedDict()
+
+NO_DOCUMENTS_ANSWER = "I couldn't find any relevant documents to answer your question. Try uploading some documents first."
+
 
 def _get_llm_config():
     """Get LLM configuration from environment variables."""
@@ -27,6 +78,8 @@ def _get_llm_config():
         "gemini_model": os.getenv("GEMINI_MODEL", "gemini-2.0-flash"),
         "ollama_url": os.getenv("OLLAMA_URL", "http://ollama:11434"),
         "ollama_model": os.getenv("OLLAMA_MODEL", "llama3.2"),
+        "ollama_keep_alive": os.getenv("OLLAMA_KEEP_ALIVE", "30m"),
+        "gemini_cache_ttl": int(os.getenv("GEMINI_CACHE_TTL", "600")),
     }
 
 
@@ -51,9 +104,10 @@ class ChatRequest(BaseModel):
     collection_name: str
     question: str
     k: int = Field(default=5, ge=1, le=20, description="Number of context chunks to retrieve")
-    filters: dict[str, str | int | bool] | None = None
+    filters: Filters | None = None
     history: list[ChatMessage] = Field(default_factory=list, description="Previous conversation messages")
     context: list[ContextDocument] | None = Field(default=None, description="Reuse these documents instead of searching (for follow-up questions)")
+    debug: bool = Field(default=False, description="Report stage durations in `debug.timings` and a Server-Timing header")
 
 
 class SourceDocument(BaseModel):
@@ -71,10 +125,18 @@ class ChatResponse(BaseModel):
     sources: list[SourceDocument]
     context: list[ContextDocument]  # Return context so client can reuse for follow-ups
     model: str
+    cached: bool = False  # Answer reused from a near-identical earlier question
+    debug: dict[str, Any] | None = None  # {"timings": {stage: ms}} when requested
 
 
 def _build_system_prompt(context_chunks: list[dict]) -> str:
-    """Build the system prompt with RAG context."""
+    """
+    Build the system prompt with RAG context.
+
+    The fixed instructions come first and the documents last, so prompts share
+    the longest possible prefix and providers can reuse their cached state
+    for it (the whole prompt is identical across follow-ups on one context).
+    """
     context_text = "\n\n---\n\n".join(
         f"[Document: {chunk.get('title') or chunk.get('doc_id')}]\n{chunk.get('body', '')}"
         for chunk in context_chunks
@@ -82,46 +144,43 @@ def _build_system_prompt(context_chunks: list[dict]) -> str:
     
     return f"""You are a helpful assistant that answers questions based on the provided context documents.
 
-CONTEXT DOCUMENTS:
-{context_text}
-
 INSTRUCTIONS:
-- Answer questions based ONLY on the information provided in the context documents above.
+- Answer questions based ONLY on the information provided in the context documents below.
 - If the context doesn't contain enough information to answer the question, say so clearly.
 - Be concise and direct in your response.
 - If you quote or reference specific documents, mention which document the information comes from.
-- For follow-up questions, use the conversation history to understand what the user is referring to."""
+- For follow-up questions, use the conversation history to understand what the user is referring to.
 
+CONTEXT DOCUMENTS:
+{context_text}"""
 
-async def _call_gemini(
-    system_prompt: str,
-    question: str,
-    history: list[ChatMessage],
-    config: dict
-) -> str:
-    """Call Google Gemini API with multi-turn conversation."""
-    api_key = config["gemini_api_key"]
-    model = config["gemini_model"]
-    
-    if not api_key:
-        raise HTTPException(
-            status_code=500,
-            detail="GEMINI_API_KEY not configured. Set it in your environment variables.",
-        )
-    
-    # Build contents array with conversation history
-    # Gemini uses "user" and "model" roles
-    contents = []
-    
+
+def _gemini_prefix(system_prompt: str) -> list[dict]:
+    """Build the opening exchange that carries the system prompt to Gemini."""
     # Add system context as first user message (Gemini doesn't have system role in basic API)
-    contents.append({
-        "role": "user",
-        "parts": [{"text": f"[SYSTEM CONTEXT]\n{system_prompt}\n\n[END SYSTEM CONTEXT]\n\nI'll now ask you questions about these documents."}]
-    })
-    contents.append({
-        "role": "model", 
-        "parts": [{"text": "I understand. I'll answer your questions based only on the provided context documents. Please go ahead with your questions."}]
-    })
+    return [
+        {
+            "role": "user",
+            "parts": [{"text": f"[SYSTEM CONTEXT]\n{system_prompt}\n\n[END SYSTEM CONTEXT]\n\nI'll now ask you questions about these documents."}]
+        },
+        {
+            "role": "model", 
+            "parts": [{"text": "I understand. I'll answer your questions based only on the provided context documents. Please go ahead with your questions."}]
+        },
+    ]
+
+
+def _gemini_contents(
+    system_prompt: str, question: str, history: list[ChatMessage], cached_content: str | None = None
+) -> list[dict]:
+    """
+    Build the Gemini contents array for a multi-turn conversation.
+
+    With `cached_content` the system prompt exchange is already stored
+    provider-side, so only the conversation is sent.
+    """
+    # Gemini uses "user" and "model" roles
+    contents = [] if cached_content else _gemini_prefix(system_prompt)
     
     # Add conversation history
     for msg in history:
@@ -136,46 +195,227 @@ async def _call_gemini(
         "role": "user",
         "parts": [{"text": question}]
     })
-    
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
-    
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            url,
-            params={"key": api_key},
+    return contents
+
+
+def _gemini_request(
+    system_prompt: str,
+    question: str,
+    history: list[ChatMessage],
+    config: dict,
+    cached_content: str | None = None,
+) -> dict:
+    """Build the Gemini request payload, checking the API key is configured."""
+    if not config["gemini_api_key"]:
+        raise HTTPException(
+            status_code=500,
+            detail="GEMINI_API_KEY not configured. Set it in your environment variables.",
+        )
+    payload = {
+        "contents": _gemini_contents(system_prompt, question, history, cached_content),
+        "generationConfig": {
+            "temperature": 0.3,
+            "maxOutputTokens": 1024,
+        },
+    }
+    if cached_content:
+        payload["cachedContent"] = cached_content
+    return payload
+
+
+def _record_llm_call(
+    provider: str,
+    mode: str,
+    started: float,
+    prompt_tokens: int | None,
+    completion_tokens: int | None,
+) -> None:
+    """Record an LLM call's latency and the token counts the provider reported."""
+    LLM_SECONDS.labels(provider, mode).observe(time.perf_counter() - started)
+    if prompt_tokens is not None:
+        LLM_TOKENS.labels(provider, "prompt").observe(prompt_tokens)
+    if completion_tokens is not None:
+        LLM_TOKENS.labels(provider, "completion").observe(completion_tokens)
+
+
+def _gemini_cache_key(system_prompt: str, config: dict) -> str:
+    return hashlib.sha256(f"{config['gemini_model']}\x00{system_prompt}".encode("utf-8")).hexdigest()
+
+
+def _gemini_cache_min_tokens(model: str) -> int:
+    prefixes = [prefix for prefix in GEMINI_CACHE_MIN_TOKENS if model.startswith(prefix)]
+    if not prefixes:
+        return GEMINI_CACHE_DEFAULT_MIN_TOKENS
+    return GEMINI_CACHE_MIN_TOKENS[max(prefixes, key=len)]
+
+
+def _remember_gemini_cache(key: str, expires: float, name: str | None) -> None:
+    now = time.monotonic()
+    for stale in [k for k, (expiry, _) in _gemini_caches.items() if expiry <= now]:
+        del _gemini_caches[stale]
+    _gemini_caches[key] = (expires, name)
+    _gemini_caches.move_to_end(key)
+    while len(_gemini_caches) > GEMINI_CACHE_MAX_ENTRIES:
+        _gemini_caches.popitem(last=False)
+
+
+async def _gemini_cached_content(system_prompt: str, config: dict, create: bool) -> str | None:
+    """
+    Get a Gemini cached content holding the system prompt exchange.
+
+    Reuses a live cache for the same model and prompt; otherwise creates one
+    when `create` is set and the prompt is large enough to be cached. A
+    failed create is remembered for `GEMINI_CACHE_FAILURE_TTL` seconds.
+    Returns None if there is no cache to use (requests then send the prompt).
+    """
+    if config["gemini_cache_ttl"] <= 0:
+        return None
+    key = _gemini_cache_key(system_prompt, config)
+    now = time.monotonic()
+    cached = _gemini_caches.get(key)
+    if cached and cached[0] > now:
+        _gemini_caches.move_to_end(key)
+        return cached[1]
+    _gemini_caches.pop(key, None)
+    if not create or estimate_tokens(system_prompt) < _gemini_cache_min_tokens(config["gemini_model"]):
+        return None
+
+    ttl = config["gemini_cache_ttl"]
+    try:
+        response = await post_with_retry(
+            GEMINI_CACHE_URL,
+            params={"key": config["gemini_api_key"]},
             json={
-                "contents": contents,
-                "generationConfig": {
-                    "temperature": 0.3,
-                    "maxOutputTokens": 1024,
-                },
+                "model": f"models/{config['gemini_model']}",
+                "contents": _gemini_prefix(system_prompt),
+                "ttl": f"{ttl}s",
             },
+            timeout=60.0,
         )
-        
-        if response.status_code != 200:
-            logger.error("gemini_api_error", status=response.status_code, body=response.text)
-            raise HTTPException(status_code=502, detail=f"Gemini API error: {response.status_code}")
-        
-        data = response.json()
-        try:
-            return data["candidates"][0]["content"]["parts"][0]["text"]
-        except (KeyError, IndexError) as e:
-            logger.error("gemini_parse_error", error=str(e), data=data)
-            raise HTTPException(status_code=502, detail="Failed to parse Gemini response")
+    except httpx.HTTPError as e:
+        logger.warning("gemini_cache_create_failed", error=str(e))
+        _remember_gemini_cache(key, now + GEMINI_CACHE_FAILURE_TTL, None)
+        return None
+    if response.status_code != 200:
+        logger.warning("gemini_cache_create_failed", status=response.status_code, body=response.text)
+        _remember_gemini_cache(key, now + GEMINI_CACHE_FAILURE_TTL, None)
+        return None
+    name = response.json().get("name")
+    if name:
+        # Expire locally a little early so requests never race the server TTL
+        _remember_gemini_cache(key, now + ttl * 0.9, name)
+    return name
 
 
-async def _call_ollama(
+def _drop_gemini_cache(system_prompt: str, config: dict) -> None:
+    _gemini_caches.pop(_gemini_cache_key(system_prompt, config), None)
+
+
+async def _call_gemini(
     system_prompt: str,
     question: str,
     history: list[ChatMessage],
-    config: dict
+    config: dict,
+    reuse_prefix: bool = False,
 ) -> str:
-    """Call local Ollama API with multi-turn conversation."""
-    ollama_url = config["ollama_url"]
-    ollama_model = config["ollama_model"]
-    url = f"{ollama_url}/api/chat"  # Use chat endpoint for multi-turn
+    """
+    Call Google Gemini API with multi-turn conversation.
+
+    With `reuse_prefix` the system prompt is served from Gemini cached
+    content, so follow-ups on the same context do not re-send it.
+    """
+    started = time.perf_counter()
+    payload = _gemini_request(system_prompt, question, history, config)
+    url = f"{GEMINI_API_URL}/{config['gemini_model']}:generateContent"
+    
+    cached_content = await _gemini_cached_content(system_prompt, config, create=reuse_prefix)
+    if cached_content:
+        response = await post_with_retry(
+            url,
+            params={"key": config["gemini_api_key"]},
+            json=_gemini_request(system_prompt, question, history, config, cached_content),
+            timeout=60.0,
+        )
+        if response.status_code in (400, 403, 404):
+            # Cache expired or was deleted; fall back to sending the prompt
+            logger.warning("gemini_cached_content_rejected", status=response.status_code)
+            _drop_gemini_cache(system_prompt, config)
+            cached_content = None
+    if not cached_content:
+        response = await post_with_retry(
+            url,
+            params={"key": config["gemini_api_key"]},
+            json=payload,
+            timeout=60.0,
+        )
+    
+    if response.status_code != 200:
+        logger.error("gemini_api_error", status=response.status_code, body=response.text)
+        raise HTTPException(status_code=502, detail=f"Gemini API error: {response.status_code}")
+    
+    data = response.json()
+    try:
+        answer = data["candidates"][0]["content"]["parts"][0]["text"]
+    except (KeyError, IndexError) as e:
+        logger.error("gemini_parse_error", error=str(e), data=data)
+        raise HTTPException(status_code=502, detail="Failed to parse Gemini response")
+    usage = data.get("usageMetadata", {})
+    _record_llm_call(
+        "gemini", "complete", started, usage.get("promptTokenCount"), usage.get("candidatesTokenCount")
+    )
+    return answer
+
+
+async def _stream_gemini(
+    system_prompt: str,
+    question: str,
+    history: list[ChatMessage],
+    config: dict,
+    reuse_prefix: bool = False,
+) -> AsyncIterator[str]:
+    """Stream answer text from Gemini's streamGenerateContent (SSE) endpoint."""
+    started = time.perf_counter()
+    url = f"{GEMINI_API_URL}/{config['gemini_model']}:streamGenerateContent"
+    cached_content = await _gemini_cached_content(system_prompt, config, create=reuse_prefix)
     
-    # Build messages array
+    async with stream_with_retry(
+        url,
+        params={"key": config["gemini_api_key"], "alt": "sse"},
+        json=_gemini_request(system_prompt, question, history, config, cached_content),
+        timeout=60.0,
+    ) as response:
+        if cached_content and response.status_code in (400, 403, 404):
+            # Cache expired or was deleted; fall back to sending the prompt
+            logger.warning("gemini_cached_content_rejected", status=response.status_code)
+            _drop_gemini_cache(system_prompt, config)
+            async for text in _stream_gemini(system_prompt, question, history, config):
+                yield text
+            return
+        if response.status_code != 200:
+            await response.aread()
+            logger.error("gemini_api_error", status=response.status_code, body=response.text)
+            raise HTTPException(status_code=502, detail=f"Gemini API error: {response.status_code}")
+        
+        usage = {}
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = json.loads(line[len("data:"):])
+            # Each event carries the usage so far
+            usage = data.get("usageMetadata", usage)
+            for candidate in data.get("candidates", [])[:1]:
+                for part in candidate.get("content", {}).get("parts", []):
+                    if part.get("text"):
+                        yield part["text"]
+        _record_llm_call(
+            "gemini", "stream", started, usage.get("promptTokenCount"), usage.get("candidatesTokenCount")
+        )
+
+
+def _ollama_messages(
+    system_prompt: str, question: str, history: list[ChatMessage]
+) -> list[dict]:
+    """Build the Ollama messages array for a multi-turn conversation."""
     messages = []
     
     # System message with RAG context
@@ -196,54 +436,149 @@ async def _call_ollama(
         "role": "user",
         "content": question
     })
-    
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        try:
-            response = await client.post(
-                url,
-                json={
-                    "model": ollama_model,
-                    "messages": messages,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.3,
-                        "num_predict": 1024,
-                    },
-                },
-            )
-        except httpx.ConnectError:
-            raise HTTPException(
-                status_code=503,
-                detail=f"Cannot connect to Ollama at {ollama_url}. Make sure Ollama is running.",
-            )
-        
-        if response.status_code != 200:
-            logger.error("ollama_api_error", status=response.status_code, body=response.text)
-            raise HTTPException(status_code=502, detail=f"Ollama API error: {response.status_code}")
-        
-        data = response.json()
-        return data.get("message", {}).get("content", "")
+    return messages
 
 
-@router.post("", response_model=ChatResponse)
-async def chat(body: ChatRequest):
+def _ollama_request(
+    system_prompt: str, question: str, history: list[ChatMessage], config: dict, stream: bool
+) -> dict:
     """
-    Chat with your documents using RAG.
+    Build the Ollama chat request payload.
+
+    `keep_alive` keeps the model loaded between turns, so Ollama can reuse
+    the KV cache for the unchanged system prompt and history prefix.
+    """
+    return {
+        "model": config["ollama_model"],
+        "messages": _ollama_messages(system_prompt, question, history),
+        "stream": stream,
+        "keep_alive": config["ollama_keep_alive"],
+        "options": {
+            "temperature": 0.3,
+            "num_predict": 1024,
+        },
+    }
+
+
+async def _call_ollama(
+    system_prompt: str,
+    question: str,
+    history: list[ChatMessage],
+    config: dict
+) -> str:
+    """Call local Ollama API with multi-turn conversation."""
+    ollama_url = config["ollama_url"]
+    url = f"{ollama_url}/api/chat"  # Use chat endpoint for multi-turn
+    payload = _ollama_request(system_prompt, question, history, config, stream=False)
     
-    Retrieves relevant document chunks and uses an LLM to generate an answer.
-    Configure LLM_PROVIDER env var to use "gemini" (default) or "ollama".
+    started = time.perf_counter()
+    try:
+        response = await post_with_retry(url, json=payload, timeout=120.0)
+    except httpx.ConnectError:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Cannot connect to Ollama at {ollama_url}. Make sure Ollama is running.",
+        )
     
-    For follow-up questions, pass the `context` from the previous response to
-    reuse the same documents instead of searching again.
-    """
-    # Get LLM config
-    config = _get_llm_config()
-    provider = config["provider"]
+    if response.status_code != 200:
+        logger.error("ollama_api_error", status=response.status_code, body=response.text)
+        raise HTTPException(status_code=502, detail=f"Ollama API error: {response.status_code}")
+    
+    data = response.json()
+    _record_llm_call(
+        "ollama", "complete", started, data.get("prompt_eval_count"), data.get("eval_count")
+    )
+    return data.get("message", {}).get("content", "")
+
+
+async def _stream_ollama(
+    system_prompt: str,
+    question: str,
+    history: list[ChatMessage],
+    config: dict
+) -> AsyncIterator[str]:
+    """Stream answer text from Ollama's chat endpoint (newline-delimited JSON)."""
+    ollama_url = config["ollama_url"]
+    url = f"{ollama_url}/api/chat"
+    payload = _ollama_request(system_prompt, question, history, config, stream=True)
     
+    started = time.perf_counter()
+    try:
+        async with stream_with_retry(url, json=payload, timeout=120.0) as response:
+            if response.status_code != 200:
+                await response.aread()
+                logger.error("ollama_api_error", status=response.status_code, body=response.text)
+                raise HTTPException(status_code=502, detail=f"Ollama API error: {response.status_code}")
+            
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise HTTPException(status_code=502, detail=f"Ollama API error: {data['error']}")
+                text = data.get("message", {}).get("content", "")
+                if text:
+                    yield text
+                if data.get("done"):
+                    _record_llm_call(
+                        "ollama", "stream", started, data.get("prompt_eval_count"), data.get("eval_count")
+                    )
+                    break
+    except httpx.ConnectError:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Cannot connect to Ollama at {ollama_url}. Make sure Ollama is running.",
+        )
+
+
+def _model_name(config: dict) -> str:
+    """Get the provider-qualified name of the configured LLM."""
+    if config["provider"] == "ollama":
+        return f"ollama/{config['ollama_model']}"
+    return f"gemini/{config['gemini_model']}"
+
+
+def _embed_question(question: str) -> list[float]:
+    """Embed a question for retrieval and answer cache lookups."""
+    model = get_embedding_model()
+    with timed("encode", QUERY_EMBED_SECONDS):
+        return model.encode(question, convert_to_numpy=True).tolist()
+
+
+def _answer_namespace(body: ChatRequest, config: dict) -> str | None:
+    """
+    Get the answer cache namespace for a request, or None if it is not cacheable.
+
+    Only first questions are cached: follow-ups depend on the conversation.
+    The namespace includes the index UUID and the collection's latest job
+    update, so answers are not reused after the collection is recreated or
+    reindexed.
+    """
+    if not get_settings().chat_cache_enabled or body.history or body.context:
+        return None
+    with timed("collection"):
+        info = get_backend(body.collection_name).get_collection_info(body.collection_name)
+    if info is None:
+        return None
+    return json.dumps([
+        info.index_name,
+        info.settings.get("uuid", ""),
+        get_collection_generation(body.collection_name),
+        body.k,
+        body.filters or {},
+        _model_name(config),
+    ], sort_keys=True)
+
+
+def _retrieve_chunks(
+    body: ChatRequest, query_embedding: list[float] | None = None
+) -> list[dict]:
+    """Get the ranked context chunks for a question (empty if nothing matched)."""
     # Validate collection exists
-    client = get_client()
-    index_name = safe_index_name(body.collection_name)
-    if not client.indices.exists(index=index_name):
+    backend = get_backend(body.collection_name)
+    with timed("collection"):
+        info = backend.get_collection_info(body.collection_name)
+    if info is None:
         raise HTTPException(
             status_code=404, detail=f"Collection not found: {body.collection_name}"
         )
@@ -251,66 +586,299 @@ async def chat(body: ChatRequest):
     # For follow-up questions, reuse provided context instead of searching
     if body.context and len(body.history) > 0:
         # Convert ContextDocument to dict format for prompt building
-        chunks = [
+        return [
             {"doc_id": doc.doc_id, "title": doc.title, "body": doc.body}
             for doc in body.context
         ]
-        context_docs = body.context
-    else:
-        # First question - retrieve relevant chunks using hybrid search
-        model = get_embedding_model()
-        query_embedding = model.encode(body.question, convert_to_numpy=True).tolist()
-        
-        chunks = search_hybrid(
-            client,
-            index_name,
+    
+    # First question - retrieve relevant chunks using hybrid search
+    if query_embedding is None:
+        query_embedding = _embed_question(body.question)
+    
+    rerank = rerank_enabled()
+    try:
+        chunks = backend.search_hybrid(
+            body.collection_name,
             body.question,
             query_embedding,
-            k=body.k,
+            k=candidate_count(body.k, rerank),
             filters=body.filters,
+            include_body=True,
         )
-        
-        if not chunks:
-            model_name = config["ollama_model"] if provider == "ollama" else config["gemini_model"]
-            return ChatResponse(
-                answer="I couldn't find any relevant documents to answer your question. Try uploading some documents first.",
-                sources=[],
-                context=[],
-                model=f"{provider}/{model_name}",
-            )
-        
-        # Convert chunks to context documents for reuse
-        context_docs = [
-            ContextDocument(
-                doc_id=chunk["doc_id"],
-                title=chunk.get("title") or chunk["doc_id"],
-                body=chunk.get("body", "")
-            )
-            for chunk in chunks
-        ]
-    
-    # Build system prompt with RAG context
-    system_prompt = _build_system_prompt(chunks)
-    
-    # Call LLM with multi-turn conversation
-    if provider == "ollama":
-        answer = await _call_ollama(system_prompt, body.question, body.history, config)
-        model_name = f"ollama/{config['ollama_model']}"
-    else:
-        answer = await _call_gemini(system_prompt, body.question, body.history, config)
-        model_name = f"gemini/{config['gemini_model']}"
-    
-    # Build response with sources
-    sources = [
-        SourceDocument(
+    except CollectionNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if rerank:
+        chunks = rerank_hits(body.question, chunks, body.k)
+    return chunks
+
+
+def _pack_context(
+    chunks: list[dict],
+) -> tuple[list[dict], list[SourceDocument], list[ContextDocument]]:
+    """
+    Fit ranked chunks into the context token budget.
+
+    Returns the packed passages for the prompt, the sources they came from,
+    and the passages as context documents for reuse in follow-ups.
+    """
+    passages = pack_context(chunks, get_settings().chat_context_tokens)
+    packed_ids = {chunk_id for p in passages for chunk_id in p["chunk_ids"]}
+    seen = set()
+    sources = []
+    for chunk in chunks:
+        if chunk["doc_id"] not in packed_ids or chunk["doc_id"] in seen:
+            continue
+        seen.add(chunk["doc_id"])
+        sources.append(SourceDocument(
             doc_id=chunk["doc_id"],
             title=chunk.get("title") or chunk["doc_id"],
             snippet=chunk.get("snippet", chunk.get("body", "")[:200] + "..." if chunk.get("body", "") else ""),
-        )
-        for chunk in chunks
+        ))
+    context_docs = [
+        ContextDocument(doc_id=p["doc_id"], title=p["title"], body=p["body"])
+        for p in passages
+    ]
+    return passages, sources, context_docs
+
+
+def _bound_history(history: list[ChatMessage], config: dict) -> list[ChatMessage]:
+    """
+    Keep recent turns within the history token budget.
+
+    Older turns are replaced by a summary exchange: the latest cached LLM
+    summary plus a quick digest of the turns dropped since. Once those turns
+    reach `chat_history_summary_min_tokens`, an LLM summary is generated in
+    the background for later turns to reuse.
+    """
+    settings = get_settings()
+    messages = [m.model_dump() for m in history]
+    summary, recent, older = compress_history(messages, settings.chat_history_tokens)
+    if summary is None:
+        return history
+    if settings.chat_history_summaries:
+        _schedule_history_summary(older, config, settings.chat_history_summary_min_tokens)
+    return [
+        ChatMessage(role="user", content=f"Summary of our earlier conversation:\n{summary}"),
+        ChatMessage(role="assistant", content="Understood, I'll keep that in mind."),
+        *[ChatMessage(**m) for m in recent],
     ]
+
+
+def _schedule_history_summary(older: list[dict], config: dict, min_tokens: int) -> None:
+    """Start a background LLM summary of `older` if due and none is running for it."""
+    keys = prefix_keys(older)
+    # A summary of a shorter prefix still running covers most of these turns
+    if any(key in _summary_tasks for key in keys) or not summary_due(older, min_tokens):
+        return
+    key = keys[-1]
+    task = asyncio.create_task(_summarize_history(key, older, config))
+    _summary_tasks[key] = task
+    task.add_done_callback(lambda _: _summary_tasks.pop(key, None))
+
+
+async def _summarize_history(key: str, older: list[dict], config: dict) -> None:
+    """Summarize older turns with the LLM, building on the last cached summary."""
+    seed, rest = summary_source(older)
+    transcript = "\n\n".join(
+        f"{'User' if m['role'] == 'user' else 'Assistant'}: {m['content']}" for m in rest
+    )
+    if seed:
+        transcript = f"Summary so far:\n{seed}\n\nLater messages:\n{transcript}"
+    try:
+        if config["provider"] == "ollama":
+            summary = await _call_ollama(HISTORY_SUMMARY_PROMPT, transcript, [], config)
+        else:
+            summary = await _call_gemini(HISTORY_SUMMARY_PROMPT, transcript, [], config)
+    except Exception as e:
+        logger.warning("history_summary_failed", error=str(e))
+        return
+    if summary.strip():
+        put_summary(key, summary.strip())
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("", response_model=ChatResponse)
+async def chat(body: ChatRequest, response: Response):
+    """
+    Chat with your documents using RAG.
+    
+    Retrieves relevant document chunks and uses an LLM to generate an answer.
+    Configure LLM_PROVIDER env var to use "gemini" (default) or "ollama".
+    
+    For follow-up questions, pass the `context` from the previous response to
+    reuse the same documents instead of searching again.
+    
+    First questions are answered from a semantic cache when a near-identical
+    question was asked of the same collection since it last changed
+    (`cached` is true in that case).
+    
+    With `debug`, `debug.timings` and the `Server-Timing` header report the
+    milliseconds spent in each stage: `collection` (existence check),
+    `encode`, `knn`, `bm25`, `fusion`, `rerank`, `llm` and `total`.
+    """
+    with collect_timings() as timings, timed("total"):
+        result = await _answer(body)
+    if body.debug:
+        response.headers["Server-Timing"] = format_server_timing(timings)
+        result.debug = {"timings": _round_timings(timings)}
+    return result
+
+
+def _round_timings(timings: dict[str, float]) -> dict[str, float]:
+    return {stage: round(ms, 1) for stage, ms in timings.items()}
+
+
+async def _answer(body: ChatRequest) -> ChatResponse:
+    """Answer a chat request from the cache or with retrieval and the LLM."""
+    # Get LLM config
+    config = _get_llm_config()
+    provider = config["provider"]
+    
+    settings = get_settings()
+    query_embedding = None
+    namespace = _answer_namespace(body, config)
+    if namespace is not None:
+        query_embedding = _embed_question(body.question)
+        hit = lookup_answer(namespace, query_embedding, settings.chat_cache_threshold)
+        if hit is not None:
+            return ChatResponse(**hit, cached=True)
+    
+    chunks = _retrieve_chunks(body, query_embedding)
+    if not chunks:
+        return ChatResponse(
+            answer=NO_DOCUMENTS_ANSWER,
+            sources=[],
+            context=[],
+            model=_model_name(config),
+        )
+    
+    # Build system prompt with RAG context packed into the token budget
+    passages, sources, context_docs = _pack_context(chunks)
+    system_prompt = _build_system_prompt(passages)
+    
+    # Call LLM with multi-turn conversation. Follow-ups on reused context send
+    # the same system prompt as the previous turn, so its provider-side cache
+    # can be reused.
+    history = _bound_history(body.history, config)
+    reuse_prefix = bool(body.context and body.history)
+    with timed("llm"):
+        if provider == "ollama":
+            answer = await _call_ollama(system_prompt, body.question, history, config)
+        else:
+            answer = await _call_gemini(system_prompt, body.question, history, config, reuse_prefix)
+    
+    response = ChatResponse(
+        answer=answer,
+        sources=sources,
+        context=context_docs,
+        model=_model_name(config),
+    )
+    if namespace is not None:
+        store_answer(
+            namespace,
+            query_embedding,
+            response.model_dump(exclude={"cached", "debug"}),
+            max_entries=settings.chat_cache_max_entries,
+        )
+    return response
+
+
+@router.post("/stream")
+async def chat_stream(body: ChatRequest):
+    """
+    Chat with your documents, streaming the answer as server-sent events.
+    
+    Takes the same request as `POST /chat`. Events, in order:
+    - `sources`: `{"sources", "context", "model", "cached"}`, sent before the LLM is called
+    - `token`: `{"text"}` for each piece of the answer as the LLM produces it
+    - `done`: `{}` once the answer is complete
+    
+    An `error` event with `{"status", "detail"}` replaces the remaining events
+    if the LLM call fails after streaming has started. A cached answer is
+    sent as a single `token` event.
+    
+    With `debug`, the `Server-Timing` header reports the stages before the
+    stream starts, and `done` carries `{"debug": {"timings"}}` including `llm`.
+    """
+    with collect_timings() as timings:
+        config = _get_llm_config()
+        provider = config["provider"]
+    
+        settings = get_settings()
+        query_embedding = None
+        hit = None
+        namespace = _answer_namespace(body, config)
+        if namespace is not None:
+            query_embedding = _embed_question(body.question)
+            hit = lookup_answer(namespace, query_embedding, settings.chat_cache_threshold)
+    
+        tokens = None
+        if hit is not None:
+            sources = [SourceDocument(**s) for s in hit["sources"]]
+            context_docs = [ContextDocument(**d) for d in hit["context"]]
+            passages = []
+        else:
+            chunks = _retrieve_chunks(body, query_embedding)
+            passages, sources, context_docs = _pack_context(chunks)
+        if passages:
+            system_prompt = _build_system_prompt(passages)
+            history = _bound_history(body.history, config)
+            if provider == "ollama":
+                tokens = _stream_ollama(system_prompt, body.question, history, config)
+            else:
+                # Validates the API key before the response starts
+                _gemini_request(system_prompt, body.question, history, config)
+                reuse_prefix = bool(body.context and body.history)
+                tokens = _stream_gemini(system_prompt, body.question, history, config, reuse_prefix)
+    
+    async def events() -> AsyncIterator[str]:
+        yield _sse_event("sources", {
+            "sources": [s.model_dump() for s in sources],
+            "context": [d.model_dump() for d in context_docs],
+            "model": _model_name(config),
+            "cached": hit is not None,
+        })
+        if hit is not None:
+            yield _sse_event("token", {"text": hit["answer"]})
+        elif tokens is None:
+            yield _sse_event("token", {"text": NO_DOCUMENTS_ANSWER})
+        else:
+            answer = []
+            started = time.perf_counter()
+            try:
+                async for text in tokens:
+                    answer.append(text)
+                    yield _sse_event("token", {"text": text})
+            except HTTPException as e:
+                yield _sse_event("error", {"status": e.status_code, "detail": e.detail})
+                return
+            except (httpx.HTTPError, ValueError) as e:
+                logger.error("llm_stream_error", provider=provider, error=str(e))
+                yield _sse_event("error", {"status": 502, "detail": "LLM stream failed"})
+                return
+            timings["llm"] = (time.perf_counter() - started) * 1000
+            if namespace is not None:
+                store_answer(
+                    namespace,
+                    query_embedding,
+                    ChatResponse(
+                        answer="".join(answer),
+                        sources=sources,
+                        context=context_docs,
+                        model=_model_name(config),
+                    ).model_dump(exclude={"cached", "debug"}),
+                    max_entries=settings.chat_cache_max_entries,
+                )
+        yield _sse_event("done", {"debug": {"timings": _round_timings(timings)}} if body.debug else {})
     
-    return ChatResponse(answer=answer, sources=sources, context=context_docs, model=model_name)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if body.debug:
+        headers["Server-Timing"] = format_server_timing(timings)
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
 
 
 @router.get("/config")
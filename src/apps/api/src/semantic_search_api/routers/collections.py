@@ -1,15 +1,18 @@
 """Collection management endpoints."""
 import re
+from typing import Literal
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
-from semantic_search_core.search.opensearch import (
-    get_client,
-    safe_index_name,
-    delete_index,
-    ensure_index,
+from semantic_search_api.settings import get_settings
+from semantic_search_core.search import (
+    IndexSettings,
+    MetadataType,
+    default_backend_name,
+    get_backend,
 )
+from semantic_search_core.util import CollectionNotFoundError
 
 router = APIRouter(prefix="/collections", tags=["collections"])
 
@@ -20,18 +23,28 @@ class CreateCollectionRequest(BaseModel):
     """Request to create a collection."""
 
     name: str = Field(..., min_length=1)
+    backend: Literal["opensearch", "local"] | None = Field(
+        default=None, description="Search backend for this collection (default: SEARCH_BACKEND)"
+    )
+    metadata_types: dict[str, MetadataType] = Field(
+        default_factory=dict,
+        description="Types of metadata fields, mapped explicitly for fast filters",
+    )
+    index_settings: IndexSettings | None = Field(
+        default=None, description="Vector index parameters, shards and replicas (OpenSearch only)"
+    )
 
 
 @router.get("")
 def list_collections():
     """List all collections."""
-    client = get_client()
-    indices = client.cat.indices(index="collection_*", format="json")
+    # Local stores can exist alongside the default backend
+    indices = []
+    for backend_name in dict.fromkeys([default_backend_name(), "local"]):
+        indices += get_backend(name=backend_name).list_collections()
     names = []
-    for idx in indices:
-        name = idx.get("index", "")
-        if name.startswith("collection_"):
-            names.append(name.replace("collection_", "").replace("_", " "))
+    for index in dict.fromkeys(indices):
+        names.append(index.replace("collection_", "").replace("_", " "))
     return {"collections": names}
 
 
@@ -42,9 +55,15 @@ def create_collection(body: CreateCollectionRequest):
     if not name:
         raise HTTPException(status_code=400, detail="Collection name is required")
     safe = re.sub(r"[^a-zA-Z0-9 _-]", "", name).strip() or "default"
-    client = get_client()
-    ensure_index(client, safe, DEFAULT_EMBED_DIM)
-    return {"name": safe, "message": "Collection created"}
+    backend = get_backend(safe, name=body.backend)
+    backend.ensure_collection(
+        safe,
+        DEFAULT_EMBED_DIM,
+        get_settings().embed_model,
+        body.metadata_types,
+        body.index_settings,
+    )
+    return {"name": safe, "message": "Collection created", "backend": backend.name}
 
 
 @router.delete("/{name}")
@@ -53,6 +72,20 @@ def delete_collection(name: str):
     safe = re.sub(r"[^a-zA-Z0-9 _-]", "", name).strip()
     if not safe:
         raise HTTPException(status_code=400, detail="Invalid collection name")
-    client = get_client()
-    delete_index(client, safe)
+    get_backend(safe).delete_collection(safe)
     return {"message": f"Collection {safe} deleted"}
+
+
+@router.get("/{name}/documents/{doc_id}")
+def get_document(name: str, doc_id: str):
+    """Get one document with its full body."""
+    safe = re.sub(r"[^a-zA-Z0-9 _-]", "", name).strip()
+    if not safe:
+        raise HTTPException(status_code=400, detail="Invalid collection name")
+    try:
+        doc = get_backend(safe).get_document(safe, doc_id)
+    except CollectionNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if doc is None:
+        raise HTTPException(status_code=404, detail=f"Document not found: {doc_id}")
+    return doc
@@ -1,4 +1,6 @@
 """Index job endpoints."""
+import datetime
+
 import structlog
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
@@ -7,11 +9,17 @@ from semantic_search_api.settings import get_settings
 from semantic_search_api.routers.uploads import get_upload_path
 from semantic_search_core.jobs import upsert_job, get_job, list_active_jobs, list_recent_jobs, cancel_job
 from semantic_search_core.ingest import detect_format
+from semantic_search_core.search import MetadataType
+from semantic_search_core.search.opensearch import invalidate_collection
 from semantic_search_core.util import generate_id
 
 router = APIRouter(prefix="/index", tags=["index"])
 logger = structlog.get_logger()
 
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+# Matches the registry's default COLLECTION_CACHE_TTL; older entries have expired
+RECENTLY_FINISHED_SECONDS = 30
+
 
 def _quick_count_records(path: str, format_name: str) -> int:
     """Quick count of records without full parsing."""
@@ -48,6 +56,10 @@ class IndexJobCreate(BaseModel):
     title_field: str | None = None
     id_field: str | None = None
     metadata_fields: list[str] = Field(default_factory=list)
+    metadata_types: dict[str, MetadataType] = Field(
+        default_factory=dict,
+        description="Types of metadata fields, mapped explicitly for fast filters",
+    )
 
 
 def _enqueue_or_run(job_id: str, payload: dict):
@@ -112,6 +124,8 @@ def create_index_job(body: IndexJobCreate):
         "title_field": body.title_field,
         "id_field": body.id_field,
         "metadata_fields": body.metadata_fields or [],
+        "metadata_types": body.metadata_types,
+        "expected_records": total_records,
     }
     upsert_job(
         job_id,
@@ -165,12 +179,34 @@ def cancel_index_job(job_id: str):
     return {"job_id": job_id, "status": "cancelled"}
 
 
+def _forget_stale_collection(job: dict) -> None:
+    """
+    Drop this process's cached info for a collection a job just finished.
+
+    The worker runs in another process, so the API's cached document count
+    would otherwise describe the collection before the load.
+    """
+    if job["status"] not in FINISHED_STATUSES or not job.get("updated_at"):
+        return
+    updated = datetime.datetime.fromisoformat(job["updated_at"].rstrip("Z"))
+    if (datetime.datetime.utcnow() - updated).total_seconds() < RECENTLY_FINISHED_SECONDS:
+        invalidate_collection(job["collection_name"])
+
+
 @router.get("/jobs/{job_id}")
 def get_index_job_status(job_id: str):
-    """Get job status."""
+    """
+    Get job status.
+
+    `profile` is the job's ingest performance profile: milliseconds spent
+    loading, chunking, embedding and bulk indexing (`stages_ms`), records per
+    second, chunks, bytes and bulk requests sent, bulk retries and the
+    worker's peak RSS, with the embedding model, backend and batch size.
+    """
     job = get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
+    _forget_stale_collection(job)
     return {
         "job_id": job["job_id"],
         "collection_name": job["collection_name"],
@@ -179,4 +215,5 @@ def get_index_job_status(job_id: str):
         "processed": job["processed"],
         "failed": job["failed"],
         "error_sample": job.get("error_sample"),
+        "profile": job.get("profile"),
     }
@@ -1,29 +1,57 @@
 """Search endpoint."""
+import math
 from typing import Any, Literal
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel, Field
 
-from semantic_search_core.search.opensearch import (
-    get_client,
-    safe_index_name,
-    search_knn,
-    search_bm25,
-    search_hybrid,
+from semantic_search_api.reranking import candidate_count, rerank_enabled, rerank_hits
+from semantic_search_core.metrics import (
+    QUERY_EMBED_SECONDS,
+    collect_timings,
+    format_server_timing,
+    timed,
+)
+from semantic_search_core.search import Filters, SearchBackend, get_backend
+from semantic_search_core.search.paging import (
+    decode_cursor,
+    encode_cursor,
+    get_candidates,
+    query_fingerprint,
+    store_candidates,
 )
 from semantic_search_core.embed import get_embedding_model
+from semantic_search_core.util import CollectionNotFoundError, ValidationError
 
 router = APIRouter(prefix="/search", tags=["search"])
 
+# Deepest result a vector or hybrid cursor can page to
+CURSOR_MAX_RESULTS = 500
+MAX_BATCH_QUERIES = 256
+# OpenSearch rejects a kNN query with a larger k
+MAX_KNN_K = 10000
 
-class SearchRequest(BaseModel):
-    """Search request."""
+
+class SearchQuery(BaseModel):
+    """A single search query."""
 
     collection_name: str
     query: str
     k: int = Field(default=10, ge=1, le=100)
-    filters: dict[str, str | int | bool] | None = None
+    filters: Filters | None = Field(default=None, description="Metadata filters: a value, a list, a range (gt/gte/lt/lte) or {\"not\": ...} per field")
     mode: Literal["vector", "bm25", "hybrid"] = "hybrid"
+    include_body: bool = Field(default=False, description="Return the full chunk text with each hit")
+
+
+class SearchRequest(SearchQuery):
+    """Search request."""
+
+    rerank: bool | None = Field(default=None, description="Rerank the top candidates with a cross-encoder (default: RERANK_ENABLED)")
+    ef_search: int | None = Field(default=None, ge=1, le=10000, description="HNSW search depth for this query (default: the collection's ef_search)")
+    candidate_multiplier: float = Field(default=1.0, ge=1.0, le=20.0, description="Fetch this many times more vector candidates (hybrid: from each leg) before ranking")
+    paginate: bool = Field(default=False, description="Return an X-Next-Cursor header for fetching the next page of k results")
+    cursor: str | None = Field(default=None, description="X-Next-Cursor value from the previous page of the same search")
+    debug: bool = Field(default=False, description="Report stage durations in a Server-Timing header")
 
 
 class SearchResultItem(BaseModel):
@@ -34,51 +62,241 @@ class SearchResultItem(BaseModel):
     snippet: str
     metadata: dict[str, Any]
     score: float | None
-    body: str = ""
+    rerank_score: float | None = Field(
+        default=None, description="Cross-encoder score, when the hit was reranked"
+    )
+    body: str | None = None
+
+
+class BatchSearchRequest(BaseModel):
+    """Batch search request."""
+
+    queries: list[SearchQuery] = Field(..., min_length=1, max_length=MAX_BATCH_QUERIES)
+
+
+class BatchSearchResult(BaseModel):
+    """Results for one query of a batch."""
+
+    results: list[SearchResultItem]
+    error: str | None = None
+
+
+class BatchSearchResponse(BaseModel):
+    """Batch search response, one entry per query in request order."""
+
+    results: list[BatchSearchResult]
 
 
 @router.post("", response_model=list[SearchResultItem])
-def search(body: SearchRequest):
-    """Perform search with configurable mode: vector, bm25, or hybrid (default)."""
-    client = get_client()
-    index_name = safe_index_name(body.collection_name)
-    if not client.indices.exists(index=index_name):
-        raise HTTPException(
-            status_code=404, detail=f"Collection not found: {body.collection_name}"
-        )
+def search(body: SearchRequest, response: Response):
+    """
+    Perform search with configurable mode: vector, bm25, or hybrid (default).
+
+    Set `paginate` to page through results: each response carries an
+    `X-Next-Cursor` header (absent on the last page) to send back as `cursor`
+    with the otherwise unchanged request.
+
+    With reranking, the top `RERANK_CANDIDATES` results are reordered by a
+    cross-encoder (falling back to the fused order if it exceeds
+    `RERANK_TIMEOUT_MS`). Paged BM25 results are not reranked.
+
+    With `debug`, the `Server-Timing` header reports the milliseconds spent
+    in each stage: `collection` (existence check), `encode`, `knn`, `bm25`,
+    `fusion`, `rerank` and `total`.
+    """
+    with collect_timings() as timings, timed("total"):
+        backend = get_backend(body.collection_name)
+        with timed("collection"):
+            info = backend.get_collection_info(body.collection_name)
+        if info is None:
+            raise HTTPException(
+                status_code=404, detail=f"Collection not found: {body.collection_name}"
+            )
 
+        try:
+            if body.paginate or body.cursor:
+                hits, next_cursor = _run_paged_search(backend, body)
+                if next_cursor:
+                    response.headers["X-Next-Cursor"] = next_cursor
+            else:
+                hits = _run_search(backend, body, body.k)
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except CollectionNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    if body.debug:
+        response.headers["Server-Timing"] = format_server_timing(timings)
+    return [SearchResultItem(**h) for h in hits]
+
+
+def _run_search(backend: SearchBackend, body: SearchRequest, size: int) -> list[dict]:
+    """Dispatch the search request to the configured mode, then rerank if enabled."""
+    rerank = rerank_enabled(body.rerank)
+    limit = size
+    size = candidate_count(size, rerank)
     if body.mode == "bm25":
         # Pure BM25 text search
-        hits = search_bm25(
-            client,
-            index_name,
+        hits = backend.search_bm25(
+            body.collection_name,
             body.query,
             filters=body.filters,
-            size=body.k,
+            size=size,
+            include_body=body.include_body,
         )
     elif body.mode == "vector":
         # Pure vector/semantic search
         model = get_embedding_model()
-        query_embedding = model.encode(body.query, convert_to_numpy=True).tolist()
-        hits = search_knn(
-            client,
-            index_name,
+        with timed("encode", QUERY_EMBED_SECONDS):
+            query_embedding = model.encode(body.query, convert_to_numpy=True).tolist()
+        hits = backend.search_knn(
+            body.collection_name,
             query_embedding,
-            k=body.k,
+            k=min(math.ceil(size * body.candidate_multiplier), MAX_KNN_K),
             filters=body.filters,
-            size=body.k,
+            size=size,
+            query_text=body.query,
+            include_body=body.include_body,
+            ef_search=body.ef_search,
         )
     else:
         # Hybrid search (default) - combines BM25 + vector with RRF
         model = get_embedding_model()
-        query_embedding = model.encode(body.query, convert_to_numpy=True).tolist()
-        hits = search_hybrid(
-            client,
-            index_name,
+        with timed("encode", QUERY_EMBED_SECONDS):
+            query_embedding = model.encode(body.query, convert_to_numpy=True).tolist()
+        # Paged and reranked searches fuse the full candidate depth, and never
+        # fewer per leg than the default of k * 3 (up to 100)
+        fetch_size = max(size, min(body.k * 3, 100)) if size > body.k else None
+        if body.candidate_multiplier > 1:
+            fetch_size = min(
+                math.ceil((fetch_size or min(size * 3, 100)) * body.candidate_multiplier), MAX_KNN_K
+            )
+        hits = backend.search_hybrid(
+            body.collection_name,
             body.query,
             query_embedding,
-            k=body.k,
+            k=size,
             filters=body.filters,
+            include_body=body.include_body,
+            fetch_size=fetch_size,
+            ef_search=body.ef_search,
         )
 
-    return [SearchResultItem(**h) for h in hits]
+    if rerank:
+        hits = rerank_hits(body.query, hits, limit)
+    return hits
+
+
+def _run_paged_search(
+    backend: SearchBackend, body: SearchRequest
+) -> tuple[list[dict], str | None]:
+    """Fetch one page of results and the cursor for the next page."""
+    fingerprint = query_fingerprint(
+        body.collection_name,
+        body.query,
+        body.mode,
+        body.filters,
+        body.include_body,
+        body.rerank,
+        body.ef_search,
+        body.candidate_multiplier,
+    )
+    state = decode_cursor(body.cursor) if body.cursor else {}
+    if state and state.get("q") != fingerprint:
+        raise ValidationError("Cursor does not belong to this search")
+
+    if body.mode == "bm25":
+        # BM25 pages come straight from a point-in-time snapshot
+        try:
+            hits, pit_id, search_after = backend.search_bm25_page(
+                body.collection_name,
+                body.query,
+                filters=body.filters,
+                size=body.k,
+                pit_id=state.get("pit"),
+                search_after=state.get("after"),
+                include_body=body.include_body,
+            )
+        except CollectionNotFoundError:
+            if state:
+                raise ValidationError("Cursor expired; repeat the search")
+            raise
+        if search_after is None:
+            return hits, None
+        return hits, encode_cursor({"q": fingerprint, "pit": pit_id, "after": search_after})
+
+    # Vector and hybrid rankings are computed once and paged from the cache
+    if state:
+        candidates = get_candidates(state.get("id", ""))
+        if candidates is None:
+            raise ValidationError("Cursor expired; repeat the search")
+        cache_id, offset = state["id"], state.get("offset", 0)
+    else:
+        candidates = _run_search(backend, body, CURSOR_MAX_RESULTS)
+        cache_id, offset = store_candidates(candidates), 0
+
+    end = offset + body.k
+    if end >= len(candidates):
+        return candidates[offset:end], None
+    return candidates[offset:end], encode_cursor({"q": fingerprint, "id": cache_id, "offset": end})
+
+
+@router.post("/batch", response_model=BatchSearchResponse)
+def search_many(body: BatchSearchRequest):
+    """
+    Run many searches in one request.
+
+    Query texts are embedded in a single model call and each backend gets
+    one batch call (all OpenSearch legs go out in one `_msearch`). A query
+    against a missing collection reports an error in its own entry instead of
+    failing the batch.
+    """
+    backends = {name: get_backend(name) for name in {q.collection_name for q in body.queries}}
+    missing = {
+        name for name, backend in backends.items()
+        if backend.get_collection_info(name) is None
+    }
+
+    texts = list(dict.fromkeys(
+        q.query for q in body.queries
+        if q.mode != "bm25" and q.collection_name not in missing
+    ))
+    embeddings = {}
+    if texts:
+        model = get_embedding_model()
+        vectors = model.encode(texts, convert_to_numpy=True)
+        embeddings = {t: v.tolist() for t, v in zip(texts, vectors)}
+
+    # One batch call per backend, results put back in request order
+    groups: dict[str, list[int]] = {}
+    for i, q in enumerate(body.queries):
+        if q.collection_name not in missing:
+            groups.setdefault(backends[q.collection_name].name, []).append(i)
+    outcomes: dict[int, dict] = {}
+    for positions in groups.values():
+        backend = backends[body.queries[positions[0]].collection_name]
+        batch = backend.search_batch([
+            {
+                "collection_name": body.queries[i].collection_name,
+                "mode": body.queries[i].mode,
+                "query_text": body.queries[i].query,
+                "query_embedding": embeddings.get(body.queries[i].query),
+                "k": body.queries[i].k,
+                "filters": body.queries[i].filters,
+                "include_body": body.queries[i].include_body,
+            }
+            for i in positions
+        ])
+        outcomes.update(zip(positions, batch))
+
+    results = []
+    for i, q in enumerate(body.queries):
+        if q.collection_name in missing:
+            results.append(BatchSearchResult(results=[], error=f"Collection not found: {q.collection_name}"))
+            continue
+        outcome = outcomes[i]
+        results.append(BatchSearchResult(
+            results=[SearchResultItem(**h) for h in outcome["hits"]],
+            error=outcome["error"],
+        ))
+    return BatchSearchResponse(results=results)
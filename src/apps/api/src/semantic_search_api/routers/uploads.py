@@ -1,9 +1,12 @@
 """File upload and preview endpoints."""
+import hashlib
 import os
 from pathlib import Path
 
 import structlog
-from fastapi import APIRouter, File, UploadFile, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
 
 from semantic_search_api.settings import get_settings
 from semantic_search_core.ingest import detect_format, preview_records, get_loader
@@ -17,25 +20,148 @@ router = APIRouter(prefix="/uploads", tags=["uploads"])
 logger = structlog.get_logger()
 
 UPLOAD_PATHS: dict[str, str] = {}
+# Room for the multipart boundaries and part headers around the file
+MAX_FORM_OVERHEAD = 64 * 1024
 
+UPLOAD_BODY = {
+    "required": True,
+    "content": {
+        "multipart/form-data": {
+            "schema": {
+                "type": "object",
+                "properties": {"file": {"type": "string", "format": "binary"}},
+                "required": ["file"],
+            }
+        }
+    },
+}
 
-@router.post("/preview")
-async def upload_preview(file: UploadFile = File(...)):
+
+class _UploadTooLarge(Exception):
+    pass
+
+
+class _FileWriter:
+    """
+    Multipart parser callbacks that write the `file` field to `path`.
+
+    The file is hashed and size-checked as it arrives; other fields are
+    ignored.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.filename: str | None = None
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: dict[bytes, bytes] = {}
+        self._out = None
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._part_begin,
+            "on_header_field": self._header_field_data,
+            "on_header_value": self._header_value_data,
+            "on_header_end": self._header_end,
+            "on_headers_finished": self._headers_finished,
+            "on_part_data": self._part_data,
+            "on_part_end": self._part_end,
+        }
+
+    def _part_begin(self) -> None:
+        self._headers = {}
+
+    def _header_field_data(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _header_value_data(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition"))
+        if options.get(b"name") == b"file" and self.filename is None:
+            self.filename = options.get(b"filename", b"").decode("utf-8", "replace")
+            self._out = open(self.path, "wb")
+
+    def _part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._out is None:
+            return
+        chunk = data[start:end]
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise _UploadTooLarge
+        self.digest.update(chunk)
+        self._out.write(chunk)
+
+    def _part_end(self) -> None:
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+    def close(self) -> None:
+        self._part_end()
+
+
+async def _receive_file(request: Request, path: str, max_bytes: int) -> _FileWriter:
+    """Stream the `file` field of a multipart request body to `path`."""
+    content_type, params = parse_options_header(request.headers.get("content-type"))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    writer = _FileWriter(path, max_bytes)
+    parser = MultipartParser(boundary, writer.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except MultipartParseError as e:
+        raise HTTPException(status_code=400, detail=f"Malformed upload: {e}") from e
+    finally:
+        writer.close()
+    if writer.filename is None:
+        raise HTTPException(status_code=400, detail="No file uploaded")
+    return writer
+
+
+@router.post("/preview", openapi_extra={"requestBody": UPLOAD_BODY})
+async def upload_preview(request: Request):
     """Upload a file and get a preview."""
     settings = get_settings()
     max_bytes = settings.max_upload_mb * 1024 * 1024
-    content = await file.read()
-    if len(content) > max_bytes:
-        raise HTTPException(
-            status_code=413, detail=f"File too large (max {settings.max_upload_mb} MB)"
-        )
+    too_large = HTTPException(
+        status_code=413, detail=f"File too large (max {settings.max_upload_mb} MB)"
+    )
+    # Refuse an oversized body before reading any of it
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MAX_FORM_OVERHEAD:
+        raise too_large
 
     upload_id = generate_id()
-    suffix = Path(file.filename or "").suffix.lower() or ".bin"
     os.makedirs(settings.upload_dir, exist_ok=True)
+    # The body is parsed as it arrives and the file written straight to disk,
+    # so it is never held in memory or spooled to a temporary file first
+    part_path = os.path.join(settings.upload_dir, f"{upload_id}.part")
+    try:
+        upload = await _receive_file(request, part_path, max_bytes)
+    except BaseException as e:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        if isinstance(e, _UploadTooLarge):
+            raise too_large from None
+        raise
+    suffix = Path(upload.filename or "").suffix.lower() or ".bin"
     save_path = os.path.join(settings.upload_dir, f"{upload_id}{suffix}")
-    with open(save_path, "wb") as f:
-        f.write(content)
+    os.replace(part_path, save_path)
+    size = upload.size
+    content_hash = upload.digest.hexdigest()
+    logger.info("upload_saved", upload_id=upload_id, bytes=size, sha256=content_hash)
     UPLOAD_PATHS[upload_id] = save_path
 
     detected = detect_format(save_path)
@@ -65,6 +191,8 @@ async def upload_preview(file: UploadFile = File(...)):
     return {
         "upload_id": upload_id,
         "detected_format": detected,
+        "size_bytes": size,
+        "sha256": content_hash,
         "columns": columns,
         "preview_records": preview,
         "suggested_text_fields": suggested_text,
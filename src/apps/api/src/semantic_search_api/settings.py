@@ -15,6 +15,24 @@ class Settings(BaseSettings):
     embed_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     max_upload_mb: int = 50
     upload_dir: str = "/tmp/uploads"
+    chat_context_tokens: int = 3000
+    chat_history_tokens: int = 1500
+    chat_history_summaries: bool = True
+    chat_history_summary_min_tokens: int = 300
+    chat_cache_enabled: bool = True
+    chat_cache_threshold: float = 0.95
+    chat_cache_max_entries: int = 1000
+    rerank_enabled: bool = False
+    rerank_candidates: int = 50
+    rerank_batch_size: int = 16
+    rerank_timeout_ms: int = 300
+    llm_http2: bool = True
+    llm_max_connections: int = 20
+    llm_max_keepalive_connections: int = 10
+    llm_keepalive_expiry: float = 30.0
+    llm_max_retries: int = 3
+    llm_retry_backoff: float = 0.5
+    llm_retry_max_delay: float = 10.0
 
     class Config:
         env_file = ".env"
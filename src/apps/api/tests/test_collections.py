@@ -0,0 +1,28 @@
+"""Tests for the collection endpoints."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from semantic_search_api.routers import collections
+from semantic_search_core.search import get_backend
+from semantic_search_core.search.opensearch import build_doc
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("SEARCH_BACKEND", "local")
+    monkeypatch.setenv("LOCAL_INDEX_DIR", str(tmp_path))
+    backend = get_backend("Docs")
+    backend.ensure_collection("Docs", 2, "test-model")
+    backend.index_documents("Docs", [build_doc("d1", "Docs", "One", "the full body", {}, "f.csv", 1, [1.0, 0.0])])
+    app = FastAPI()
+    app.include_router(collections.router)
+    return TestClient(app)
+
+
+def test_get_document_returns_body(client):
+    r = client.get("/collections/Docs/documents/d1")
+    assert r.status_code == 200
+    assert r.json()["body"] == "the full body"
+    assert client.get("/collections/Docs/documents/d2").status_code == 404
+    assert client.get("/collections/Missing/documents/d1").status_code == 404
@@ -0,0 +1,68 @@
+"""Tests for the upload endpoint."""
+import hashlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from semantic_search_api.routers import uploads
+from semantic_search_api.settings import get_settings
+
+CSV = b"id,text\n1,first document\n2,second document\n"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setenv("MAX_UPLOAD_MB", "1")
+    get_settings.cache_clear()
+    app = FastAPI()
+    app.include_router(uploads.router)
+    yield TestClient(app)
+    get_settings.cache_clear()
+
+
+def test_upload_saved_with_hash(client, tmp_path):
+    r = client.post("/uploads/preview", files={"file": ("docs.csv", CSV, "text/csv")})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["sha256"] == hashlib.sha256(CSV).hexdigest()
+    assert body["size_bytes"] == len(CSV)
+    assert body["detected_format"] == "csv"
+    assert (tmp_path / f"{body['upload_id']}.csv").read_bytes() == CSV
+
+
+def test_oversized_upload_rejected_by_content_length(client, tmp_path):
+    data = b"id,text\n" + b"1,x\n" * 300_000
+    r = client.post("/uploads/preview", files={"file": ("big.csv", data, "text/csv")})
+    assert r.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_oversized_upload_rejected_while_streaming(client, tmp_path):
+    boundary = "bound"
+    head = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"big.csv\"\r\n"
+        "Content-Type: text/csv\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+
+    def chunks():
+        yield head
+        for _ in range(20):
+            yield b"1,x\n" * 25_000
+        yield tail
+
+    # A generator body is sent chunked, without Content-Length
+    r = client.post(
+        "/uploads/preview",
+        content=chunks(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+    assert r.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_upload_without_file_rejected(client):
+    r = client.post("/uploads/preview", data={"other": "value"}, files={"x": ("a.csv", CSV)})
+    assert r.status_code == 400
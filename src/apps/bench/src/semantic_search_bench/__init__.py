@@ -0,0 +1 @@
+"""Semantic Search Benchmarks."""
@@ -0,0 +1,72 @@
+"""Benchmark corpora scaled up from the sample data."""
+import csv
+import json
+import os
+import random
+import re
+
+from semantic_search_core.ingest import load_records
+
+SAMPLE_FILE = os.path.join("sample-data", "documents.jsonl")
+FORMATS = ("csv", "tsv", "json", "jsonl")
+# Filters select on `bucket`: {"bucket": {"lt": n}} matches n% of the corpus
+BUCKETS = 100
+
+
+def build_corpus(
+    size: int,
+    seed: int = 0,
+    sample_file: str = SAMPLE_FILE,
+    min_words: int = 20,
+    max_words: int = 60,
+) -> list[dict]:
+    """
+    Generate `size` records by extending the sample documents.
+
+    Each record is a sample document with extra words drawn from the sample
+    vocabulary appended, so texts differ while staying on the same topics.
+    Records have `id`, `title`, `text`, `category` and an integer `bucket`
+    (`i % 100`) for filters of known selectivity. Deterministic per seed.
+    """
+    samples = load_records(sample_file, "jsonl", {})
+    if not samples:
+        raise ValueError(f"No sample records in {sample_file}")
+    vocabulary = sorted({
+        word.lower()
+        for sample in samples
+        for word in re.findall(r"[A-Za-z]+", f"{sample.get('title', '')} {sample.get('text', '')}")
+    })
+    rng = random.Random(seed)
+    records = []
+    for i in range(size):
+        sample = samples[i % len(samples)]
+        extra = rng.choices(vocabulary, k=rng.randint(min_words, max_words))
+        records.append({
+            "id": f"doc-{i}",
+            "title": f"{sample.get('title', '')} #{i}",
+            "text": f"{sample.get('text', '')} {' '.join(extra)}",
+            "category": sample.get("category", ""),
+            "bucket": i % BUCKETS,
+        })
+    return records
+
+
+def write_corpus(records: list[dict], path: str, format_name: str = "jsonl") -> str:
+    """Write records as an upload file in one of the supported formats."""
+    if format_name not in FORMATS:
+        raise ValueError(f"Unsupported format: {format_name}")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if format_name == "jsonl":
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        elif format_name == "json":
+            json.dump(records, f)
+        else:
+            writer = csv.DictWriter(
+                f,
+                fieldnames=list(records[0]) if records else [],
+                delimiter="\t" if format_name == "tsv" else ",",
+            )
+            writer.writeheader()
+            writer.writerows(records)
+    return path
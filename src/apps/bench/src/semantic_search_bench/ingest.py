@@ -0,0 +1,319 @@
+"""Ingest throughput benchmark.
+
+Measures each indexing stage in isolation, then the whole worker job:
+
+- load: parse rate of each file loader over generated files
+- chunk: `chunk_text` over the record texts
+- embed: embedding rows/sec at several batch sizes
+- bulk: `index_documents` against a local stub that answers `_bulk` like
+  OpenSearch, with random vectors, so only client-side cost is measured
+- e2e: `run_index_job` on the JSONL file, indexing into the stub
+
+Each stage reports records/sec and its memory: `rss_start_mb` when it
+starts and `rss_peak_mb`, the highest RSS sampled while it runs (Linux
+only; None elsewhere). `process_peak_rss_mb` is the process's high-water
+mark since start, which earlier stages may have set. Writes a JSON report.
+
+    python -m semantic_search_bench.ingest --records 20000
+    python -m semantic_search_bench.ingest --stages load chunk bulk --max-words 2000
+
+Files are generated in a temporary directory; `--min-words`/`--max-words`
+set record length (records over 4000 characters are split into chunks).
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import structlog
+
+from semantic_search_bench.corpus import FORMATS, SAMPLE_FILE, build_corpus, write_corpus
+from semantic_search_bench.stub import StubOpenSearch
+from semantic_search_worker.profile import peak_rss_mb
+
+logger = structlog.get_logger()
+
+STAGES = ("load", "chunk", "embed", "bulk", "e2e")
+# How often a running stage's RSS is sampled
+RSS_SAMPLE_SECONDS = 0.01
+
+
+def current_rss_mb() -> float | None:
+    """Current resident set size of this process in MB, or None without /proc."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class StageMemory:
+    """Sample RSS in a background thread while a stage runs: `with StageMemory() as memory:`."""
+
+    def __init__(self):
+        self.start_mb: float | None = None
+        self.peak_mb: float | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while True:
+            rss = current_rss_mb()
+            if rss is not None:
+                self.peak_mb = max(self.peak_mb or 0.0, rss)
+            if self._stop.wait(RSS_SAMPLE_SECONDS):
+                return
+
+    def __enter__(self) -> "StageMemory":
+        self.start_mb = current_rss_mb()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        # Catch a peak at the very end of the stage
+        rss = current_rss_mb()
+        if rss is not None:
+            self.peak_mb = max(self.peak_mb or 0.0, rss)
+
+    def to_dict(self) -> dict:
+        return {
+            "rss_start_mb": round(self.start_mb, 1) if self.start_mb is not None else None,
+            "rss_peak_mb": round(self.peak_mb, 1) if self.peak_mb is not None else None,
+        }
+
+
+def _rate(count: int, seconds: float) -> float | None:
+    return round(count / seconds, 1) if seconds else None
+
+
+def _result(stage: str, records: int, seconds: float, memory: StageMemory, **extra) -> dict:
+    result = {
+        "stage": stage,
+        "records": records,
+        "seconds": round(seconds, 3),
+        "records_per_sec": _rate(records, seconds),
+        **extra,
+        **memory.to_dict(),
+        "process_peak_rss_mb": peak_rss_mb(),
+    }
+    logger.info("bench_result", **result)
+    return result
+
+
+def bench_load(paths: dict[str, str]) -> list[dict]:
+    """Parse each generated file with its loader."""
+    from semantic_search_core.ingest import get_loader
+
+    results = []
+    for format_name, path in paths.items():
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        with StageMemory() as memory:
+            started = time.perf_counter()
+            count = len(get_loader(format_name).load(path, {}))
+            elapsed = time.perf_counter() - started
+        results.append(_result(
+            "load",
+            count,
+            elapsed,
+            memory,
+            format=format_name,
+            file_mb=round(size_mb, 2),
+            mb_per_sec=_rate(size_mb, elapsed),
+        ))
+    return results
+
+
+def bench_chunk(texts: list[str]) -> tuple[dict, list[str]]:
+    """Chunk every text; returns the result and the chunks."""
+    from semantic_search_core.embed import chunk_text
+
+    with StageMemory() as memory:
+        started = time.perf_counter()
+        chunks = [chunk for text in texts for chunk in chunk_text(text)]
+        elapsed = time.perf_counter() - started
+    result = _result(
+        "chunk", len(texts), elapsed, memory, chunks=len(chunks), chunks_per_sec=_rate(len(chunks), elapsed)
+    )
+    return result, chunks
+
+
+def bench_embed(chunks: list[str], batch_sizes: list[int]) -> list[dict]:
+    """Encode the chunks at each batch size (the model is loaded and warmed up first)."""
+    from semantic_search_core.embed import get_embedding_model
+
+    model = get_embedding_model()
+    model.encode(chunks[:8], convert_to_numpy=True)
+    results = []
+    for batch_size in batch_sizes:
+        with StageMemory() as memory:
+            started = time.perf_counter()
+            model.encode(chunks, batch_size=batch_size, convert_to_numpy=True)
+            elapsed = time.perf_counter() - started
+        results.append(_result("embed", len(chunks), elapsed, memory, batch_size=batch_size))
+    return results
+
+
+def bench_bulk(
+    chunks: list[str], dim: int, batch_size: int, latency_ms: float, seed: int
+) -> dict:
+    """Bulk index chunk documents with random vectors into the stub server."""
+    from opensearchpy import OpenSearch
+    from semantic_search_core.search.opensearch import build_doc, index_documents
+
+    rng = np.random.default_rng(seed)
+    docs = [
+        build_doc(
+            doc_id=f"doc-{i}",
+            collection="bench-ingest",
+            title="",
+            body=chunk,
+            metadata={},
+            source_file="bench",
+            row_number=i + 1,
+            embedding=rng.standard_normal(dim, dtype=np.float32).tolist(),
+        )
+        for i, chunk in enumerate(chunks)
+    ]
+    with StubOpenSearch(latency_ms=latency_ms) as stub:
+        client = OpenSearch(hosts=[stub.url])
+        indexed = failed = 0
+        with StageMemory() as memory:
+            started = time.perf_counter()
+            for start in range(0, len(docs), batch_size):
+                ok, errors = index_documents(client, "bench-ingest", docs[start:start + batch_size])
+                indexed += ok
+                failed += errors
+            elapsed = time.perf_counter() - started
+        client.close()
+    return _result(
+        "bulk",
+        indexed,
+        elapsed,
+        memory,
+        failed=failed,
+        batch_size=batch_size,
+        dim=dim,
+        requests=stub.bulk_requests,
+        mb_sent=round(stub.bytes_received / (1024 * 1024), 2),
+        mb_per_sec=_rate(stub.bytes_received / (1024 * 1024), elapsed),
+    )
+
+
+def bench_e2e(path: str, records: int, latency_ms: float) -> dict:
+    """Run the worker's indexing job on the JSONL file against the stub server."""
+    from semantic_search_core.jobs import get_job
+    from semantic_search_core.util import generate_id
+    from semantic_search_worker.tasks import run_index_job
+
+    with StubOpenSearch(latency_ms=latency_ms) as stub:
+        os.environ["OPENSEARCH_URL"] = stub.url
+        job_id = generate_id()
+        with StageMemory() as memory:
+            started = time.perf_counter()
+            run_index_job(
+                job_id=job_id,
+                collection_name="bench-ingest",
+                upload_id="bench",
+                file_path=path,
+                format_name="jsonl",
+                text_fields=["text"],
+                title_field="title",
+                id_field="id",
+                metadata_fields=["category", "bucket"],
+                metadata_types={"bucket": "integer"},
+                expected_records=records,
+            )
+            elapsed = time.perf_counter() - started
+    job = get_job(job_id) or {}
+    return _result(
+        "e2e",
+        records,
+        elapsed,
+        memory,
+        status=job.get("status"),
+        indexed=job.get("processed"),
+        failed=job.get("failed"),
+        requests=stub.bulk_requests,
+        mb_sent=round(stub.bytes_received / (1024 * 1024), 2),
+        profile=job.get("profile"),
+    )
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=10000, help="Records per generated file")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--min-words", type=int, default=20, help="Minimum words added to each sample text")
+    parser.add_argument("--max-words", type=int, default=60, help="Maximum words added to each sample text")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 16, 64, 256], help="Embedding batch sizes")
+    parser.add_argument("--embed-rows", type=int, default=2000, help="Chunks encoded per batch size")
+    parser.add_argument("--bulk-batch", type=int, default=50, help="Documents per index_documents call")
+    parser.add_argument("--dim", type=int, default=384, help="Vector dimension of the bulk stage")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="Delay the stub adds to each _bulk")
+    parser.add_argument("--sample-file", default=SAMPLE_FILE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+    # Keep stdout for the report
+    structlog.configure(logger_factory=structlog.PrintLoggerFactory(sys.stderr))
+
+    workdir = tempfile.mkdtemp(prefix="bench-ingest-")
+    os.environ["SQLITE_PATH"] = os.path.join(workdir, "jobs.db")
+    os.environ["SEARCH_BACKEND"] = "opensearch"
+
+    started = time.perf_counter()
+    records = build_corpus(args.records, args.seed, args.sample_file, args.min_words, args.max_words)
+    formats = list(dict.fromkeys([*args.formats, *(["jsonl"] if "e2e" in args.stages else [])]))
+    paths = {
+        format_name: write_corpus(records, os.path.join(workdir, f"corpus.{format_name}"), format_name)
+        for format_name in formats
+    }
+    logger.info("bench_generated", records=len(records), seconds=round(time.perf_counter() - started, 3))
+
+    results = []
+    if "load" in args.stages:
+        results.extend(bench_load({f: paths[f] for f in args.formats}))
+    texts = [r["text"] for r in records]
+    if "chunk" in args.stages:
+        result, chunks = bench_chunk(texts)
+        results.append(result)
+    else:
+        from semantic_search_core.embed import chunk_text
+
+        chunks = [chunk for text in texts for chunk in chunk_text(text)]
+    if "embed" in args.stages:
+        results.extend(bench_embed(chunks[:args.embed_rows], args.batch_sizes))
+    if "bulk" in args.stages:
+        results.append(bench_bulk(chunks, args.dim, args.bulk_batch, args.stub_latency_ms, args.seed))
+    if "e2e" in args.stages:
+        results.append(bench_e2e(paths["jsonl"], len(records), args.stub_latency_ms))
+
+    report = {
+        "benchmark": "ingest",
+        "embed_model": os.environ.get("EMBED_MODEL", "sentence-transformers/all-MiniLM-L6-v2"),
+        "records": len(records),
+        "chunks": len(chunks),
+        "min_words": args.min_words,
+        "max_words": args.max_words,
+        "seed": args.seed,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
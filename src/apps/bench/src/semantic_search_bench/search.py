@@ -0,0 +1,293 @@
+"""Recall and latency benchmark for the search modes.
+
+Builds a corpus from the sample data, indexes it with the worker's
+`run_index_job`, then runs a sweep of vector, BM25 and hybrid searches over
+`k`, `ef_search` and filter selectivity. Recall@k is measured against exact
+brute-force search over the same embeddings (for hybrid, the exact vector
+ranking fused with the backend's own BM25 ranking; BM25 is exact already, so
+only its latency is reported). Writes a JSON report.
+
+    python -m semantic_search_bench.search --backend local --docs 5000
+    python -m semantic_search_bench.search --backend opensearch --ef-search 0 32 128 512
+
+The OpenSearch backend uses `OPENSEARCH_URL`; the job database and local
+stores go to a temporary directory.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+import structlog
+
+from semantic_search_bench.corpus import BUCKETS, SAMPLE_FILE, build_corpus, write_corpus
+
+logger = structlog.get_logger()
+
+MODES = ("vector", "bm25", "hybrid")
+WARMUP_QUERIES = 10
+QUERY_WORDS = 6
+
+
+def _selectivity_filter(fraction: float) -> tuple[dict | None, int]:
+    """Filter on `bucket` matching about `fraction` of the corpus, and its bucket bound."""
+    buckets = max(1, min(BUCKETS, round(fraction * BUCKETS)))
+    if buckets >= BUCKETS:
+        return None, BUCKETS
+    return {"bucket": {"lt": buckets}}, buckets
+
+
+def _make_queries(records: list[dict], count: int, seed: int) -> list[str]:
+    """Short word windows taken from random records."""
+    rng = random.Random(seed + 1)
+    queries = []
+    for _ in range(count):
+        words = rng.choice(records)["text"].split()
+        start = rng.randrange(max(1, len(words) - QUERY_WORDS))
+        queries.append(" ".join(words[start:start + QUERY_WORDS]))
+    return queries
+
+
+class ExactIndex:
+    """Brute-force L2 ground truth over the corpus embeddings."""
+
+    def __init__(self, doc_ids: list[str], embeddings: np.ndarray, buckets: np.ndarray):
+        self.doc_ids = np.asarray(doc_ids, dtype=object)
+        self.embeddings = np.asarray(embeddings, dtype=np.float32)
+        self.sq_norms = np.einsum("ij,ij->i", self.embeddings, self.embeddings)
+        self.buckets = buckets
+
+    def top_k(self, query: np.ndarray, k: int, max_bucket: int) -> list[str]:
+        candidates = np.flatnonzero(self.buckets < max_bucket)
+        distances = self.sq_norms[candidates] - 2 * (self.embeddings[candidates] @ query)
+        if len(candidates) > k:
+            nearest = np.argpartition(distances, k - 1)[:k]
+            candidates, distances = candidates[nearest], distances[nearest]
+        return list(self.doc_ids[candidates[np.argsort(distances, kind="stable")]])
+
+
+def _recall(hits: list[dict], truth: list[str], k: int) -> float | None:
+    truth = truth[:k]
+    if not truth:
+        return None
+    found = {h["doc_id"] for h in hits[:k]}
+    return len(found.intersection(truth)) / len(truth)
+
+
+def _percentiles(latencies: list[float]) -> dict:
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    return {"p50_ms": round(float(p50), 3), "p95_ms": round(float(p95), 3), "p99_ms": round(float(p99), 3)}
+
+
+def index_corpus(
+    records: list[dict], collection_name: str, backend_name: str, workdir: str, index_settings=None
+) -> float:
+    """Index records through the worker task; returns the wall time in seconds."""
+    from semantic_search_core.embed import get_embedding_model
+    from semantic_search_core.jobs import get_job
+    from semantic_search_core.search import get_backend
+    from semantic_search_core.util import generate_id
+    from semantic_search_worker.tasks import run_index_job
+
+    path = write_corpus(records, os.path.join(workdir, "corpus.jsonl"), "jsonl")
+    backend = get_backend(collection_name, name=backend_name)
+    backend.delete_collection(collection_name)
+    if index_settings is not None:
+        dim = get_embedding_model().get_sentence_embedding_dimension()
+        backend.ensure_collection(collection_name, dim, index_settings=index_settings)
+
+    job_id = generate_id()
+    started = time.perf_counter()
+    run_index_job(
+        job_id=job_id,
+        collection_name=collection_name,
+        upload_id="bench",
+        file_path=path,
+        format_name="jsonl",
+        text_fields=["text"],
+        title_field="title",
+        id_field="id",
+        metadata_fields=["category", "bucket"],
+        metadata_types={"bucket": "integer"},
+        expected_records=len(records),
+    )
+    if backend.name == "opensearch":
+        from semantic_search_core.search.opensearch import get_client, safe_index_name
+
+        get_client().indices.refresh(index=safe_index_name(collection_name))
+    elapsed = time.perf_counter() - started
+
+    job = get_job(job_id) or {}
+    if job.get("status") != "completed" or job.get("failed"):
+        raise RuntimeError(f"Indexing job did not complete cleanly: {job}")
+    return elapsed
+
+
+def run_sweep(
+    backend,
+    collection_name: str,
+    exact: ExactIndex,
+    queries: list[str],
+    query_embeddings: np.ndarray,
+    modes: list[str],
+    ks: list[int],
+    ef_searches: list[int],
+    selectivities: list[float],
+) -> list[dict]:
+    """Run every configuration over all queries; one result dict per configuration."""
+    from semantic_search_core.search.fusion import fuse_rrf
+
+    def search(mode, text, embedding, k, ef_search, filters):
+        if mode == "bm25":
+            return backend.search_bm25(collection_name, text, filters=filters, size=k)
+        if mode == "vector":
+            return backend.search_knn(
+                collection_name, embedding, k=k, filters=filters, size=k,
+                query_text=text, ef_search=ef_search,
+            )
+        return backend.search_hybrid(
+            collection_name, text, embedding, k=k, filters=filters, ef_search=ef_search
+        )
+
+    results = []
+    for mode in modes:
+        for i in range(min(WARMUP_QUERIES, len(queries))):
+            search(mode, queries[i], query_embeddings[i].tolist(), ks[0], None, None)
+        for k in ks:
+            for ef_search in (ef_searches if mode != "bm25" else [0]):
+                for fraction in selectivities:
+                    filters, max_bucket = _selectivity_filter(fraction)
+                    latencies, recalls = [], []
+                    for text, embedding in zip(queries, query_embeddings):
+                        started = time.perf_counter()
+                        hits = search(mode, text, embedding.tolist(), k, ef_search or None, filters)
+                        latencies.append(time.perf_counter() - started)
+                        if mode == "bm25":
+                            continue
+                        if mode == "vector":
+                            truth = exact.top_k(embedding, k, max_bucket)
+                        else:
+                            # Same fetch depth as search_hybrid, BM25 leg from the backend
+                            fetch_size = min(k * 3, 100)
+                            bm25_hits = backend.search_bm25(
+                                collection_name, text, filters=filters, size=fetch_size
+                            )
+                            exact_hits = [
+                                {"doc_id": doc_id}
+                                for doc_id in exact.top_k(embedding, fetch_size, max_bucket)
+                            ]
+                            truth = [h["doc_id"] for h in fuse_rrf(exact_hits, bm25_hits, k)]
+                        recall = _recall(hits, truth, k)
+                        if recall is not None:
+                            recalls.append(recall)
+                    result = {
+                        "mode": mode,
+                        "k": k,
+                        "ef_search": ef_search or None,
+                        "selectivity": max_bucket / BUCKETS,
+                        "filters": filters,
+                        "queries": len(queries),
+                        "recall": round(float(np.mean(recalls)), 4) if recalls else None,
+                        **_percentiles(latencies),
+                    }
+                    logger.info("bench_result", **{k_: v for k_, v in result.items() if k_ != "filters"})
+                    results.append(result)
+    return results
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--backend", choices=["local", "opensearch"], default="local")
+    parser.add_argument("--docs", type=int, default=5000, help="Corpus size")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--k", nargs="+", type=int, default=[10, 50])
+    parser.add_argument(
+        "--ef-search", nargs="+", type=int, default=[0, 32, 128, 256],
+        help="Per-query ef_search values (0: the collection's default)",
+    )
+    parser.add_argument(
+        "--selectivity", nargs="+", type=float, default=[1.0, 0.1, 0.01],
+        help="Fractions of the corpus the filter matches (1: no filter)",
+    )
+    parser.add_argument("--m", type=int, help="HNSW m of the benchmark collection")
+    parser.add_argument("--ef-construction", type=int, help="HNSW ef_construction of the benchmark collection")
+    parser.add_argument("--collection", default="bench-search")
+    parser.add_argument("--sample-file", default=SAMPLE_FILE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="Keep the collection afterwards")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+    # Keep stdout for the report
+    structlog.configure(logger_factory=structlog.PrintLoggerFactory(sys.stderr))
+
+    workdir = tempfile.mkdtemp(prefix="bench-search-")
+    os.environ["SQLITE_PATH"] = os.path.join(workdir, "jobs.db")
+    os.environ["SEARCH_BACKEND"] = args.backend
+    if args.backend == "local":
+        os.environ["LOCAL_INDEX_DIR"] = os.path.join(workdir, "vectors")
+
+    from semantic_search_core.embed import get_embedding_model
+    from semantic_search_core.search import IndexSettings, get_backend
+
+    records = build_corpus(args.docs, args.seed, args.sample_file)
+    index_settings = None
+    if args.m or args.ef_construction:
+        index_settings = IndexSettings(m=args.m, ef_construction=args.ef_construction)
+    logger.info("bench_indexing", docs=len(records), backend=args.backend)
+    index_seconds = index_corpus(records, args.collection, args.backend, workdir, index_settings)
+
+    model = get_embedding_model()
+    embeddings = model.encode([r["text"] for r in records], batch_size=64, convert_to_numpy=True)
+    exact = ExactIndex(
+        [r["id"] for r in records], embeddings, np.array([r["bucket"] for r in records])
+    )
+    queries = _make_queries(records, args.queries, args.seed)
+    query_embeddings = np.asarray(
+        model.encode(queries, batch_size=64, convert_to_numpy=True), dtype=np.float32
+    )
+
+    backend = get_backend(args.collection, name=args.backend)
+    try:
+        results = run_sweep(
+            backend,
+            args.collection,
+            exact,
+            queries,
+            query_embeddings,
+            args.modes,
+            args.k,
+            args.ef_search,
+            args.selectivity,
+        )
+    finally:
+        if not args.keep:
+            backend.delete_collection(args.collection)
+
+    report = {
+        "benchmark": "search",
+        "backend": args.backend,
+        "embed_model": os.environ.get("EMBED_MODEL", "sentence-transformers/all-MiniLM-L6-v2"),
+        "docs": len(records),
+        "queries": len(queries),
+        "seed": args.seed,
+        "index_settings": index_settings.model_dump(exclude_none=True) if index_settings else {},
+        "index_seconds": round(index_seconds, 3),
+        "index_docs_per_sec": round(len(records) / index_seconds, 1) if index_seconds else None,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
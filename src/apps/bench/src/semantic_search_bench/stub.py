@@ -0,0 +1,121 @@
+"""A stand-in OpenSearch server for ingest benchmarks.
+
+Answers `_bulk` requests the way OpenSearch does (every document created)
+without storing anything, so bulk indexing can be measured without a
+cluster. Index checks report an existing one-shard index with an empty
+mapping, so the worker's `ensure_collection` goes straight to indexing.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubOpenSearch:
+    """Run the stub on a free local port: `with StubOpenSearch() as stub: stub.url`."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self.bulk_requests = 0
+        self.docs = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_bulk(self, docs: int, size: int) -> None:
+        with self._lock:
+            self.bulk_requests += 1
+            self.docs += docs
+            self.bytes_received += size
+
+    def __enter__(self) -> "StubOpenSearch":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _bulk_items(body: bytes) -> list[dict]:
+    """One `created` item per action line of an ndjson bulk body."""
+    items = []
+    lines = [line for line in body.split(b"\n") if line.strip()]
+    for action_line in lines[::2]:
+        action = json.loads(action_line)
+        op, meta = next(iter(action.items()))
+        items.append({
+            op: {
+                "_index": meta.get("_index", ""),
+                "_id": meta.get("_id", ""),
+                "status": 201,
+                "result": "created",
+            }
+        })
+    return items
+
+
+def _handler(stub: StubOpenSearch):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, payload: dict | None, status: int = 200) -> None:
+            body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def _body(self) -> bytes:
+            return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        def do_HEAD(self):
+            self._send(None)
+
+        def do_GET(self):
+            self._body()
+            path = self.path.split("?")[0]
+            if path.endswith("/_count"):
+                self._send({"count": 1})
+            elif path == "/_cluster/health":
+                self._send({"status": "green", "number_of_data_nodes": 1})
+            elif path.endswith("/_mapping"):
+                self._send({path.split("/")[1]: {"mappings": {}}})
+            elif path.count("/") == 1 and not path.startswith("/_"):
+                settings = {"index": {"number_of_shards": "1", "number_of_replicas": "0"}}
+                self._send({path[1:]: {"mappings": {}, "settings": settings}})
+            else:
+                self._send({"version": {"distribution": "opensearch", "number": "2.16.0"}})
+
+        def do_POST(self):
+            body = self._body()
+            path = self.path.split("?")[0]
+            if path.endswith("/_bulk"):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                items = _bulk_items(body)
+                stub.record_bulk(len(items), len(body))
+                self._send({"took": 1, "errors": False, "items": items})
+            elif path.endswith("/_count"):
+                self._send({"count": 1})
+            else:
+                self._send({"acknowledged": True})
+
+        def do_PUT(self):
+            self._body()
+            self._send({"acknowledged": True})
+
+    return Handler
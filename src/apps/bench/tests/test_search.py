@@ -0,0 +1,66 @@
+"""Tests for the search benchmark harness."""
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import semantic_search_core.embed.model as embed_model
+from semantic_search_bench.corpus import build_corpus
+from semantic_search_bench.search import ExactIndex, _make_queries, index_corpus, run_sweep
+from semantic_search_core.search import get_backend
+
+SAMPLE_FILE = Path(__file__).resolve().parents[4] / "sample-data" / "documents.jsonl"
+
+
+class _HashModel:
+    """Bag-of-words vectors, so the harness runs without downloading a model."""
+
+    def get_sentence_embedding_dimension(self):
+        return 32
+
+    def _encode(self, text):
+        vector = np.zeros(32, dtype=np.float32)
+        for word in text.lower().split():
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 32] += 1
+        return vector
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        if isinstance(texts, str):
+            return self._encode(texts)
+        return np.stack([self._encode(text) for text in texts])
+
+
+@pytest.fixture
+def local_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("SEARCH_BACKEND", "local")
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "jobs.db"))
+    monkeypatch.setenv("LOCAL_INDEX_DIR", str(tmp_path / "vectors"))
+    monkeypatch.setattr(embed_model, "_embedding_model", _HashModel())
+    return tmp_path
+
+
+def test_filtered_sweep_has_recall(local_env):
+    records = build_corpus(300, sample_file=str(SAMPLE_FILE))
+    index_corpus(records, "bench-test", "local", str(local_env))
+    model = embed_model.get_embedding_model()
+    exact = ExactIndex(
+        [r["id"] for r in records],
+        model.encode([r["text"] for r in records]),
+        np.array([r["bucket"] for r in records]),
+    )
+    queries = _make_queries(records, 5, seed=0)
+    results = run_sweep(
+        get_backend("bench-test", name="local"),
+        "bench-test",
+        exact,
+        queries,
+        model.encode(queries),
+        ["vector", "hybrid"],
+        [10],
+        [0],
+        [1.0, 0.1],
+    )
+    assert len(results) == 4
+    # Filters on `bucket` must find documents, or recall is measured on nothing
+    assert all(result["recall"] > 0 for result in results)
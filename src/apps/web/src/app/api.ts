@@ -111,6 +111,7 @@ export interface SearchResult {
   snippet: string;
   metadata: Record<string, unknown>;
   score: number | null;
+  rerank_score?: number | null;
   body?: string;
 }
 
@@ -133,6 +134,18 @@ export async function search(
   return r.json();
 }
 
+// Full body of one document, fetched when it is opened
+export async function getDocument(collection_name: string, doc_id: string): Promise<SearchResult> {
+  const r = await fetch(
+    `${API}/collections/${encodeURIComponent(collection_name)}/documents/${encodeURIComponent(doc_id)}`
+  );
+  if (!r.ok) {
+    const d = await r.json().catch(() => ({}));
+    throw new Error(d.detail || "Failed to load document");
+  }
+  return r.json();
+}
+
 export interface ChatSource {
   doc_id: string;
   title: string;
@@ -1,12 +1,32 @@
-import type { SearchResult } from "../api";
+import { useEffect, useState } from "react";
+import { getDocument, type SearchResult } from "../api";
 
 interface Props {
+  collectionName: string;
   doc: SearchResult;
   onClose: () => void;
 }
 
-export default function DocumentModal({ doc, onClose }: Props) {
-  const body = doc.body ?? doc.snippet;
+export default function DocumentModal({ collectionName, doc, onClose }: Props) {
+  // Search results carry only a snippet; the full body is loaded on open
+  const [body, setBody] = useState<string | null>(doc.body ?? null);
+  const [loadError, setLoadError] = useState<string | null>(null);
+
+  useEffect(() => {
+    if (doc.body != null) return;
+    let cancelled = false;
+    getDocument(collectionName, doc.doc_id)
+      .then((full) => {
+        if (!cancelled) setBody(full.body ?? "");
+      })
+      .catch((e) => {
+        if (!cancelled) setLoadError(e instanceof Error ? e.message : String(e));
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [collectionName, doc.doc_id, doc.body]);
+
   return (
     <div
       className="fixed inset-0 z-50 flex items-center justify-center bg-black/50"
@@ -40,7 +60,11 @@ export default function DocumentModal({ doc, onClose }: Props) {
             </div>
           )}
           <h4 className="text-sm font-medium text-slate-600 mb-2">Content</h4>
-          <div className="text-slate-800 whitespace-pre-wrap text-sm">{body}</div>
+          <div className="text-slate-800 whitespace-pre-wrap text-sm">{body ?? doc.snippet}</div>
+          {body == null && !loadError && (
+            <p className="mt-2 text-xs text-slate-500">Loading full document...</p>
+          )}
+          {loadError && <p className="mt-2 text-xs text-red-600">{loadError}</p>}
         </div>
       </div>
     </div>
@@ -655,7 +655,11 @@ export default function Collection() {
       )}
 
       {selectedDoc && (
-        <DocumentModal doc={selectedDoc} onClose={() => setSelectedDoc(null)} />
+        <DocumentModal
+          collectionName={collectionName}
+          doc={selectedDoc}
+          onClose={() => setSelectedDoc(null)}
+        />
       )}
     </div>
   );
@@ -1,10 +1,26 @@
 """RQ worker entrypoint."""
-import structlog
-from redis import Redis
-from rq import Worker
+import os
+import shutil
+import tempfile
 
-from semantic_search_worker.settings import get_redis_url
-from semantic_search_worker.tasks import run_index_job  # noqa: F401
+# RQ runs each job in a forked work horse. Its metrics reach the exporter
+# through files in this directory, which must be set before
+# prometheus_client is first imported. A directory created here is removed
+# when the worker stops.
+_created_metrics_dir = None
+if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+else:
+    _created_metrics_dir = tempfile.mkdtemp(prefix="worker-metrics-")
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = _created_metrics_dir
+
+import structlog  # noqa: E402
+from redis import Redis  # noqa: E402
+from rq import Queue  # noqa: E402
+
+from semantic_search_worker.metrics import MetricsWorker, start_exporter  # noqa: E402
+from semantic_search_worker.settings import get_metrics_port, get_redis_url  # noqa: E402
+from semantic_search_worker.tasks import run_index_job  # noqa: E402, F401
 
 logger = structlog.get_logger()
 
@@ -19,8 +35,17 @@ def main():
     logger.info("embedding_model_ready")
 
     conn = Redis.from_url(get_redis_url())
-    worker = Worker(["default"], connection=conn)
-    worker.work()
+    queues = [Queue("default", connection=conn)]
+    port = get_metrics_port()
+    if port:
+        start_exporter(port, queues)
+        logger.info("metrics_exporter_started", port=port)
+    worker = MetricsWorker(queues, connection=conn)
+    try:
+        worker.work()
+    finally:
+        if _created_metrics_dir:
+            shutil.rmtree(_created_metrics_dir, ignore_errors=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,41 @@
+"""Worker metrics exporter."""
+from prometheus_client import multiprocess, start_http_server
+from prometheus_client.core import GaugeMetricFamily
+from rq import Queue, Worker
+
+from semantic_search_core.metrics import metrics_registry
+
+
+class QueueDepthCollector:
+    """Report the number of jobs waiting in each queue at scrape time."""
+
+    def __init__(self, queues: list[Queue]):
+        self.queues = queues
+
+    def collect(self):
+        depth = GaugeMetricFamily(
+            "semantic_search_queue_depth", "Jobs waiting in the queue", labels=["queue"]
+        )
+        for queue in self.queues:
+            depth.add_metric([queue.name], queue.count)
+        yield depth
+
+
+def start_exporter(port: int, queues: list[Queue]) -> None:
+    """Serve the worker's metrics (including its job processes') on `port` in a background thread."""
+    registry = metrics_registry()
+    registry.register(QueueDepthCollector(queues))
+    start_http_server(port, registry=registry)
+
+
+class MetricsWorker(Worker):
+    """RQ worker that marks each work horse dead in the metrics files once it exits."""
+
+    def monitor_work_horse(self, job, queue):
+        # RQ clears the horse's pid when it has finished
+        pid = self.horse_pid
+        try:
+            return super().monitor_work_horse(job, queue)
+        finally:
+            if pid:
+                multiprocess.mark_process_dead(pid)
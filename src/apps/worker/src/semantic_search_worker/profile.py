@@ -0,0 +1,49 @@
+"""Ingest performance profile of an indexing job."""
+import resource
+import sys
+import time
+
+STAGES = ("load", "chunk", "embed", "bulk")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (`ru_maxrss` is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class JobProfile:
+    """
+    Stage timings and counters of one indexing job, stored with the job.
+
+    `timings` is the dict of a `collect_timings` block around the job, which
+    the timed load, chunk, embed and bulk stages add to. `bulk` is passed to
+    `index_documents` as its `stats`.
+    """
+
+    def __init__(self, timings: dict[str, float]):
+        self.started = time.perf_counter()
+        self.timings = timings
+        self.records = 0
+        self.chunks = 0
+        self.bulk: dict[str, int] = {}
+        self.embed_model: str | None = None
+        self.backend: str | None = None
+        self.batch_size: int | None = None
+
+    def to_dict(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "stages_ms": {stage: round(self.timings.get(stage, 0.0), 1) for stage in STAGES},
+            "elapsed_seconds": round(elapsed, 3),
+            "records": self.records,
+            "records_per_sec": round(self.records / elapsed, 1) if elapsed else None,
+            "chunks": self.chunks,
+            "bytes_sent": self.bulk.get("bytes", 0),
+            "bulk_requests": self.bulk.get("requests", 0),
+            "retries": self.bulk.get("retries", 0),
+            "peak_rss_mb": peak_rss_mb(),
+            "embed_model": self.embed_model,
+            "backend": self.backend,
+            "batch_size": self.batch_size,
+        }
@@ -5,3 +5,8 @@ import os
 def get_redis_url() -> str:
     """Get Redis URL from environment."""
     return os.environ.get("REDIS_URL", "redis://redis:6379/0")
+
+
+def get_metrics_port() -> int:
+    """Get the port of the worker's Prometheus exporter (0 disables it)."""
+    return int(os.environ.get("WORKER_METRICS_PORT", "9102"))
@@ -6,16 +6,16 @@ import structlog
 from semantic_search_core.embed import get_embedding_model, chunk_text
 from semantic_search_core.ingest import load_records, get_loader
 from semantic_search_core.jobs import upsert_job, get_job
-from semantic_search_core.search.opensearch import (
-    get_client,
-    ensure_index,
-    index_documents,
-    build_doc,
-)
+from semantic_search_core.metrics import EMBED_CHUNKS, EMBED_SECONDS, collect_timings, timed
+from semantic_search_core.search import coerce_metadata, get_backend
+from semantic_search_core.search.opensearch import build_doc
 from semantic_search_core.util import generate_id
+from semantic_search_worker.profile import JobProfile
 
 logger = structlog.get_logger()
 
+BATCH_SIZE = 50
+
 
 def run_index_job(
     job_id: str,
@@ -27,17 +27,76 @@ def run_index_job(
     title_field: str | None,
     id_field: str | None,
     metadata_fields: list[str],
+    metadata_types: dict[str, str] | None = None,
+    expected_records: int | None = None,
+) -> None:
+    """
+    Run an indexing job.
+
+    `metadata_types` declares types for metadata fields (which are indexed
+    even if not listed in `metadata_fields`); values are converted to them.
+    `expected_records` (the upload's quick record count) sizes a new index;
+    load-time tuning such as a longer refresh interval is undone at the end.
+    The job's ingest profile (stage timings, throughput, bytes sent, peak
+    RSS, retries) is stored with it.
+    """
+    with collect_timings() as timings:
+        try:
+            _index_records(
+                job_id,
+                collection_name,
+                upload_id,
+                file_path,
+                format_name,
+                text_fields,
+                title_field,
+                id_field,
+                metadata_fields,
+                metadata_types,
+                expected_records,
+                JobProfile(timings),
+            )
+        finally:
+            _finish_indexing(collection_name)
+
+
+def _finish_indexing(collection_name: str) -> None:
+    """Restore the collection's normal settings once the job ends, however it ends."""
+    try:
+        get_backend(collection_name).finish_indexing(collection_name)
+    except Exception as e:
+        logger.warning("finish_indexing_failed", collection=collection_name, error=str(e))
+
+
+def _index_records(
+    job_id: str,
+    collection_name: str,
+    upload_id: str,
+    file_path: str,
+    format_name: str,
+    text_fields: list[str],
+    title_field: str | None,
+    id_field: str | None,
+    metadata_fields: list[str],
+    metadata_types: dict[str, str] | None,
+    expected_records: int | None,
+    profile: JobProfile,
 ) -> None:
-    """Run an indexing job."""
+    metadata_types = metadata_types or {}
+    metadata_fields = list(dict.fromkeys([*(metadata_fields or []), *metadata_types]))
+
     # Check if cancelled before starting (e.g. user cancelled while queued)
     job = get_job(job_id)
     if job and job.get("status") == "cancelled":
         return
 
     try:
-        records = load_records(file_path, format_name, {})
+        with timed("load"):
+            records = load_records(file_path, format_name, {})
     except Exception as e:
-        upsert_job(job_id, collection_name, upload_id, "failed", 0, 0, 0, str(e))
+        upsert_job(
+            job_id, collection_name, upload_id, "failed", 0, 0, 0, str(e), profile=profile.to_dict()
+        )
         logger.exception("load_failed", job_id=job_id, error=str(e))
         return
 
@@ -55,22 +114,37 @@ def run_index_job(
         return
 
     upsert_job(
-        job_id, collection_name, upload_id, "processing", total_records=total, processed=0, failed=0
+        job_id,
+        collection_name,
+        upload_id,
+        "processing",
+        total_records=total,
+        processed=0,
+        failed=0,
+        profile=profile.to_dict(),
     )
 
     model = get_embedding_model()
     dim = model.get_sentence_embedding_dimension()
-    client = get_client()
-    index_name = ensure_index(client, collection_name, dim)
+    backend = get_backend(collection_name)
+    profile.embed_model = os.environ.get("EMBED_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+    profile.backend = backend.name
+    profile.batch_size = BATCH_SIZE
+    backend.ensure_collection(
+        collection_name,
+        dim,
+        metadata_types=metadata_types,
+        expected_docs=expected_records or total,
+    )
     source_file = os.path.basename(file_path)
 
     processed = 0
     failed = 0
     error_sample = None
     batch = []
-    BATCH_SIZE = 50
 
     for i, rec in enumerate(records):
+        profile.records = i + 1
         try:
             text_parts = []
             for f in text_fields:
@@ -99,14 +173,19 @@ def run_index_job(
                 for mf in metadata_fields:
                     if mf in rec and rec[mf] is not None:
                         meta[mf] = rec[mf]
+                meta = coerce_metadata(meta, metadata_types)
 
             doc_id_raw = (rec.get(id_field) or "") if id_field else ""
             if not doc_id_raw:
                 doc_id_raw = generate_id()
 
-            chunks = chunk_text(body)
-            for ci, chunk in enumerate(chunks):
-                emb = model.encode(chunk, convert_to_numpy=True).tolist()
+            with timed("chunk"):
+                chunks = chunk_text(body)
+            with timed("embed", EMBED_SECONDS):
+                embeddings = [model.encode(chunk, convert_to_numpy=True).tolist() for chunk in chunks]
+            EMBED_CHUNKS.inc(len(chunks))
+            profile.chunks += len(chunks)
+            for ci, (chunk, emb) in enumerate(zip(chunks, embeddings)):
                 doc_id = f"{doc_id_raw}_{ci}" if len(chunks) > 1 else doc_id_raw
                 meta_chunk = dict(meta)
                 if len(chunks) > 1:
@@ -124,7 +203,7 @@ def run_index_job(
                 batch.append(doc)
 
             if len(batch) >= BATCH_SIZE:
-                ok, err_count = index_documents(client, index_name, batch)
+                ok, err_count = backend.index_documents(collection_name, batch, profile.bulk)
                 processed += ok
                 failed += err_count
                 batch = []
@@ -140,6 +219,7 @@ def run_index_job(
                         processed=processed,
                         failed=failed,
                         error_sample=error_sample,
+                        profile=profile.to_dict(),
                     )
                     logger.info("job_cancelled", job_id=job_id, processed=processed)
                     return
@@ -152,6 +232,7 @@ def run_index_job(
                     processed=processed,
                     failed=failed,
                     error_sample=error_sample,
+                    profile=profile.to_dict(),
                 )
 
         except Exception as e:
@@ -161,7 +242,7 @@ def run_index_job(
             logger.warning("record_failed", row=i + 1, error=str(e))
 
     if batch:
-        ok, err_count = index_documents(client, index_name, batch)
+        ok, err_count = backend.index_documents(collection_name, batch, profile.bulk)
         processed += ok
         failed += err_count
 
@@ -176,6 +257,7 @@ def run_index_job(
             processed=processed,
             failed=failed,
             error_sample=error_sample,
+            profile=profile.to_dict(),
         )
         logger.info("job_cancelled", job_id=job_id, processed=processed)
         return
@@ -189,5 +271,6 @@ def run_index_job(
         processed=processed,
         failed=failed,
         error_sample=error_sample,
+        profile=profile.to_dict(),
     )
     logger.info("job_completed", job_id=job_id, processed=processed, failed=failed)
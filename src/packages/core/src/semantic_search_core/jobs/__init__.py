@@ -4,6 +4,7 @@ from semantic_search_core.jobs.repo import (
     upsert_job,
     get_job,
     list_jobs_for_collection,
+    get_collection_generation,
     list_active_jobs,
     list_recent_jobs,
     cancel_job,
@@ -15,6 +16,7 @@ __all__ = [
     "upsert_job",
     "get_job",
     "list_jobs_for_collection",
+    "get_collection_generation",
     "list_active_jobs",
     "list_recent_jobs",
     "cancel_job",
@@ -11,3 +11,4 @@ class JobStatus(BaseModel):
     processed: int
     failed: int
     error_sample: str | None = None
+    profile: dict | None = None
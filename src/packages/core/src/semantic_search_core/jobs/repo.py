@@ -1,4 +1,5 @@
 """Job repository using SQLite."""
+import json
 import os
 import sqlite3
 from contextlib import contextmanager
@@ -18,10 +19,15 @@ CREATE TABLE IF NOT EXISTS jobs (
     processed INTEGER DEFAULT 0,
     failed INTEGER DEFAULT 0,
     error_sample TEXT,
+    profile TEXT,
     created_at TEXT,
     updated_at TEXT
 );
 """
+# Columns added after the first release, for databases created before them
+MIGRATIONS = {"profile": "ALTER TABLE jobs ADD COLUMN profile TEXT"}
+
+_migrated: set[str] = set()
 
 
 def _get_sqlite_path() -> str:
@@ -37,12 +43,38 @@ def get_conn():
     conn.row_factory = sqlite3.Row
     try:
         conn.executescript(SCHEMA)
+        if path not in _migrated:
+            _migrate(conn)
+            _migrated.add(path)
         yield conn
         conn.commit()
     finally:
         conn.close()
 
 
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Add columns missing from an older jobs table."""
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+    for column, statement in MIGRATIONS.items():
+        if column not in columns:
+            try:
+                conn.execute(statement)
+            except sqlite3.OperationalError as e:
+                # Another process (API or worker) added it since the check
+                if "duplicate column name" not in str(e):
+                    raise
+                continue
+            logger.info("jobs_table_migrated", column=column)
+
+
+def _job(row: sqlite3.Row) -> dict[str, Any]:
+    """Convert a jobs row to a dict, decoding the profile."""
+    job = dict(row)
+    if job.get("profile"):
+        job["profile"] = json.loads(job["profile"])
+    return job
+
+
 def init_db():
     """Initialize the database."""
     with get_conn():
@@ -58,22 +90,29 @@ def upsert_job(
     processed: int = 0,
     failed: int = 0,
     error_sample: str | None = None,
+    profile: dict[str, Any] | None = None,
 ):
-    """Insert or update a job."""
+    """
+    Insert or update a job.
+
+    `profile` is the job's ingest performance profile; updates without one
+    keep the stored profile.
+    """
     import datetime
 
     now = datetime.datetime.utcnow().isoformat() + "Z"
     with get_conn() as conn:
         conn.execute(
             """
-            INSERT INTO jobs (job_id, collection_name, upload_id, status, total_records, processed, failed, error_sample, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO jobs (job_id, collection_name, upload_id, status, total_records, processed, failed, error_sample, profile, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(job_id) DO UPDATE SET
                 status = excluded.status,
                 total_records = excluded.total_records,
                 processed = excluded.processed,
                 failed = excluded.failed,
                 error_sample = excluded.error_sample,
+                profile = COALESCE(excluded.profile, jobs.profile),
                 updated_at = excluded.updated_at
             """,
             (
@@ -85,6 +124,7 @@ def upsert_job(
                 processed,
                 failed,
                 error_sample,
+                json.dumps(profile) if profile is not None else None,
                 now,
                 now,
             ),
@@ -99,7 +139,7 @@ def get_job(job_id: str) -> dict[str, Any] | None:
         ).fetchone()
         if row is None:
             return None
-        return dict(row)
+        return _job(row)
 
 
 def list_jobs_for_collection(collection_name: str) -> list[dict[str, Any]]:
@@ -109,7 +149,22 @@ def list_jobs_for_collection(collection_name: str) -> list[dict[str, Any]]:
             "SELECT * FROM jobs WHERE collection_name = ? ORDER BY created_at DESC",
             (collection_name,),
         ).fetchall()
-        return [dict(r) for r in rows]
+        return [_job(r) for r in rows]
+
+
+def get_collection_generation(collection_name: str) -> str:
+    """
+    Get a marker that changes whenever indexing jobs touch a collection.
+
+    This is the latest job update time; it moves on every progress update, so
+    it also changes while a job is still writing documents.
+    """
+    with get_conn() as conn:
+        row = conn.execute(
+            "SELECT MAX(updated_at) FROM jobs WHERE collection_name = ?",
+            (collection_name,),
+        ).fetchone()
+        return row[0] or ""
 
 
 def list_active_jobs() -> list[dict[str, Any]]:
@@ -118,7 +173,7 @@ def list_active_jobs() -> list[dict[str, Any]]:
         rows = conn.execute(
             "SELECT * FROM jobs WHERE status IN ('queued', 'processing') ORDER BY created_at DESC"
         ).fetchall()
-        return [dict(r) for r in rows]
+        return [_job(r) for r in rows]
 
 
 def list_recent_jobs(limit: int = 20) -> list[dict[str, Any]]:
@@ -138,7 +193,7 @@ def list_recent_jobs(limit: int = 20) -> list[dict[str, Any]]:
             """,
             (limit,),
         ).fetchall()
-        return [dict(r) for r in rows]
+        return [_job(r) for r in rows]
 
 
 def cancel_job(job_id: str) -> bool:
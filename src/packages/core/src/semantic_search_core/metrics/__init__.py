@@ -0,0 +1,38 @@
+"""Prometheus metrics."""
+from semantic_search_core.metrics.instruments import (
+    BULK_DOCS,
+    BULK_SECONDS,
+    EMBED_CHUNKS,
+    EMBED_SECONDS,
+    FUSION_SECONDS,
+    LLM_SECONDS,
+    LLM_TOKENS,
+    QUERY_EMBED_SECONDS,
+    SEARCH_LEG_SECONDS,
+    metrics_registry,
+    render_metrics,
+)
+from semantic_search_core.metrics.timings import (
+    add_timing,
+    collect_timings,
+    format_server_timing,
+    timed,
+)
+
+__all__ = [
+    "BULK_DOCS",
+    "BULK_SECONDS",
+    "EMBED_CHUNKS",
+    "EMBED_SECONDS",
+    "FUSION_SECONDS",
+    "LLM_SECONDS",
+    "LLM_TOKENS",
+    "QUERY_EMBED_SECONDS",
+    "SEARCH_LEG_SECONDS",
+    "metrics_registry",
+    "render_metrics",
+    "add_timing",
+    "collect_timings",
+    "format_server_timing",
+    "timed",
+]
@@ -0,0 +1,88 @@
+"""Prometheus metrics for search, chat and indexing.
+
+Metrics are registered in the default prometheus_client registry. A process
+that records metrics in forked children (the RQ worker runs each job in a
+work horse) sets `PROMETHEUS_MULTIPROC_DIR` before prometheus_client is
+imported, and exports `metrics_registry()`, which then collects the
+children's samples from that directory.
+"""
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+# Seconds, from sub-millisecond in-process work up to slow LLM answers
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+TOKEN_BUCKETS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+QUERY_EMBED_SECONDS = Histogram(
+    "semantic_search_query_embed_seconds",
+    "Time to embed search and chat queries",
+    buckets=LATENCY_BUCKETS,
+)
+SEARCH_LEG_SECONDS = Histogram(
+    "semantic_search_leg_seconds",
+    "Latency of one search request to the backend (knn, bm25 or batch)",
+    ["backend", "leg"],
+    buckets=LATENCY_BUCKETS,
+)
+FUSION_SECONDS = Histogram(
+    "semantic_search_fusion_seconds",
+    "Time to fuse vector and BM25 rankings",
+    buckets=LATENCY_BUCKETS,
+)
+LLM_SECONDS = Histogram(
+    "semantic_search_llm_seconds",
+    "LLM request latency until the full answer is received",
+    ["provider", "mode"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Histogram(
+    "semantic_search_llm_tokens",
+    "Tokens per LLM request as reported by the provider",
+    ["provider", "kind"],
+    buckets=TOKEN_BUCKETS,
+)
+BULK_SECONDS = Histogram(
+    "semantic_search_bulk_seconds",
+    "Latency of one bulk indexing batch",
+    ["backend"],
+    buckets=LATENCY_BUCKETS,
+)
+BULK_DOCS = Counter(
+    "semantic_search_bulk_docs",
+    "Documents sent in bulk indexing batches",
+    ["backend", "result"],
+)
+EMBED_SECONDS = Histogram(
+    "semantic_search_embed_seconds",
+    "Time to embed the chunks of one record while indexing",
+    buckets=LATENCY_BUCKETS,
+)
+EMBED_CHUNKS = Counter(
+    "semantic_search_embed_chunks",
+    "Chunks embedded while indexing (its rate is the embedding throughput)",
+)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Get the registry to export: the default one, or the multiprocess files if configured."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics(registry: CollectorRegistry | None = None) -> tuple[bytes, str]:
+    """Render metrics in the Prometheus text format; returns the body and content type."""
+    return generate_latest(registry or metrics_registry()), CONTENT_TYPE_LATEST
@@ -0,0 +1,50 @@
+"""Per-request stage timings.
+
+`timed` measures a stage, observing an optional histogram, and adds its
+duration to the timings of the enclosing `collect_timings` block, if any.
+Stages that run more than once in a request are summed.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from prometheus_client import Histogram
+
+_timings: ContextVar[dict[str, float] | None] = ContextVar("stage_timings", default=None)
+
+
+@contextmanager
+def collect_timings() -> Iterator[dict[str, float]]:
+    """Collect the durations (ms) of the stages timed in this context into the yielded dict."""
+    timings: dict[str, float] = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+@contextmanager
+def timed(stage: str, histogram: Histogram | None = None) -> Iterator[None]:
+    """Time a block (or, as a decorator, a function) as `stage`."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        if histogram is not None:
+            histogram.observe(elapsed)
+        add_timing(stage, elapsed * 1000)
+
+
+def add_timing(stage: str, ms: float) -> None:
+    """Add `ms` to `stage` in the enclosing `collect_timings` block, if any."""
+    timings = _timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + ms
+
+
+def format_server_timing(timings: dict[str, float]) -> str:
+    """Format stage timings as a `Server-Timing` header value."""
+    return ", ".join(f"{stage};dur={ms:.1f}" for stage, ms in timings.items())
@@ -0,0 +1,29 @@
+"""Retrieval-augmented generation helpers."""
+from semantic_search_core.rag.answer_cache import (
+    clear_answers,
+    lookup_answer,
+    store_answer,
+)
+from semantic_search_core.rag.context import estimate_tokens, pack_context
+from semantic_search_core.rag.history import (
+    compress_history,
+    get_summary,
+    prefix_keys,
+    put_summary,
+    summary_due,
+    summary_source,
+)
+
+__all__ = [
+    "clear_answers",
+    "lookup_answer",
+    "store_answer",
+    "estimate_tokens",
+    "pack_context",
+    "compress_history",
+    "get_summary",
+    "prefix_keys",
+    "put_summary",
+    "summary_due",
+    "summary_source",
+]
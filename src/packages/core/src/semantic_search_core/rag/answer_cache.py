@@ -0,0 +1,70 @@
+"""Semantic cache of chat answers.
+
+Answers are stored with the embedding of the question that produced them and
+looked up by cosine similarity, so near-identical questions reuse an answer
+instead of calling the LLM. Entries live in namespaces (e.g. collection,
+collection generation and retrieval settings); a lookup only matches within
+its namespace. The cache is a small in-process exact vector index with LRU
+eviction across all namespaces.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+DEFAULT_MAX_ENTRIES = 1000
+
+_entries: OrderedDict[int, tuple[str, np.ndarray, Any]] = OrderedDict()
+_namespaces: dict[str, dict[int, np.ndarray]] = {}
+_next_id = 0
+_lock = threading.Lock()
+
+
+def _unit(embedding) -> np.ndarray:
+    vec = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def lookup_answer(namespace: str, embedding, threshold: float) -> Any | None:
+    """Get the cached value for the most similar question at or above `threshold`."""
+    query = _unit(embedding)
+    with _lock:
+        members = _namespaces.get(namespace)
+        if not members:
+            return None
+        ids = list(members)
+        scores = np.stack([members[i] for i in ids]) @ query
+        best = int(np.argmax(scores))
+        if scores[best] < threshold:
+            return None
+        entry_id = ids[best]
+        _entries.move_to_end(entry_id)
+        return _entries[entry_id][2]
+
+
+def store_answer(
+    namespace: str, embedding, value: Any, max_entries: int = DEFAULT_MAX_ENTRIES
+) -> None:
+    """Cache a value for a question embedding, evicting least recently used entries."""
+    global _next_id
+    vec = _unit(embedding)
+    with _lock:
+        entry_id = _next_id
+        _next_id += 1
+        _entries[entry_id] = (namespace, vec, value)
+        _namespaces.setdefault(namespace, {})[entry_id] = vec
+        while len(_entries) > max_entries:
+            old_id, (old_ns, _, _) = _entries.popitem(last=False)
+            members = _namespaces[old_ns]
+            del members[old_id]
+            if not members:
+                del _namespaces[old_ns]
+
+
+def clear_answers() -> None:
+    """Drop all cached answers."""
+    with _lock:
+        _entries.clear()
+        _namespaces.clear()
@@ -0,0 +1,112 @@
+"""Token-budgeted packing of retrieved chunks into LLM context."""
+import math
+
+# Rough average for English text with common LLM tokenizers
+CHARS_PER_TOKEN = 4
+# Longest overlap searched for between adjacent chunks (chunker uses 200)
+MAX_OVERLAP_CHARS = 1000
+GAP_SEPARATOR = "\n[...]\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in a text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def _overlap(left: str, right: str) -> int:
+    """Length of the longest suffix of `left` that is a prefix of `right`."""
+    for n in range(min(len(left), len(right), MAX_OVERLAP_CHARS), 0, -1):
+        if right.startswith(left[-n:]):
+            return n
+    return 0
+
+
+def _chunk_position(chunk: dict) -> tuple[str, int]:
+    """Get (parent id, chunk index) for a chunk produced by the indexer."""
+    doc_id = chunk["doc_id"]
+    parent_id = (chunk.get("metadata") or {}).get("parent_id")
+    if parent_id and doc_id.startswith(f"{parent_id}_"):
+        suffix = doc_id[len(parent_id) + 1:]
+        if suffix.isdigit():
+            return parent_id, int(suffix)
+    return doc_id, 0
+
+
+def _merge_parts(parts: dict[int, str]) -> str:
+    """Join a parent's chunks in order, removing overlap between neighbours."""
+    text = ""
+    prev_index = None
+    for index in sorted(parts):
+        body = parts[index]
+        if prev_index is None:
+            text = body
+        elif index == prev_index + 1:
+            text += body[_overlap(text, body):]
+        else:
+            text += GAP_SEPARATOR + body
+        prev_index = index
+    return text
+
+
+def pack_context(chunks: list[dict], max_tokens: int) -> list[dict]:
+    """
+    Pack ranked chunks into passages that fit a token budget.
+
+    Chunks are taken in rank order. Duplicates are dropped, chunks of the same
+    parent document are merged into one passage (adjacent chunks lose their
+    overlapping text), and chunks that would exceed `max_tokens` are skipped.
+    If even the top chunk does not fit, it is truncated to the budget.
+
+    Returns passages in order of their best-ranked chunk, each with `doc_id`,
+    `title`, `body` and `chunk_ids` (the chunks it contains).
+    """
+    passages: dict[str, dict] = {}
+    used = 0
+    for chunk in chunks:
+        doc_id = chunk["doc_id"]
+        body = chunk.get("body") or ""
+        parent_id, index = _chunk_position(chunk)
+        passage = passages.get(parent_id)
+        if passage and (doc_id in passage["chunk_ids"] or index in passage["parts"]):
+            continue
+
+        # Only count text not already covered by a neighbouring chunk
+        new_text = body
+        if passage:
+            if index - 1 in passage["parts"]:
+                new_text = new_text[_overlap(passage["parts"][index - 1], new_text):]
+            if index + 1 in passage["parts"]:
+                overlap = _overlap(new_text, passage["parts"][index + 1])
+                new_text = new_text[:len(new_text) - overlap]
+        cost = estimate_tokens(new_text)
+
+        if used + cost > max_tokens:
+            if passages:
+                continue
+            body = body[:max_tokens * CHARS_PER_TOKEN]
+            cost = estimate_tokens(body)
+
+        if passage is None:
+            passage = passages[parent_id] = {
+                "doc_id": parent_id,
+                "title": chunk.get("title") or parent_id,
+                "first_index": index,
+                "parts": {},
+                "chunk_ids": [],
+            }
+        elif index < passage["first_index"]:
+            passage["title"] = chunk.get("title") or passage["title"]
+            passage["first_index"] = index
+        passage["parts"][index] = body
+        passage["chunk_ids"].append(doc_id)
+        used += cost
+
+    return [
+        {
+            "doc_id": p["doc_id"],
+            "title": p["title"],
+            "body": _merge_parts(p["parts"]),
+            "chunk_ids": p["chunk_ids"],
+        }
+        for p in passages.values()
+    ]
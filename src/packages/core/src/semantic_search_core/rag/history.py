@@ -0,0 +1,137 @@
+"""Token-bounded conversation history for multi-turn chat.
+
+Recent turns are kept verbatim within a token budget. Older turns are
+replaced by a summary: an LLM-written one if it has been cached for that
+conversation prefix, otherwise a cheap extractive digest. Prefix keys are
+chained hashes, so the longest summarised prefix can be found without
+re-hashing the whole conversation for each candidate.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from semantic_search_core.rag.context import estimate_tokens
+
+DIGEST_CHARS_PER_MESSAGE = 200
+MAX_CACHED_SUMMARIES = 1000
+
+_summaries: OrderedDict[str, str] = OrderedDict()
+_lock = threading.Lock()
+
+
+def prefix_keys(messages: list[dict]) -> list[str]:
+    """Chained hash for every prefix: keys[i] identifies messages[:i + 1]."""
+    keys = []
+    digest = b""
+    for msg in messages:
+        h = hashlib.sha256(digest)
+        h.update(f"{msg['role']}\x00{msg['content']}".encode("utf-8"))
+        digest = h.digest()
+        keys.append(h.hexdigest())
+    return keys
+
+
+def split_history(messages: list[dict], max_tokens: int) -> tuple[list[dict], list[dict]]:
+    """
+    Split history into (older, recent) so recent fits in `max_tokens`.
+
+    `recent` always starts at a user message, so it can follow a summary
+    exchange without two assistant turns in a row.
+    """
+    used = 0
+    start = len(messages)
+    while start > 0:
+        cost = estimate_tokens(messages[start - 1]["content"])
+        if used + cost > max_tokens:
+            break
+        used += cost
+        start -= 1
+    while start < len(messages) and start > 0 and messages[start]["role"] != "user":
+        start += 1
+    return messages[:start], messages[start:]
+
+
+def digest_messages(messages: list[dict], max_tokens: int) -> str:
+    """Cheap extractive digest of messages, keeping the latest if over budget."""
+    lines = []
+    used = 0
+    for msg in reversed(messages):
+        content = " ".join(msg["content"].split())
+        if len(content) > DIGEST_CHARS_PER_MESSAGE:
+            content = content[:DIGEST_CHARS_PER_MESSAGE] + "..."
+        speaker = "User" if msg["role"] == "user" else "Assistant"
+        line = f"{speaker}: {content}"
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(reversed(lines))
+
+
+def get_summary(key: str) -> str | None:
+    """Get the cached summary for a conversation prefix."""
+    with _lock:
+        summary = _summaries.get(key)
+        if summary is not None:
+            _summaries.move_to_end(key)
+        return summary
+
+
+def put_summary(key: str, summary: str) -> None:
+    """Cache the summary for a conversation prefix (LRU-evicted)."""
+    with _lock:
+        _summaries[key] = summary
+        _summaries.move_to_end(key)
+        while len(_summaries) > MAX_CACHED_SUMMARIES:
+            _summaries.popitem(last=False)
+
+
+def summary_source(older: list[dict]) -> tuple[str | None, list[dict]]:
+    """
+    Find the longest cached summary covering a prefix of `older`.
+
+    Returns `(summary, rest)` where `rest` are the messages after that prefix
+    (all of `older` and None if nothing is cached).
+    """
+    keys = prefix_keys(older)
+    for i in range(len(keys) - 1, -1, -1):
+        cached = get_summary(keys[i])
+        if cached is not None:
+            return cached, older[i + 1:]
+    return None, older
+
+
+def summary_due(older: list[dict], min_tokens: int) -> bool:
+    """
+    Whether `older` is worth a new LLM summary.
+
+    True once the messages not covered by a cached summary reach
+    `min_tokens`; until then the digest of those messages is used, so a
+    conversation is summarised every few turns rather than on every turn.
+    """
+    _, rest = summary_source(older)
+    return sum(estimate_tokens(m["content"]) for m in rest) >= min_tokens
+
+
+def compress_history(
+    messages: list[dict], max_tokens: int
+) -> tuple[str | None, list[dict], list[dict]]:
+    """
+    Bound a conversation history to roughly `max_tokens`.
+
+    Returns `(summary, recent, older)`: `summary` stands in for the `older`
+    messages (None when nothing was dropped) and `recent` are kept verbatim.
+    The summary uses the longest cached LLM summary of an older prefix plus
+    a digest of the messages after it, and is capped at a third of the budget.
+    """
+    summary_tokens = max_tokens // 3
+    older, recent = split_history(messages, max_tokens - summary_tokens)
+    if not older:
+        return None, recent, older
+
+    cached, rest = summary_source(older)
+    if cached is None:
+        return digest_messages(older, summary_tokens), recent, older
+    digest = digest_messages(rest, max(summary_tokens - estimate_tokens(cached), 0))
+    return "\n".join(part for part in (cached, digest) if part), recent, older
@@ -1,4 +1,28 @@
 """Search module."""
-from semantic_search_core.search.types import SearchResult
+from semantic_search_core.search.types import (
+    SearchResult,
+    CollectionInfo,
+    Filters,
+    IndexSettings,
+)
+from semantic_search_core.search.metadata import METADATA_TYPES, MetadataType, coerce_metadata
+from semantic_search_core.search.backend import (
+    BACKENDS,
+    SearchBackend,
+    default_backend_name,
+    get_backend,
+)
 
-__all__ = ["SearchResult"]
+__all__ = [
+    "SearchResult",
+    "CollectionInfo",
+    "Filters",
+    "IndexSettings",
+    "METADATA_TYPES",
+    "MetadataType",
+    "coerce_metadata",
+    "BACKENDS",
+    "SearchBackend",
+    "default_backend_name",
+    "get_backend",
+]
@@ -0,0 +1,201 @@
+"""Search backend interface and selection.
+
+A backend stores a collection's documents and answers searches over them.
+All methods take the collection name; each backend maps it to its own index.
+Filters use the syntax in `search.metadata`. Hits are dicts with `doc_id`,
+`title`, `snippet`, `metadata`, `score` and `body` (None unless
+`include_body`). A search on a collection that does not exist raises
+`CollectionNotFoundError`.
+
+Backends:
+- `opensearch`: the OpenSearch cluster (default)
+- `local`: exact in-process search over memory-mapped files in
+  `LOCAL_INDEX_DIR`, for small collections, tests and benchmarks
+
+The deployment default is `SEARCH_BACKEND`. A collection created with the
+local backend keeps using it whatever the default, since its store exists.
+"""
+import os
+import threading
+from typing import Protocol
+
+from semantic_search_core.search.types import CollectionInfo, IndexSettings
+
+BACKENDS = ("opensearch", "local")
+
+_backends: dict[str, "SearchBackend"] = {}
+_lock = threading.Lock()
+
+
+class SearchBackend(Protocol):
+    """Storage and retrieval for collections."""
+
+    name: str
+
+    def ensure_collection(
+        self,
+        collection_name: str,
+        embedding_dim: int,
+        embed_model: str | None = None,
+        metadata_types: dict[str, str] | None = None,
+        index_settings: IndexSettings | None = None,
+        expected_docs: int | None = None,
+    ) -> str:
+        """
+        Create the collection if needed; returns its index name.
+
+        `metadata_types` declares typed metadata fields (see
+        `search.metadata`); fields new to an existing collection are added.
+        `index_settings` tune a new collection's vector index, where the
+        backend has one, and `expected_docs` lets the backend size it.
+        """
+        ...
+
+    def finish_indexing(self, collection_name: str) -> None:
+        """
+        End an indexing job on the collection, whether it succeeded or not.
+
+        Undoes tuning `ensure_collection` applied for the load (such as a
+        longer refresh interval) and makes the new documents searchable.
+        """
+        ...
+
+    def delete_collection(self, collection_name: str) -> None:
+        """Delete the collection and its documents (no-op if missing)."""
+        ...
+
+    def get_collection_info(self, collection_name: str) -> CollectionInfo | None:
+        """Describe the collection, or None if it does not exist."""
+        ...
+
+    def list_collections(self) -> list[str]:
+        """Index names of all collections in this backend."""
+        ...
+
+    def get_document(self, collection_name: str, doc_id: str) -> dict | None:
+        """The document as a hit with its body and no score, or None if missing."""
+        ...
+
+    def index_documents(
+        self, collection_name: str, docs: list[dict], stats: dict | None = None
+    ) -> tuple[int, int]:
+        """
+        Store documents built by `build_doc`; returns (indexed, failed).
+
+        `stats`, if given, accumulates the `bytes` and `requests` sent and
+        `retries` (for backends that send documents over the network).
+        """
+        ...
+
+    def search_knn(
+        self,
+        collection_name: str,
+        query_embedding: list[float],
+        k: int = 10,
+        filters: dict | None = None,
+        size: int = 10,
+        query_text: str | None = None,
+        include_body: bool = False,
+        ef_search: int | None = None,
+    ) -> list[dict]:
+        """
+        Vector search for the `k` nearest neighbours, returning the top `size`.
+
+        `ef_search` overrides the collection's HNSW search depth for this
+        query (ignored by exact backends).
+        """
+        ...
+
+    def search_bm25(
+        self,
+        collection_name: str,
+        query_text: str,
+        filters: dict | None = None,
+        size: int = 10,
+        include_body: bool = False,
+    ) -> list[dict]:
+        """BM25 text search."""
+        ...
+
+    def search_bm25_page(
+        self,
+        collection_name: str,
+        query_text: str,
+        filters: dict | None = None,
+        size: int = 10,
+        pit_id: str | None = None,
+        search_after: list | None = None,
+        include_body: bool = False,
+    ) -> tuple[list[dict], str | None, list | None]:
+        """
+        One page of BM25 results from a stable snapshot.
+
+        Returns `(hits, pit_id, search_after)`; pass both back for the next
+        page. `search_after` is None on the last page.
+        """
+        ...
+
+    def search_hybrid(
+        self,
+        collection_name: str,
+        query_text: str,
+        query_embedding: list[float],
+        k: int = 10,
+        filters: dict | None = None,
+        vector_weight: float = 0.5,
+        bm25_weight: float = 0.5,
+        include_body: bool = False,
+        fetch_size: int | None = None,
+        ef_search: int | None = None,
+    ) -> list[dict]:
+        """BM25 and vector search fused with RRF."""
+        ...
+
+    def search_batch(self, queries: list[dict]) -> list[dict]:
+        """
+        Run many searches.
+
+        Each query is a dict with `collection_name`, `mode`, `query_text`,
+        `query_embedding`, `k`, and optionally `filters` and `include_body`.
+        Returns one `{"hits", "error"}` dict per query, in order.
+        """
+        ...
+
+
+def default_backend_name() -> str:
+    """The deployment's default backend (`SEARCH_BACKEND`)."""
+    return os.environ.get("SEARCH_BACKEND", "opensearch").lower()
+
+
+def _backend(name: str) -> SearchBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown search backend: {name} (expected one of {', '.join(BACKENDS)})")
+    with _lock:
+        backend = _backends.get(name)
+        if backend is None:
+            if name == "local":
+                from semantic_search_core.search.local.backend import LocalBackend
+
+                backend = LocalBackend()
+            else:
+                from semantic_search_core.search.opensearch.backend import OpenSearchBackend
+
+                backend = OpenSearchBackend()
+            _backends[name] = backend
+    return backend
+
+
+def get_backend(collection_name: str | None = None, name: str | None = None) -> SearchBackend:
+    """
+    Get the backend for a collection.
+
+    An explicit `name` wins; otherwise a collection with a local store uses
+    the local backend, and anything else uses the deployment default.
+    """
+    if name:
+        return _backend(name.lower())
+    if collection_name and default_backend_name() != "local":
+        local = _backend("local")
+        if local.get_collection_info(collection_name) is not None:
+            return local
+    return _backend(default_backend_name())
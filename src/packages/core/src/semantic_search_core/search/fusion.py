@@ -0,0 +1,45 @@
+"""Rank fusion of vector and BM25 results, shared by all search backends."""
+from semantic_search_core.metrics import FUSION_SECONDS, timed
+
+
+@timed("fusion", FUSION_SECONDS)
+def fuse_rrf(
+    knn_results: list[dict],
+    bm25_results: list[dict],
+    k: int = 10,
+    vector_weight: float = 0.5,
+    bm25_weight: float = 0.5,
+) -> list[dict]:
+    """Merge vector and BM25 rankings with Reciprocal Rank Fusion."""
+    # RRF constant (typically 60)
+    rrf_k = 60
+    
+    # Calculate RRF scores
+    doc_scores: dict[str, float] = {}
+    doc_data: dict[str, dict] = {}
+    
+    # Score from vector search
+    for rank, doc in enumerate(knn_results, start=1):
+        doc_id = doc["doc_id"]
+        rrf_score = vector_weight * (1.0 / (rrf_k + rank))
+        doc_scores[doc_id] = doc_scores.get(doc_id, 0) + rrf_score
+        doc_data[doc_id] = doc
+    
+    # Score from BM25 search
+    for rank, doc in enumerate(bm25_results, start=1):
+        doc_id = doc["doc_id"]
+        rrf_score = bm25_weight * (1.0 / (rrf_k + rank))
+        doc_scores[doc_id] = doc_scores.get(doc_id, 0) + rrf_score
+        if doc_id not in doc_data:
+            doc_data[doc_id] = doc
+    
+    # Sort by RRF score and return top k
+    sorted_docs = sorted(doc_scores.items(), key=lambda x: x[1], reverse=True)[:k]
+    
+    results = []
+    for doc_id, score in sorted_docs:
+        doc = doc_data[doc_id].copy()
+        doc["score"] = score  # Replace original score with RRF score
+        results.append(doc)
+    
+    return results
@@ -0,0 +1,26 @@
+"""Local (in-process) search over memory-mapped embeddings."""
+from semantic_search_core.search.local.backend import LocalBackend
+from semantic_search_core.search.local.text import search_bm25
+from semantic_search_core.search.local.vectors import (
+    VectorStore,
+    append_documents,
+    create_store,
+    delete_store,
+    open_store,
+    search_knn,
+    store_path,
+    store_root,
+)
+
+__all__ = [
+    "LocalBackend",
+    "search_bm25",
+    "VectorStore",
+    "append_documents",
+    "create_store",
+    "delete_store",
+    "open_store",
+    "search_knn",
+    "store_path",
+    "store_root",
+]
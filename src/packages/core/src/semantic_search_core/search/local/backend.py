@@ -0,0 +1,235 @@
+"""Local search backend: exact search over memory-mapped stores on disk."""
+import json
+import os
+
+import structlog
+
+from semantic_search_core.metrics import BULK_DOCS, BULK_SECONDS, timed
+from semantic_search_core.search.local.text import rank_bm25, search_bm25
+from semantic_search_core.search.metadata import validate_metadata_types
+from semantic_search_core.search.local.vectors import (
+    VectorStore,
+    add_metadata_types,
+    append_documents,
+    create_store,
+    delete_store,
+    open_store,
+    search_knn,
+    store_path,
+    store_root,
+)
+from semantic_search_core.search.fusion import fuse_rrf
+from semantic_search_core.search.types import CollectionInfo, IndexSettings
+from semantic_search_core.util import CollectionNotFoundError, safe_index_name
+
+logger = structlog.get_logger()
+
+# Snapshot id reported as the "pit" of local BM25 pages
+LOCAL_PIT = "local"
+
+
+class LocalBackend:
+    """Reference `SearchBackend` that needs no cluster."""
+
+    name = "local"
+
+    def __init__(self, root: str | None = None):
+        self._root = root
+
+    @property
+    def root(self) -> str:
+        return self._root or store_root()
+
+    def _store(self, collection_name: str) -> VectorStore:
+        store = open_store(store_path(collection_name, self.root))
+        if store is None:
+            raise CollectionNotFoundError(f"Collection not found: {collection_name}")
+        return store
+
+    def ensure_collection(
+        self,
+        collection_name: str,
+        embedding_dim: int,
+        embed_model: str | None = None,
+        metadata_types: dict[str, str] | None = None,
+        index_settings: IndexSettings | None = None,
+        expected_docs: int | None = None,
+    ) -> str:
+        # Search is exact, so there is no vector index to tune
+        metadata_types = validate_metadata_types(metadata_types)
+        embed_model = embed_model or os.environ.get(
+            "EMBED_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
+        )
+        path = store_path(collection_name, self.root)
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            create_store(
+                path,
+                embedding_dim,
+                embed_model,
+                dtype=os.environ.get("LOCAL_INDEX_DTYPE", "float32"),
+                metadata_types=metadata_types,
+            )
+            logger.info("created_local_store", path=path, collection=collection_name)
+        elif metadata_types:
+            add_metadata_types(path, metadata_types)
+        return safe_index_name(collection_name)
+
+    def finish_indexing(self, collection_name: str) -> None:
+        # Appended documents are searchable immediately
+        pass
+
+    def delete_collection(self, collection_name: str) -> None:
+        delete_store(store_path(collection_name, self.root))
+
+    def get_collection_info(self, collection_name: str) -> CollectionInfo | None:
+        try:
+            with open(os.path.join(store_path(collection_name, self.root), "meta.json")) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        return CollectionInfo(
+            name=collection_name,
+            index_name=safe_index_name(collection_name),
+            embedding_dim=meta.get("embedding_dim"),
+            embed_model=meta.get("embed_model"),
+            metadata_types=meta.get("metadata_types") or {},
+            settings={"uuid": meta.get("uuid", ""), "backend": self.name, "dtype": meta.get("dtype")},
+        )
+
+    def list_collections(self) -> list[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            entry for entry in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, entry, "meta.json"))
+        )
+
+    def get_document(self, collection_name: str, doc_id: str) -> dict | None:
+        store = self._store(collection_name)
+        row = store.row_of(doc_id)
+        if row is None:
+            return None
+        hit = store.hits([row], [0.0], include_body=True)[0]
+        return {**hit, "score": None}
+
+    def index_documents(
+        self, collection_name: str, docs: list[dict], stats: dict | None = None
+    ) -> tuple[int, int]:
+        try:
+            with timed("bulk", BULK_SECONDS.labels("local")):
+                indexed = append_documents(store_path(collection_name, self.root), docs)
+        except (OSError, ValueError) as e:
+            logger.exception("local_index_exception", error=str(e), doc_count=len(docs))
+            BULK_DOCS.labels("local", "failed").inc(len(docs))
+            return 0, len(docs)
+        BULK_DOCS.labels("local", "indexed").inc(indexed)
+        return indexed, 0
+
+    def search_knn(
+        self,
+        collection_name: str,
+        query_embedding: list[float],
+        k: int = 10,
+        filters: dict | None = None,
+        size: int = 10,
+        query_text: str | None = None,
+        include_body: bool = False,
+        ef_search: int | None = None,
+    ) -> list[dict]:
+        return search_knn(
+            self._store(collection_name),
+            query_embedding,
+            k=k,
+            filters=filters,
+            size=size,
+            query_text=query_text,
+            include_body=include_body,
+        )
+
+    def search_bm25(
+        self,
+        collection_name: str,
+        query_text: str,
+        filters: dict | None = None,
+        size: int = 10,
+        include_body: bool = False,
+    ) -> list[dict]:
+        return search_bm25(
+            self._store(collection_name),
+            query_text,
+            filters=filters,
+            size=size,
+            include_body=include_body,
+        )
+
+    def search_bm25_page(
+        self,
+        collection_name: str,
+        query_text: str,
+        filters: dict | None = None,
+        size: int = 10,
+        pit_id: str | None = None,
+        search_after: list | None = None,
+        include_body: bool = False,
+    ) -> tuple[list[dict], str | None, list | None]:
+        # Pages are offsets into the full ranking; appends between pages shift it
+        store = self._store(collection_name)
+        rows, scores = rank_bm25(store, query_text, filters)
+        offset = int(search_after[0]) if search_after else 0
+        end = offset + size
+        hits = store.hits(rows[offset:end], scores[offset:end], query_text, include_body)
+        return hits, LOCAL_PIT, [end] if end < len(rows) else None
+
+    def search_hybrid(
+        self,
+        collection_name: str,
+        query_text: str,
+        query_embedding: list[float],
+        k: int = 10,
+        filters: dict | None = None,
+        vector_weight: float = 0.5,
+        bm25_weight: float = 0.5,
+        include_body: bool = False,
+        fetch_size: int | None = None,
+        ef_search: int | None = None,
+    ) -> list[dict]:
+        if fetch_size is None:
+            fetch_size = min(k * 3, 100)
+        store = self._store(collection_name)
+        knn_results = search_knn(
+            store,
+            query_embedding,
+            k=k,
+            filters=filters,
+            size=fetch_size,
+            query_text=query_text,
+            include_body=include_body,
+        )
+        bm25_results = search_bm25(
+            store, query_text, filters=filters, size=fetch_size, include_body=include_body
+        )
+        return fuse_rrf(knn_results, bm25_results, k, vector_weight, bm25_weight)
+
+    def search_batch(self, queries: list[dict]) -> list[dict]:
+        out = []
+        for q in queries:
+            mode = q.get("mode", "hybrid")
+            args = {"filters": q.get("filters"), "include_body": q.get("include_body", False)}
+            k = q.get("k", 10)
+            try:
+                if mode == "bm25":
+                    hits = self.search_bm25(q["collection_name"], q["query_text"], size=k, **args)
+                elif mode == "vector":
+                    hits = self.search_knn(
+                        q["collection_name"], q["query_embedding"], k=k, size=k,
+                        query_text=q["query_text"], **args,
+                    )
+                else:
+                    hits = self.search_hybrid(
+                        q["collection_name"], q["query_text"], q["query_embedding"], k=k, **args
+                    )
+            except CollectionNotFoundError as e:
+                out.append({"hits": [], "error": str(e)})
+                continue
+            out.append({"hits": hits, "error": None})
+        return out
@@ -0,0 +1,109 @@
+"""BM25 text search over a local vector store's documents.
+
+Mirrors the OpenSearch BM25 query: title matches are boosted 2x and the best
+field's score is used (`best_fields`). Terms are lowercased word tokens;
+unlike OpenSearch there is no fuzzy matching or stemming.
+"""
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from semantic_search_core.metrics import SEARCH_LEG_SECONDS, timed
+from semantic_search_core.search.local.vectors import VectorStore
+
+K1 = 1.2
+B = 0.75
+FIELD_BOOSTS = {"title": 2.0, "body": 1.0}
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN.findall(text.lower())
+
+
+class Bm25Index:
+    """Inverted index of one store snapshot's title and body fields."""
+
+    def __init__(self, store: VectorStore):
+        self.rows = len(store.docs)
+        self.postings: dict[str, dict[str, tuple[np.ndarray, np.ndarray]]] = {}
+        self.lengths: dict[str, np.ndarray] = {}
+        live = np.flatnonzero(store.live)
+        for field in FIELD_BOOSTS:
+            lists: dict[str, tuple[list[int], list[int]]] = defaultdict(lambda: ([], []))
+            lengths = np.zeros(self.rows, dtype=np.float32)
+            for row in live:
+                tokens = tokenize(store.docs[row].get(field) or "")
+                lengths[row] = len(tokens)
+                for term, tf in Counter(tokens).items():
+                    rows, tfs = lists[term]
+                    rows.append(row)
+                    tfs.append(tf)
+            self.postings[field] = {
+                term: (np.array(rows, dtype=np.int64), np.array(tfs, dtype=np.float32))
+                for term, (rows, tfs) in lists.items()
+            }
+            self.lengths[field] = lengths
+        self.docs_count = len(live)
+
+    def scores(self, query_text: str) -> np.ndarray:
+        """BM25 score of every row for a query (0 where nothing matched)."""
+        terms = set(tokenize(query_text))
+        best = np.zeros(self.rows, dtype=np.float32)
+        for field, boost in FIELD_BOOSTS.items():
+            lengths = self.lengths[field]
+            avg_length = lengths.sum() / self.docs_count if self.docs_count else 0.0
+            if not avg_length:
+                continue
+            field_scores = np.zeros(self.rows, dtype=np.float32)
+            for term in terms:
+                posting = self.postings[field].get(term)
+                if posting is None:
+                    continue
+                rows, tfs = posting
+                idf = np.log(1 + (self.docs_count - len(rows) + 0.5) / (len(rows) + 0.5))
+                norm = K1 * (1 - B + B * lengths[rows] / avg_length)
+                field_scores[rows] += idf * tfs * (K1 + 1) / (tfs + norm)
+            np.maximum(best, boost * field_scores, out=best)
+        return best
+
+
+def _index(store: VectorStore) -> Bm25Index:
+    """Get the BM25 index of a store snapshot, building it on first use."""
+    index = getattr(store, "_bm25", None)
+    if index is None:
+        index = store._bm25 = Bm25Index(store)
+    return index
+
+
+def rank_bm25(store: VectorStore, query_text: str, filters: dict | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """All matching rows ordered by BM25 score (ties by doc_id), with scores."""
+    scores = _index(store).scores(query_text)
+    mask = store.filter_mask(filters) & (scores > 0)
+    rows = np.flatnonzero(mask)
+    order = np.lexsort((store.doc_ids[rows].astype(str), -scores[rows]))
+    rows = rows[order]
+    return rows, scores[rows]
+
+
+@timed("bm25", SEARCH_LEG_SECONDS.labels("local", "bm25"))
+def search_bm25(
+    store: VectorStore,
+    query_text: str,
+    filters: dict | None = None,
+    size: int = 10,
+    include_body: bool = False,
+) -> list[dict]:
+    """Perform BM25 text search; same arguments and hits as the OpenSearch version."""
+    if size <= 0:
+        return []
+    scores = _index(store).scores(query_text)
+    mask = store.filter_mask(filters) & (scores > 0)
+    rows = np.flatnonzero(mask)
+    if len(rows) > size:
+        rows = rows[np.argpartition(-scores[rows], size - 1)[:size]]
+    rows = rows[np.argsort(-scores[rows], kind="stable")]
+    return store.hits(rows, scores[rows], query_text, include_body)
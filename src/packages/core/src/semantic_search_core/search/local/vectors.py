@@ -0,0 +1,325 @@
+"""Exact vector search over memory-mapped embeddings.
+
+A store is a directory holding:
+- `meta.json`: embedding dimension, dtype (float32 or float16), model and
+  declared metadata types
+- `vectors.bin`: raw embedding rows, appended as documents are indexed
+- `docs.jsonl`: one line per row with doc_id, title, body and metadata
+
+Both files are append-only, so indexing never rewrites the matrix, and a
+reloaded snapshot only parses the doc lines appended since the last one. A doc_id
+written again replaces its earlier row (the last row wins). Searches score
+every live row, which is exact and, for small and medium collections, faster
+than a round trip to a kNN cluster. Scores use the same L2 space and score
+formula as the OpenSearch index, so results can be fused the same way.
+"""
+import json
+import os
+import shutil
+import threading
+import uuid
+
+import numpy as np
+
+from semantic_search_core.metrics import SEARCH_LEG_SECONDS, timed
+from semantic_search_core.search.metadata import matches, parse_filters
+from semantic_search_core.util import safe_index_name
+
+SNIPPET_CHARS = 200
+# Rows scored per matrix product; bounds the float32 copy made of fp16 rows
+BLOCK_ROWS = 65536
+DTYPES = ("float32", "float16")
+
+_stores: dict[str, "VectorStore"] = {}
+_lock = threading.Lock()
+
+
+def store_root() -> str:
+    """Directory holding the local stores of all collections."""
+    return os.environ.get("LOCAL_INDEX_DIR", "/data/vectors")
+
+
+def store_path(collection_name: str, root: str | None = None) -> str:
+    """Directory of the local vector store for a collection."""
+    return os.path.join(root or store_root(), safe_index_name(collection_name))
+
+
+class VectorStore:
+    """
+    A read-only, memory-mapped snapshot of a store directory.
+
+    Given the `previous` snapshot of the same store, only doc lines appended
+    since then are read.
+    """
+
+    def __init__(self, path: str, previous: "VectorStore | None" = None):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.embedding_dim = int(self.meta["embedding_dim"])
+        dtype = np.dtype(self.meta.get("dtype", "float32"))
+
+        docs_path = os.path.join(path, "docs.jsonl")
+        # A store deleted and re-created at the same path gets a new uuid
+        if previous is not None and previous.meta.get("uuid") == self.meta.get("uuid"):
+            appended, self._docs_end = _read_docs(docs_path, previous._docs_end)
+            self._parsed = previous._parsed + appended
+        else:
+            self._parsed, self._docs_end = _read_docs(docs_path)
+        vectors_path = os.path.join(path, "vectors.bin")
+        self.size_bytes = os.path.getsize(vectors_path)
+        rows = min(self.size_bytes // (self.embedding_dim * dtype.itemsize), len(self._parsed))
+        self.docs = self._parsed[:rows]
+        if rows:
+            self.embeddings = np.memmap(
+                vectors_path, dtype=dtype, mode="r", shape=(rows, self.embedding_dim)
+            )
+        else:
+            self.embeddings = np.zeros((0, self.embedding_dim), dtype=dtype)
+
+        self.doc_ids = np.array([d["doc_id"] for d in self.docs], dtype=object)
+        # Only the last row written for each doc_id is live
+        latest = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+        self.live = np.zeros(rows, dtype=bool)
+        self.live[list(latest.values())] = True
+
+        self._sq_norms: np.ndarray | None = None
+        self._columns: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return int(self.live.sum())
+
+    def row_of(self, doc_id: str) -> int | None:
+        """Live row holding `doc_id`, or None."""
+        rows = np.flatnonzero(self.live & (self.doc_ids == doc_id))
+        return int(rows[0]) if len(rows) else None
+
+    def _row_sq_norms(self) -> np.ndarray:
+        if self._sq_norms is None:
+            norms = np.empty(len(self.docs), dtype=np.float32)
+            for start in range(0, len(self.docs), BLOCK_ROWS):
+                block = np.asarray(self.embeddings[start:start + BLOCK_ROWS], dtype=np.float32)
+                norms[start:start + len(block)] = np.einsum("ij,ij->i", block, block)
+            self._sq_norms = norms
+        return self._sq_norms
+
+    def _column(self, key: str) -> np.ndarray:
+        column = self._columns.get(key)
+        if column is None:
+            column = np.empty(len(self.docs), dtype=object)
+            column[:] = [(d.get("metadata") or {}).get(key) for d in self.docs]
+            self._columns[key] = column
+        return column
+
+    def filter_mask(self, filters: dict | None) -> np.ndarray:
+        """Boolean mask of live rows whose metadata satisfies every filter."""
+        mask = self.live.copy()
+        for key, kind, operand, negated in parse_filters(filters):
+            column = self._column(key)
+            if kind == "term":
+                selected = column == operand
+            else:
+                selected = np.fromiter(
+                    (matches(value, kind, operand) for value in column),
+                    dtype=bool,
+                    count=len(column),
+                )
+            mask &= ~selected if negated else selected
+        return mask
+
+    def top_k(
+        self, query_embedding: list[float], k: int, mask: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Rows of the `k` nearest vectors (by L2) among `mask`, with scores."""
+        if k <= 0 or not len(self.docs):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        query = np.asarray(query_embedding, dtype=np.float32)
+        distances = np.empty(len(self.docs), dtype=np.float32)
+        for start in range(0, len(self.docs), BLOCK_ROWS):
+            block = np.asarray(self.embeddings[start:start + BLOCK_ROWS], dtype=np.float32)
+            distances[start:start + len(block)] = block @ query
+        # ||x - q||^2 = ||x||^2 - 2 x.q + ||q||^2
+        distances = self._row_sq_norms() - 2 * distances + float(query @ query)
+        np.maximum(distances, 0, out=distances)
+
+        candidates = np.flatnonzero(self.live if mask is None else mask)
+        if len(candidates) > k:
+            nearest = np.argpartition(distances[candidates], k - 1)[:k]
+            candidates = candidates[nearest]
+        rows = candidates[np.argsort(distances[candidates], kind="stable")]
+        # Same score as OpenSearch's l2 space
+        return rows, 1.0 / (1.0 + distances[rows])
+
+    def hits(
+        self,
+        rows: np.ndarray,
+        scores: np.ndarray,
+        query_text: str | None = None,
+        include_body: bool = False,
+    ) -> list[dict]:
+        """Format rows as search hits, like the OpenSearch hit parser."""
+        out = []
+        for row, score in zip(rows, scores):
+            doc = self.docs[row]
+            body = doc.get("body") or ""
+            out.append(
+                {
+                    "doc_id": doc["doc_id"],
+                    "title": doc.get("title") or "",
+                    "snippet": _snippet(body, query_text),
+                    "metadata": doc.get("metadata", {}),
+                    "score": float(score),
+                    "body": body if include_body else None,
+                }
+            )
+        return out
+
+
+def _read_docs(path: str, offset: int = 0) -> tuple[list[dict], int]:
+    """
+    Read complete lines of docs.jsonl from byte `offset`.
+
+    Returns the docs and the offset after the last complete line (a trailing
+    partial line is left for the next read).
+    """
+    docs = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            docs.append(json.loads(line))
+            offset += len(line)
+    return docs, offset
+
+
+def create_store(
+    path: str,
+    embedding_dim: int,
+    embed_model: str | None = None,
+    dtype: str = "float32",
+    metadata_types: dict[str, str] | None = None,
+) -> None:
+    """Create an empty store unless one already exists at `path`."""
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+    if os.path.exists(os.path.join(path, "meta.json")):
+        return
+    os.makedirs(path, exist_ok=True)
+    open(os.path.join(path, "vectors.bin"), "wb").close()
+    open(os.path.join(path, "docs.jsonl"), "wb").close()
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump({
+            "embedding_dim": embedding_dim,
+            "dtype": dtype,
+            "embed_model": embed_model,
+            "uuid": uuid.uuid4().hex,
+            "metadata_types": metadata_types or {},
+        }, f)
+
+
+def add_metadata_types(path: str, metadata_types: dict[str, str]) -> None:
+    """Record metadata types not yet declared in a store's meta.json."""
+    meta_path = os.path.join(path, "meta.json")
+    with open(meta_path) as f:
+        meta = json.load(f)
+    declared = meta.get("metadata_types") or {}
+    new_types = {f: t for f, t in metadata_types.items() if f not in declared}
+    if not new_types:
+        return
+    meta["metadata_types"] = {**declared, **new_types}
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def append_documents(path: str, docs: list[dict]) -> int:
+    """Append documents (as built by `build_doc`) to a store. Returns the count written."""
+    if not docs:
+        return 0
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    dim = int(meta["embedding_dim"])
+    matrix = np.asarray([d["embedding"] for d in docs], dtype=meta.get("dtype", "float32"))
+    if matrix.shape != (len(docs), dim):
+        raise ValueError(f"Expected embeddings of dimension {dim}, got {matrix.shape}")
+
+    lines = b"".join(
+        json.dumps({
+            "doc_id": d.get("doc_id", ""),
+            "title": d.get("title") or "",
+            "body": d.get("body") or "",
+            "metadata": d.get("metadata") or {},
+        }).encode("utf-8") + b"\n"
+        for d in docs
+    )
+    # Vectors first: readers only see rows that have both a vector and a doc line
+    with open(os.path.join(path, "vectors.bin"), "ab") as f:
+        f.write(matrix.tobytes())
+    with open(os.path.join(path, "docs.jsonl"), "ab") as f:
+        f.write(lines)
+    return len(docs)
+
+
+def delete_store(path: str) -> None:
+    """Delete a store and drop it from the cache."""
+    with _lock:
+        _stores.pop(path, None)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def open_store(path: str) -> VectorStore | None:
+    """Get a store snapshot, reloading it if documents were appended. None if missing."""
+    try:
+        size = os.path.getsize(os.path.join(path, "vectors.bin"))
+        # Vectors are appended before their doc lines, so a snapshot taken
+        # between the two writes is stale once the docs file grows
+        docs_size = os.path.getsize(os.path.join(path, "docs.jsonl"))
+    except OSError:
+        with _lock:
+            _stores.pop(path, None)
+        return None
+    with _lock:
+        store = _stores.get(path)
+    if store is None or store.size_bytes != size or store._docs_end != docs_size:
+        # Appends only grow the store; anything else is read from scratch
+        grown = store is not None and store.size_bytes <= size and store._docs_end <= docs_size
+        previous = store if grown else None
+        store = VectorStore(path, previous)
+        with _lock:
+            _stores[path] = store
+    return store
+
+
+def _snippet(body: str, query_text: str | None) -> str:
+    """Plain-text window of the body, starting near the first query term if any."""
+    start = 0
+    if query_text:
+        lowered = body.lower()
+        positions = [p for p in (lowered.find(t) for t in query_text.lower().split()) if p >= 0]
+        if positions:
+            start = max(min(positions) - SNIPPET_CHARS // 4, 0)
+    snippet = body[start:start + SNIPPET_CHARS]
+    return snippet + ("..." if start + SNIPPET_CHARS < len(body) else "")
+
+
+@timed("knn", SEARCH_LEG_SECONDS.labels("local", "knn"))
+def search_knn(
+    store: VectorStore,
+    query_embedding: list[float],
+    k: int = 10,
+    filters: dict | None = None,
+    size: int = 10,
+    query_text: str | None = None,
+    include_body: bool = False,
+) -> list[dict]:
+    """
+    Perform exact k-NN vector search; same arguments and hits as the OpenSearch version.
+
+    Returns the top `size` hits; `k` (the approximate search's candidate
+    depth) does not change an exact result.
+    """
+    mask = store.filter_mask(filters) if filters else None
+    rows, scores = store.top_k(query_embedding, size, mask)
+    return store.hits(rows, scores, query_text, include_body)
@@ -0,0 +1,165 @@
+"""Typed metadata fields and filters.
+
+Jobs can declare a type for each metadata field. Declared fields get an
+explicit mapping (no text analysis) and values are converted to the type
+at indexing time; undeclared fields keep dynamic mapping.
+
+Filters map a metadata field to a condition:
+- a value: `{"lang": "en"}` (equality)
+- a list: `{"lang": ["en", "fr"]}` (any of the values)
+- a range: `{"year": {"gte": 2020, "lt": 2024}}` (any of gt, gte, lt, lte)
+- a negation: `{"lang": {"not": "de"}}` (of a value, list or range)
+All conditions must hold.
+"""
+from datetime import date, datetime
+from typing import Any, Literal, get_args
+
+from semantic_search_core.util import ValidationError
+
+MetadataType = Literal["keyword", "integer", "float", "date", "boolean"]
+METADATA_TYPES = get_args(MetadataType)
+RANGE_OPERATORS = ("gt", "gte", "lt", "lte")
+
+# OpenSearch field type for each declared type
+OPENSEARCH_TYPES = {
+    "keyword": "keyword",
+    "integer": "long",
+    "float": "double",
+    "date": "date",
+    "boolean": "boolean",
+}
+
+_TRUE = {"true", "1", "yes", "y", "t"}
+_FALSE = {"false", "0", "no", "n", "f", ""}
+
+
+def validate_metadata_types(metadata_types: dict[str, str] | None) -> dict[str, str]:
+    """Check declared field types, returning them as a plain dict."""
+    metadata_types = dict(metadata_types or {})
+    for field, type_name in metadata_types.items():
+        if type_name not in METADATA_TYPES:
+            raise ValidationError(
+                f"Unknown type {type_name!r} for metadata field {field!r} "
+                f"(expected one of {', '.join(METADATA_TYPES)})"
+            )
+    return metadata_types
+
+
+def coerce_value(value: Any, type_name: str) -> Any:
+    """Convert a value to a declared type; raises ValueError if it cannot."""
+    if type_name == "keyword":
+        return value if isinstance(value, str) else str(value)
+    if type_name == "integer":
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"Not an integer: {value}")
+        return int(value) if not isinstance(value, str) else int(float(value.strip()))
+    if type_name == "float":
+        return float(value)
+    if type_name == "boolean":
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+        raise ValueError(f"Not a boolean: {value}")
+    if type_name == "date":
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, date):
+            return value.isoformat()
+        text = str(value).strip()
+        datetime.fromisoformat(text.replace("Z", "+00:00"))
+        return text
+    raise ValueError(f"Unknown type: {type_name}")
+
+
+def coerce_metadata(metadata: dict, metadata_types: dict[str, str] | None) -> dict:
+    """
+    Convert declared fields of a record's metadata to their types.
+
+    Values that cannot be converted are dropped (an explicit mapping would
+    reject the whole document otherwise).
+    """
+    if not metadata_types:
+        return metadata
+    out = {}
+    for field, value in metadata.items():
+        type_name = metadata_types.get(field)
+        if type_name is None or value is None:
+            out[field] = value
+            continue
+        try:
+            out[field] = coerce_value(value, type_name)
+        except (TypeError, ValueError):
+            continue
+    return out
+
+
+def _parse_condition(field: str, condition: Any) -> tuple[str, Any]:
+    """Classify one condition as ("term" | "terms" | "range", operand)."""
+    if isinstance(condition, list):
+        if not condition:
+            raise ValidationError(f"Filter on {field!r} has an empty list")
+        return "terms", condition
+    if isinstance(condition, dict):
+        unknown = set(condition) - set(RANGE_OPERATORS)
+        if unknown or not condition:
+            raise ValidationError(
+                f"Filter on {field!r} must be a value, a list, a range "
+                f"({', '.join(RANGE_OPERATORS)}) or {{\"not\": ...}}"
+            )
+        return "range", condition
+    return "term", condition
+
+
+def parse_filters(filters: dict | None) -> list[tuple[str, str, Any, bool]]:
+    """
+    Validate filters into `(field, kind, operand, negated)` conditions.
+
+    `kind` is "term", "terms" or "range". Raises ValidationError for
+    malformed filters.
+    """
+    conditions = []
+    for field, condition in (filters or {}).items():
+        negated = isinstance(condition, dict) and set(condition) == {"not"}
+        if negated:
+            condition = condition["not"]
+            if isinstance(condition, dict) and "not" in condition:
+                raise ValidationError(f"Filter on {field!r} has a nested not")
+        kind, operand = _parse_condition(field, condition)
+        conditions.append((field, kind, operand, negated))
+    return conditions
+
+
+def check_filters(filters: dict | None) -> dict | None:
+    """Pydantic validator for filters: raises ValueError if malformed."""
+    try:
+        parse_filters(filters)
+    except ValidationError as e:
+        raise ValueError(str(e)) from e
+    return filters
+
+
+def _in_range(value: Any, bounds: dict) -> bool:
+    try:
+        return (
+            ("gt" not in bounds or value > bounds["gt"])
+            and ("gte" not in bounds or value >= bounds["gte"])
+            and ("lt" not in bounds or value < bounds["lt"])
+            and ("lte" not in bounds or value <= bounds["lte"])
+        )
+    except TypeError:
+        return False
+
+
+def matches(value: Any, kind: str, operand: Any) -> bool:
+    """Whether a (non-negated) condition holds for a stored value."""
+    if value is None:
+        return False
+    if kind == "term":
+        return value == operand
+    if kind == "terms":
+        return value in operand
+    return _in_range(value, operand)
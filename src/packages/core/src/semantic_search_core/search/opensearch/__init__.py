@@ -1,28 +1,53 @@
 """OpenSearch client and operations."""
-from semantic_search_core.search.opensearch.client import get_client
-from semantic_search_core.search.opensearch.mapping import get_index_mapping
+from semantic_search_core.search.opensearch.client import (
+    get_client,
+    close_client,
+)
+from semantic_search_core.search.opensearch.mapping import get_index_mapping, get_index_settings
+from semantic_search_core.search.opensearch.backend import OpenSearchBackend
 from semantic_search_core.search.opensearch.index import (
     ensure_index,
+    finish_load,
+    size_index_settings,
     delete_index,
     index_documents,
     build_doc,
     safe_index_name,
 )
+from semantic_search_core.search.opensearch.registry import (
+    get_collection_info,
+    invalidate_collection,
+)
 from semantic_search_core.search.opensearch.query import (
+    get_document,
     search_knn,
     search_bm25,
+    search_bm25_page,
     search_hybrid,
+    search_batch,
+    fuse_rrf,
 )
 
 __all__ = [
     "get_client",
+    "close_client",
     "get_index_mapping",
+    "get_index_settings",
+    "OpenSearchBackend",
     "ensure_index",
+    "finish_load",
+    "size_index_settings",
     "delete_index",
     "index_documents",
     "build_doc",
     "safe_index_name",
+    "get_collection_info",
+    "invalidate_collection",
+    "get_document",
     "search_knn",
     "search_bm25",
+    "search_bm25_page",
     "search_hybrid",
+    "search_batch",
+    "fuse_rrf",
 ]
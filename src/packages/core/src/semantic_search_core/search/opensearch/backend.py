@@ -0,0 +1,238 @@
+"""OpenSearch implementation of the search backend interface."""
+from opensearchpy import NotFoundError, OpenSearch
+
+from semantic_search_core.search.opensearch.client import get_client
+from semantic_search_core.search.opensearch.index import (
+    delete_index,
+    ensure_index,
+    finish_load,
+    index_documents,
+    safe_index_name,
+)
+from semantic_search_core.search.opensearch.query import (
+    get_document,
+    search_batch,
+    search_bm25,
+    search_bm25_page,
+    search_hybrid,
+    search_knn,
+)
+from semantic_search_core.search.opensearch.registry import (
+    get_collection_info,
+    invalidate_collection,
+)
+from semantic_search_core.search.types import CollectionInfo, IndexSettings
+from semantic_search_core.util import CollectionNotFoundError
+
+
+class OpenSearchBackend:
+    """`SearchBackend` backed by one index per collection in OpenSearch."""
+
+    name = "opensearch"
+
+    def __init__(self, client: OpenSearch | None = None):
+        self._client = client
+
+    @property
+    def client(self) -> OpenSearch:
+        return self._client or get_client()
+
+    def _missing(self, collection_name: str) -> CollectionNotFoundError:
+        # Index was deleted after it was cached in the registry
+        invalidate_collection(collection_name)
+        return CollectionNotFoundError(f"Collection not found: {collection_name}")
+
+    def _metadata_types(self, collection_name: str, filters: dict | None) -> dict[str, str]:
+        # Declared types decide filter fields; the registry cache makes this cheap
+        if not filters:
+            return {}
+        info = get_collection_info(self.client, collection_name)
+        return info.metadata_types if info else {}
+
+    def _knn_engine(self, collection_name: str, filters: dict | None) -> str | None:
+        # The engine decides where filters go in a kNN query
+        if not filters:
+            return None
+        info = get_collection_info(self.client, collection_name)
+        return info.knn_engine if info else None
+
+    def _doc_count(self, collection_name: str, filters: dict | None) -> int | None:
+        # A small index needs no count to plan a filtered kNN query
+        if not filters:
+            return None
+        info = get_collection_info(self.client, collection_name)
+        return info.doc_count if info else None
+
+    def ensure_collection(
+        self,
+        collection_name: str,
+        embedding_dim: int,
+        embed_model: str | None = None,
+        metadata_types: dict[str, str] | None = None,
+        index_settings: IndexSettings | None = None,
+        expected_docs: int | None = None,
+    ) -> str:
+        index_name = ensure_index(
+            self.client,
+            collection_name,
+            embedding_dim,
+            embed_model,
+            metadata_types,
+            index_settings,
+            expected_docs,
+        )
+        invalidate_collection(collection_name)
+        return index_name
+
+    def finish_indexing(self, collection_name: str) -> None:
+        finish_load(self.client, collection_name)
+        # The cached document count predates the load
+        invalidate_collection(collection_name)
+
+    def delete_collection(self, collection_name: str) -> None:
+        delete_index(self.client, collection_name)
+        invalidate_collection(collection_name)
+
+    def get_collection_info(self, collection_name: str) -> CollectionInfo | None:
+        return get_collection_info(self.client, collection_name)
+
+    def list_collections(self) -> list[str]:
+        indices = self.client.cat.indices(index="collection_*", format="json")
+        return [
+            idx["index"] for idx in indices
+            if idx.get("index", "").startswith("collection_")
+        ]
+
+    def get_document(self, collection_name: str, doc_id: str) -> dict | None:
+        try:
+            return get_document(self.client, safe_index_name(collection_name), doc_id)
+        except NotFoundError:
+            raise self._missing(collection_name)
+
+    def index_documents(
+        self, collection_name: str, docs: list[dict], stats: dict | None = None
+    ) -> tuple[int, int]:
+        return index_documents(self.client, safe_index_name(collection_name), docs, stats)
+
+    def search_knn(
+        self,
+        collection_name: str,
+        query_embedding: list[float],
+        k: int = 10,
+        filters: dict | None = None,
+        size: int = 10,
+        query_text: str | None = None,
+        include_body: bool = False,
+        ef_search: int | None = None,
+    ) -> list[dict]:
+        try:
+            return search_knn(
+                self.client,
+                safe_index_name(collection_name),
+                query_embedding,
+                k=k,
+                filters=filters,
+                size=size,
+                query_text=query_text,
+                include_body=include_body,
+                metadata_types=self._metadata_types(collection_name, filters),
+                knn_engine=self._knn_engine(collection_name, filters),
+                ef_search=ef_search,
+                doc_count=self._doc_count(collection_name, filters),
+            )
+        except NotFoundError:
+            raise self._missing(collection_name)
+
+    def search_bm25(
+        self,
+        collection_name: str,
+        query_text: str,
+        filters: dict | None = None,
+        size: int = 10,
+        include_body: bool = False,
+    ) -> list[dict]:
+        try:
+            return search_bm25(
+                self.client,
+                safe_index_name(collection_name),
+                query_text,
+                filters=filters,
+                size=size,
+                include_body=include_body,
+                metadata_types=self._metadata_types(collection_name, filters),
+            )
+        except NotFoundError:
+            raise self._missing(collection_name)
+
+    def search_bm25_page(
+        self,
+        collection_name: str,
+        query_text: str,
+        filters: dict | None = None,
+        size: int = 10,
+        pit_id: str | None = None,
+        search_after: list | None = None,
+        include_body: bool = False,
+    ) -> tuple[list[dict], str | None, list | None]:
+        try:
+            return search_bm25_page(
+                self.client,
+                safe_index_name(collection_name),
+                query_text,
+                filters=filters,
+                size=size,
+                pit_id=pit_id,
+                search_after=search_after,
+                include_body=include_body,
+                metadata_types=self._metadata_types(collection_name, filters),
+            )
+        except NotFoundError:
+            # Also raised for an expired point in time
+            raise self._missing(collection_name)
+
+    def search_hybrid(
+        self,
+        collection_name: str,
+        query_text: str,
+        query_embedding: list[float],
+        k: int = 10,
+        filters: dict | None = None,
+        vector_weight: float = 0.5,
+        bm25_weight: float = 0.5,
+        include_body: bool = False,
+        fetch_size: int | None = None,
+        ef_search: int | None = None,
+    ) -> list[dict]:
+        try:
+            return search_hybrid(
+                self.client,
+                safe_index_name(collection_name),
+                query_text,
+                query_embedding,
+                k=k,
+                filters=filters,
+                vector_weight=vector_weight,
+                bm25_weight=bm25_weight,
+                include_body=include_body,
+                fetch_size=fetch_size,
+                metadata_types=self._metadata_types(collection_name, filters),
+                knn_engine=self._knn_engine(collection_name, filters),
+                ef_search=ef_search,
+                doc_count=self._doc_count(collection_name, filters),
+            )
+        except NotFoundError:
+            raise self._missing(collection_name)
+
+    def search_batch(self, queries: list[dict]) -> list[dict]:
+        return search_batch(
+            self.client,
+            [
+                {
+                    **q,
+                    "index_name": safe_index_name(q["collection_name"]),
+                    "metadata_types": self._metadata_types(q["collection_name"], q.get("filters")),
+                    "knn_engine": self._knn_engine(q["collection_name"], q.get("filters")),
+                }
+                for q in queries
+            ],
+        )
@@ -1,11 +1,19 @@
-"""OpenSearch client factory."""
+"""OpenSearch client factory.
+
+The client is created once per process and shared, so the underlying
+urllib3 connection pool keeps connections alive between requests.
+"""
 import os
+import threading
 
-from opensearchpy import OpenSearch, RequestsHttpConnection
+from opensearchpy import OpenSearch, Urllib3HttpConnection
 
+_client: OpenSearch | None = None
+_lock = threading.Lock()
 
-def get_client() -> OpenSearch:
-    """Create an OpenSearch client from environment variables."""
+
+def _client_kwargs() -> dict:
+    """Build client keyword arguments from environment variables."""
     url = os.environ.get("OPENSEARCH_URL", "http://opensearch:9200")
     username = os.environ.get("OPENSEARCH_USERNAME")
     password = os.environ.get("OPENSEARCH_PASSWORD")
@@ -14,9 +22,33 @@ def get_client() -> OpenSearch:
         "hosts": [url],
         "use_ssl": url.startswith("https"),
         "verify_certs": False,
-        "connection_class": RequestsHttpConnection,
+        "timeout": float(os.environ.get("OPENSEARCH_TIMEOUT", "30")),
+        "max_retries": int(os.environ.get("OPENSEARCH_MAX_RETRIES", "3")),
+        "retry_on_timeout": True,
+        # Number of keep-alive connections held open per node
+        "pool_maxsize": int(os.environ.get("OPENSEARCH_POOL_MAXSIZE", "25")),
     }
     if username and password:
         kwargs["http_auth"] = (username, password)
+    return kwargs
+
+
+def get_client() -> OpenSearch:
+    """Get the shared OpenSearch client (created on first use)."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = OpenSearch(
+                    connection_class=Urllib3HttpConnection, **_client_kwargs()
+                )
+    return _client
+
 
-    return OpenSearch(**kwargs)
+def close_client() -> None:
+    """Close the shared client and release its connection pool."""
+    global _client
+    with _lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
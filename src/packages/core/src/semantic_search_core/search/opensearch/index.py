@@ -1,32 +1,194 @@
 """OpenSearch index operations."""
-import re
+import math
+import os
 from datetime import datetime
 
 import structlog
-from opensearchpy import OpenSearch
+from opensearchpy import OpenSearch, RequestError
 from opensearchpy.helpers import bulk
 
-from semantic_search_core.search.opensearch.mapping import get_index_mapping
+from semantic_search_core.metrics import BULK_DOCS, BULK_SECONDS, timed
+from semantic_search_core.search.metadata import validate_metadata_types
+from semantic_search_core.search.opensearch.mapping import (
+    get_index_mapping,
+    metadata_properties,
+)
+from semantic_search_core.search.types import IndexSettings
+from semantic_search_core.util import safe_index_name
 
 logger = structlog.get_logger()
 
+# Sizing of new indexes from the expected document count
+DOCS_PER_SHARD = 2_000_000
+MAX_SHARDS = 32
+# Collections at least this large get a replica (when the cluster has a node for it)
+REPLICA_MIN_DOCS = 100_000
+# Longer refresh intervals while a large load runs, largest threshold first
+REFRESH_TIERS = ((1_000_000, "30s"), (100_000, "10s"))
+# Documents rejected because the write queue is full (429) are sent again
+BULK_MAX_RETRIES = 3
+BULK_RETRY_BACKOFF = 0.5
 
-def safe_index_name(name: str) -> str:
-    """Convert collection name to safe OpenSearch index name."""
-    safe = re.sub(r"[^a-zA-Z0-9_-]", "_", name).strip("_") or "default"
-    return f"collection_{safe}".lower()
 
+def ensure_index(
+    client: OpenSearch,
+    collection_name: str,
+    embedding_dim: int,
+    embed_model: str | None = None,
+    metadata_types: dict[str, str] | None = None,
+    index_settings: IndexSettings | None = None,
+    expected_docs: int | None = None,
+) -> str:
+    """
+    Ensure an index exists for a collection.
 
-def ensure_index(client: OpenSearch, collection_name: str, embedding_dim: int) -> str:
-    """Ensure an index exists for a collection."""
+    `metadata_types` declares typed metadata fields. On an existing index,
+    fields not declared yet are added to its mapping. `index_settings` only
+    apply when the index is created.
+
+    `expected_docs` sizes shards, replicas and refresh interval for the
+    documents about to be indexed (explicit `index_settings` win). An
+    existing index keeps its shard count; it only gains replicas and the
+    load's refresh interval. Call `finish_load` when the load is done.
+    """
+    metadata_types = validate_metadata_types(metadata_types)
     index_name = safe_index_name(collection_name)
-    if not client.indices.exists(index=index_name):
-        body = get_index_mapping(embedding_dim)
+    if client.indices.exists(index=index_name):
+        if metadata_types:
+            _add_metadata_types(client, index_name, metadata_types)
+        if expected_docs:
+            _resize_index(client, index_name, expected_docs)
+    else:
+        embed_model = embed_model or os.environ.get(
+            "EMBED_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
+        )
+        store_source = os.environ.get("STORE_EMBEDDINGS_IN_SOURCE", "false").lower() == "true"
+        body = get_index_mapping(
+            embedding_dim,
+            embed_model,
+            exclude_embedding_source=not store_source,
+            metadata_types=metadata_types,
+            index_settings=_sized_settings(client, index_settings, expected_docs),
+        )
+        # Remember what was asked for, so later sizing does not override it
+        body["mappings"]["_meta"]["index_settings"] = (
+            index_settings.model_dump(exclude_none=True) if index_settings else {}
+        )
         client.indices.create(index=index_name, body=body)
         logger.info("created_index", index=index_name, collection=collection_name)
     return index_name
 
 
+def size_index_settings(expected_docs: int, data_nodes: int = 1) -> IndexSettings:
+    """Shards, replicas and refresh interval for a collection of `expected_docs`."""
+    shards = min(MAX_SHARDS, max(1, math.ceil(expected_docs / DOCS_PER_SHARD)))
+    # A replica on the same node as its primary would never be assigned
+    replicas = 1 if expected_docs >= REPLICA_MIN_DOCS and data_nodes > 1 else 0
+    refresh_interval = next(
+        (interval for min_docs, interval in REFRESH_TIERS if expected_docs >= min_docs), None
+    )
+    return IndexSettings(shards=shards, replicas=replicas, refresh_interval=refresh_interval)
+
+
+def _data_nodes(client: OpenSearch) -> int:
+    try:
+        return int(client.cluster.health().get("number_of_data_nodes", 1))
+    except Exception:
+        return 1
+
+
+def _sized_settings(
+    client: OpenSearch, index_settings: IndexSettings | None, expected_docs: int | None
+) -> IndexSettings | None:
+    """Explicit settings, with sizing from `expected_docs` filling the gaps."""
+    if not expected_docs:
+        return index_settings
+    sized = size_index_settings(expected_docs, _data_nodes(client))
+    explicit = index_settings.model_dump(exclude_none=True) if index_settings else {}
+    return IndexSettings(**{**sized.model_dump(exclude_none=True), **explicit})
+
+
+def _resize_index(client: OpenSearch, index_name: str, expected_docs: int) -> None:
+    """Tune an existing index (e.g. created from the UI) for a load."""
+    index = client.indices.get(index=index_name)[index_name]
+    current = index.get("settings", {}).get("index", {})
+    explicit = IndexSettings(**index.get("mappings", {}).get("_meta", {}).get("index_settings", {}))
+    settings = _sized_settings(client, explicit, expected_docs)
+
+    # The shard count is fixed at creation, and the index may already hold
+    # documents (a refresh may just not have shown them yet)
+    shards = int(current.get("number_of_shards", 1))
+    if settings.shards > shards:
+        logger.warning(
+            "index_undersharded",
+            index=index_name,
+            shards=shards,
+            sized_shards=settings.shards,
+            expected_docs=expected_docs,
+        )
+
+    updates = {}
+    replicas = int(current.get("number_of_replicas", 0))
+    if explicit.replicas is None:
+        # A smaller load does not take replicas away
+        settings.replicas = max(settings.replicas, replicas)
+    if settings.replicas != replicas:
+        updates["number_of_replicas"] = settings.replicas
+    if settings.refresh_interval and settings.refresh_interval != current.get("refresh_interval"):
+        updates["refresh_interval"] = settings.refresh_interval
+    if updates:
+        client.indices.put_settings(index=index_name, body={"index": updates})
+
+
+def finish_load(client: OpenSearch, collection_name: str) -> None:
+    """Restore the collection's refresh interval after a load and refresh once."""
+    index_name = safe_index_name(collection_name)
+    if not client.indices.exists(index=index_name):
+        return
+    mapping = client.indices.get_mapping(index=index_name)
+    meta = mapping.get(index_name, {}).get("mappings", {}).get("_meta", {})
+    # None resets the interval to the cluster default
+    refresh_interval = meta.get("index_settings", {}).get("refresh_interval")
+    client.indices.put_settings(
+        index=index_name, body={"index": {"refresh_interval": refresh_interval}}
+    )
+    client.indices.refresh(index=index_name)
+
+
+def _add_metadata_types(
+    client: OpenSearch, index_name: str, metadata_types: dict[str, str]
+) -> None:
+    """Map newly declared metadata fields on an existing index."""
+    mapping = client.indices.get_mapping(index=index_name)
+    meta = mapping.get(index_name, {}).get("mappings", {}).get("_meta", {})
+    declared = meta.get("metadata_types") or {}
+    new_types = {f: t for f, t in metadata_types.items() if f not in declared}
+    for field in set(metadata_types) & set(declared):
+        if metadata_types[field] != declared[field]:
+            logger.warning(
+                "metadata_type_conflict",
+                index=index_name,
+                field=field,
+                declared=declared[field],
+                requested=metadata_types[field],
+            )
+    if not new_types:
+        return
+    try:
+        client.indices.put_mapping(
+            index=index_name,
+            body={
+                # _meta is replaced as a whole, so carry the existing keys
+                "_meta": {**meta, "metadata_types": {**declared, **new_types}},
+                "properties": {"metadata": {"properties": metadata_properties(new_types)}},
+            },
+        )
+        logger.info("mapped_metadata_fields", index=index_name, fields=sorted(new_types))
+    except RequestError as e:
+        # A field already mapped dynamically cannot change type
+        logger.warning("metadata_mapping_failed", index=index_name, error=str(e))
+
+
 def delete_index(client: OpenSearch, collection_name: str) -> None:
     """Delete an index for a collection."""
     index_name = safe_index_name(collection_name)
@@ -35,10 +197,39 @@ def delete_index(client: OpenSearch, collection_name: str) -> None:
         logger.info("deleted_index", index=index_name, collection=collection_name)
 
 
+class _BulkCounter:
+    """Client stand-in for `helpers.bulk` that counts the requests it sends."""
+
+    def __init__(self, client: OpenSearch, stats: dict):
+        self._client = client
+        self._stats = stats
+        self._sent: set[str] = set()
+        self.transport = client.transport
+
+    def bulk(self, body: str, *args, **kwargs):
+        stats = self._stats
+        stats["bytes"] = stats.get("bytes", 0) + len(body.encode("utf-8"))
+        stats["requests"] = stats.get("requests", 0) + 1
+        # helpers.bulk resends only the rejected documents, whose actions went out before
+        first_action = body.split("\n", 1)[0]
+        if first_action in self._sent:
+            stats["retries"] = stats.get("retries", 0) + 1
+        self._sent.update(body.splitlines()[::2])
+        return self._client.bulk(*args, body=body, **kwargs)
+
+
 def index_documents(
-    client: OpenSearch, index_name: str, docs: list[dict]
+    client: OpenSearch, index_name: str, docs: list[dict], stats: dict | None = None
 ) -> tuple[int, int]:
-    """Bulk index documents."""
+    """
+    Bulk index documents; returns (indexed, failed).
+
+    Documents rejected with 429 are sent again up to `BULK_MAX_RETRIES` times
+    with exponential backoff. `stats`, if given, accumulates the `bytes` and
+    `requests` sent and the number of `retries`.
+    """
+    if not docs:
+        return 0, 0
     # Format documents for helpers.bulk - embed _index and _id in each doc
     actions = []
     for doc in docs:
@@ -50,19 +241,31 @@ def index_documents(
         actions.append(action)
 
     try:
-        success, failed = bulk(client, actions, raise_on_error=False, raise_on_exception=False)
+        with timed("bulk", BULK_SECONDS.labels("opensearch")):
+            success, failed = bulk(
+                _BulkCounter(client, stats if stats is not None else {}),
+                actions,
+                max_retries=BULK_MAX_RETRIES,
+                initial_backoff=BULK_RETRY_BACKOFF,
+                raise_on_error=False,
+                raise_on_exception=False,
+            )
+        failed_count = len(failed) if isinstance(failed, list) else 0
+        BULK_DOCS.labels("opensearch", "indexed").inc(success)
+        BULK_DOCS.labels("opensearch", "failed").inc(failed_count)
         if failed:
             # Log the first few errors to help debugging
             sample_errors = failed[:3] if isinstance(failed, list) else []
             logger.warning(
                 "bulk_index_errors",
                 success=success,
-                failed_count=len(failed) if isinstance(failed, list) else 0,
+                failed_count=failed_count,
                 sample_errors=sample_errors,
             )
-        return success, len(failed) if isinstance(failed, list) else 0
+        return success, failed_count
     except Exception as e:
         logger.exception("bulk_index_exception", error=str(e), doc_count=len(docs))
+        BULK_DOCS.labels("opensearch", "failed").inc(len(docs))
         return 0, len(docs)
 
 
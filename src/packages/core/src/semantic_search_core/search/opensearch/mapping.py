@@ -1,24 +1,80 @@
-"""OpenSearch index mapping configuration."""
+"""OpenSearch index mapping configuration.
+
+By default the `embedding` vector is excluded from the stored `_source`: it is
+still indexed in the kNN structure and searchable, but is not written a second
+time as JSON. Such an index cannot be copied with `_reindex` or updated with
+partial updates, since both rebuild documents from `_source`. To move data to
+a new index, re-run the indexing job (which re-reads the original upload file
+and embeds it again), or create the index with `exclude_embedding_source=False`
+(`STORE_EMBEDDINGS_IN_SOURCE=true`) if `_reindex` is required.
+
+Metadata fields declared with a type (see `search.metadata`) are mapped
+explicitly and listed in `_meta.metadata_types`, which the query builder uses
+to pick the field and clause; other metadata fields are mapped dynamically.
+"""
+from semantic_search_core.search.metadata import OPENSEARCH_TYPES
+from semantic_search_core.search.types import IndexSettings
 
 KNN_ALGO_SPACE_TYPE = "l2"
-KNN_ALGO_ENGINE = "nmslib"
+# faiss applies filters during the graph search (nmslib can only post-filter)
+KNN_ALGO_ENGINE = "faiss"
 KNN_M = 16
 KNN_EF_CONSTRUCTION = 128
 KNN_EF_SEARCH = 128
+NUMBER_OF_SHARDS = 1
+NUMBER_OF_REPLICAS = 0
+
+
+def get_index_settings(
+    index_settings: IndexSettings | None = None, engine: str = KNN_ALGO_ENGINE
+) -> dict:
+    """
+    Index-level settings, with `index_settings` overriding the defaults.
+
+    Only nmslib reads `ef_search` from the index settings; faiss takes it
+    from the mapping's method parameters.
+    """
+    index_settings = index_settings or IndexSettings()
+    settings = {
+        "knn": True,
+        "number_of_shards": index_settings.shards or NUMBER_OF_SHARDS,
+        "number_of_replicas": (
+            NUMBER_OF_REPLICAS if index_settings.replicas is None else index_settings.replicas
+        ),
+    }
+    if engine == "nmslib":
+        settings["knn.algo_param.ef_search"] = index_settings.ef_search or KNN_EF_SEARCH
+    if index_settings.refresh_interval:
+        settings["refresh_interval"] = index_settings.refresh_interval
+    return settings
+
 
+def get_index_mapping(
+    embedding_dim: int,
+    embed_model: str | None = None,
+    exclude_embedding_source: bool = True,
+    metadata_types: dict[str, str] | None = None,
+    index_settings: IndexSettings | None = None,
+) -> dict:
+    """
+    Get the OpenSearch index mapping for a collection.
 
-def get_index_mapping(embedding_dim: int) -> dict:
-    """Get the OpenSearch index mapping for a collection."""
+    `index_settings` overrides the default HNSW parameters, shards, replicas
+    and refresh interval.
+    """
+    metadata_types = metadata_types or {}
+    index_settings = index_settings or IndexSettings()
+    source = {"excludes": ["embedding"]} if exclude_embedding_source else {}
     return {
-        "settings": {
-            "index": {
-                "knn": True,
-                "knn.algo_param.ef_search": KNN_EF_SEARCH,
-                "number_of_shards": 1,
-                "number_of_replicas": 0,
-            }
-        },
+        "settings": {"index": get_index_settings(index_settings)},
         "mappings": {
+            "_meta": {
+                "embedding_dim": embedding_dim,
+                "embed_model": embed_model,
+                "embedding_in_source": not exclude_embedding_source,
+                "metadata_types": metadata_types,
+            },
+            "_source": source,
             "properties": {
                 "doc_id": {"type": "keyword"},
                 "collection": {"type": "keyword"},
@@ -27,7 +83,11 @@ def get_index_mapping(embedding_dim: int) -> dict:
                     "fields": {"keyword": {"type": "keyword"}},
                 },
                 "body": {"type": "text"},
-                "metadata": {"type": "object", "dynamic": True},
+                "metadata": {
+                    "type": "object",
+                    "dynamic": True,
+                    "properties": metadata_properties(metadata_types),
+                },
                 "source_file": {"type": "keyword"},
                 "row_number": {"type": "integer"},
                 "created_at": {"type": "date"},
@@ -39,11 +99,20 @@ def get_index_mapping(embedding_dim: int) -> dict:
                         "space_type": KNN_ALGO_SPACE_TYPE,
                         "engine": KNN_ALGO_ENGINE,
                         "parameters": {
-                            "ef_construction": KNN_EF_CONSTRUCTION,
-                            "m": KNN_M,
+                            "ef_construction": index_settings.ef_construction or KNN_EF_CONSTRUCTION,
+                            "m": index_settings.m or KNN_M,
+                            "ef_search": index_settings.ef_search or KNN_EF_SEARCH,
                         },
                     },
                 },
             }
         },
     }
+
+
+def metadata_properties(metadata_types: dict[str, str]) -> dict:
+    """Explicit mapping for declared metadata fields."""
+    return {
+        field: {"type": OPENSEARCH_TYPES[type_name]}
+        for field, type_name in metadata_types.items()
+    }
@@ -1,14 +1,70 @@
 """OpenSearch query operations."""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
 from opensearchpy import OpenSearch
 
+from semantic_search_core.metrics import SEARCH_LEG_SECONDS, timed
+from semantic_search_core.search.fusion import fuse_rrf
+from semantic_search_core.search.metadata import parse_filters
+from semantic_search_core.search.opensearch.mapping import KNN_ALGO_SPACE_TYPE
+
+SNIPPET_CHARS = 200
+PIT_KEEP_ALIVE = "2m"
+SOURCE_FIELDS = ["doc_id", "title", "metadata"]
+# Engines that apply a filter inside the kNN search instead of after it
+EFFICIENT_FILTER_ENGINES = ("faiss", "lucene")
+# How long a filter's match count is reused for query planning
+FILTER_COUNT_TTL = 30.0
+FILTER_COUNT_MAX_ENTRIES = 1024
+
+_filter_counts: OrderedDict[tuple[str, str], tuple[float, int]] = OrderedDict()
+_filter_counts_lock = threading.Lock()
+
+
+def _source_filter(include_body: bool) -> dict:
+    """Build a _source filter that never returns the embedding vector."""
+    includes = SOURCE_FIELDS + (["body"] if include_body else [])
+    return {"includes": includes, "excludes": ["embedding"]}
+
+
+def _highlight(query_text: str | None) -> dict:
+    """Build a highlight clause producing one plain-text snippet from body."""
+    highlight = {
+        "pre_tags": [""],
+        "post_tags": [""],
+        "fields": {
+            "body": {
+                "fragment_size": SNIPPET_CHARS,
+                "number_of_fragments": 1,
+                "no_match_size": SNIPPET_CHARS,
+            }
+        },
+    }
+    if query_text:
+        # kNN queries have no terms to highlight, so match the text explicitly
+        highlight["highlight_query"] = {"match": {"body": query_text}}
+    return highlight
+
 
 def _parse_hits(hits: list[dict]) -> list[dict]:
     """Parse OpenSearch hits into result dictionaries."""
     out = []
     for h in hits:
         s = h.get("_source", {})
-        body_text = s.get("body", "") or ""
-        snippet = body_text[:200] + ("..." if len(body_text) > 200 else "")
+        body_text = s.get("body")
+        fragments = h.get("highlight", {}).get("body")
+        if fragments:
+            snippet = fragments[0].strip()
+        elif body_text:
+            snippet = body_text[:SNIPPET_CHARS] + (
+                "..." if len(body_text) > SNIPPET_CHARS else ""
+            )
+        else:
+            snippet = ""
         out.append(
             {
                 "doc_id": s.get("doc_id"),
@@ -22,21 +78,149 @@ def _parse_hits(hits: list[dict]) -> list[dict]:
     return out
 
 
-def _build_filter_clauses(filters: dict | None) -> list[dict]:
-    """Build OpenSearch filter clauses from a filters dict."""
-    if not filters:
-        return []
+def get_document(client: OpenSearch, index_name: str, doc_id: str) -> dict | None:
+    """Fetch one document by id, with its body; None if it does not exist."""
+    resp = client.search(
+        index=index_name,
+        body={
+            "size": 1,
+            "query": {"ids": {"values": [doc_id]}},
+            "_source": _source_filter(include_body=True),
+        },
+    )
+    hits = _parse_hits(resp.get("hits", {}).get("hits", []))
+    return {**hits[0], "score": None} if hits else None
+
+
+def _filter_field(key: str, operand, metadata_types: dict[str, str]) -> str:
+    """Field to filter on: declared fields directly, dynamic strings via `.keyword`."""
+    if key in metadata_types:
+        return f"metadata.{key}"
+    values = (
+        operand if isinstance(operand, list)
+        else list(operand.values()) if isinstance(operand, dict)
+        else [operand]
+    )
+    if any(isinstance(v, str) for v in values):
+        return f"metadata.{key}.keyword"
+    return f"metadata.{key}"
+
+
+def _build_filter_clauses(
+    filters: dict | None, metadata_types: dict[str, str] | None = None
+) -> list[dict]:
+    """
+    Build OpenSearch filter clauses from a filters dict.
+
+    See `search.metadata` for the filter syntax. `metadata_types` are the
+    collection's declared field types.
+    """
     filter_clauses = []
-    for key, value in filters.items():
-        field = (
-            f"metadata.{key}.keyword"
-            if isinstance(value, str)
-            else f"metadata.{key}"
-        )
-        filter_clauses.append({"term": {field: value}})
+    for key, kind, operand, negated in parse_filters(filters):
+        field = _filter_field(key, operand, metadata_types or {})
+        clause = {kind: {field: operand}}
+        if negated:
+            clause = {"bool": {"must_not": [clause]}}
+        filter_clauses.append(clause)
     return filter_clauses
 
 
+def _exact_search_max_docs() -> int:
+    return int(os.environ.get("KNN_EXACT_MAX_DOCS", "10000"))
+
+
+def _filtered_count(client: OpenSearch, index_name: str, filter_clauses: list[dict]) -> int:
+    """Number of documents matching the filters, cached briefly."""
+    key = (index_name, json.dumps(filter_clauses, sort_keys=True))
+    now = time.monotonic()
+    with _filter_counts_lock:
+        cached = _filter_counts.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    resp = client.count(index=index_name, body={"query": {"bool": {"filter": filter_clauses}}})
+    count = int(resp.get("count", 0))
+    with _filter_counts_lock:
+        _filter_counts[key] = (now + FILTER_COUNT_TTL, count)
+        _filter_counts.move_to_end(key)
+        while len(_filter_counts) > FILTER_COUNT_MAX_ENTRIES:
+            _filter_counts.popitem(last=False)
+    return count
+
+
+def _use_exact_search(
+    client: OpenSearch, index_name: str, filter_clauses: list[dict], doc_count: int | None = None
+) -> bool:
+    """
+    Plan a filtered kNN query: exact scoring when the filter is selective.
+
+    Scoring every matching document exactly is cheaper than walking the
+    graph when few documents match, and never misses neighbours. When the
+    whole index (`doc_count`) is that small, the filter is not counted.
+    """
+    max_docs = _exact_search_max_docs()
+    if not filter_clauses or max_docs <= 0:
+        return False
+    if doc_count is not None and doc_count <= max_docs:
+        return True
+    return _filtered_count(client, index_name, filter_clauses) <= max_docs
+
+
+def _knn_body(
+    query_embedding: list[float],
+    size: int,
+    filters: dict | None,
+    query_text: str | None,
+    include_body: bool,
+    metadata_types: dict[str, str] | None = None,
+    knn_engine: str | None = None,
+    exact: bool = False,
+    k: int | None = None,
+    ef_search: int | None = None,
+) -> dict:
+    """
+    Build a k-NN search request body.
+
+    The graph search collects `k` neighbours (at least `size`) and
+    `ef_search` overrides the index's search depth. Filters go inside the
+    kNN clause on engines that support it, so the graph search only visits
+    matching documents; on other engines they post-filter the top
+    neighbours. `exact` scores every matching document with the `knn_score`
+    script instead (same scores as the approximate search).
+    """
+    filter_clauses = _build_filter_clauses(filters, metadata_types)
+    knn = {"vector": query_embedding, "k": max(k or size, size)}
+    if ef_search:
+        knn["method_parameters"] = {"ef_search": ef_search}
+    if exact:
+        query = {
+            "script_score": {
+                "query": {"bool": {"filter": filter_clauses}},
+                "script": {
+                    "source": "knn_score",
+                    "lang": "knn",
+                    "params": {
+                        "field": "embedding",
+                        "query_value": query_embedding,
+                        "space_type": KNN_ALGO_SPACE_TYPE,
+                    },
+                },
+            }
+        }
+    elif filter_clauses and knn_engine in EFFICIENT_FILTER_ENGINES:
+        knn["filter"] = {"bool": {"filter": filter_clauses}}
+        query = {"knn": {"embedding": knn}}
+    elif filter_clauses:
+        query = {"bool": {"must": [{"knn": {"embedding": knn}}], "filter": filter_clauses}}
+    else:
+        query = {"knn": {"embedding": knn}}
+    return {
+        "size": size,
+        "query": query,
+        "_source": _source_filter(include_body),
+        "highlight": _highlight(query_text),
+    }
+
+
 def search_knn(
     client: OpenSearch,
     index_name: str,
@@ -44,32 +228,49 @@ def search_knn(
     k: int = 10,
     filters: dict | None = None,
     size: int = 10,
+    query_text: str | None = None,
+    include_body: bool = False,
+    metadata_types: dict[str, str] | None = None,
+    knn_engine: str | None = None,
+    ef_search: int | None = None,
+    doc_count: int | None = None,
 ) -> list[dict]:
-    """Perform k-NN vector search."""
-    knn_clause = {"knn": {"embedding": {"vector": query_embedding, "k": size}}}
-    filter_clauses = _build_filter_clauses(filters)
-
-    if filter_clauses:
-        body = {
-            "size": size,
-            "query": {"bool": {"must": [knn_clause], "filter": filter_clauses}},
-        }
-    else:
-        body = {"size": size, "query": knn_clause}
+    """Perform k-NN vector search.
 
-    resp = client.search(index=index_name, body=body)
+    The graph search collects `k` candidate neighbours (at least `size`) and
+    returns the top `size`; `ef_search` overrides the index's search depth.
+    `query_text`, when given, is used to highlight the snippet; `include_body`
+    returns the full chunk text with each hit. `metadata_types` are the
+    collection's declared metadata types, used to build filters, and
+    `knn_engine` is the index's kNN engine. Filters matching at most
+    `KNN_EXACT_MAX_DOCS` documents are searched exactly; `doc_count`, the
+    index's document count if known, saves counting them on small indexes.
+    """
+    exact = bool(filters) and _use_exact_search(
+        client, index_name, _build_filter_clauses(filters, metadata_types), doc_count
+    )
+    body = _knn_body(
+        query_embedding,
+        size,
+        filters,
+        query_text,
+        include_body,
+        metadata_types,
+        knn_engine,
+        exact,
+        k=k,
+        ef_search=ef_search,
+    )
+    with timed("knn", SEARCH_LEG_SECONDS.labels("opensearch", "knn")):
+        resp = client.search(index=index_name, body=body)
     hits = resp.get("hits", {}).get("hits", [])
     return _parse_hits(hits)
 
 
-def search_bm25(
-    client: OpenSearch,
-    index_name: str,
-    query_text: str,
-    filters: dict | None = None,
-    size: int = 10,
-) -> list[dict]:
-    """Perform BM25 text search on title and body fields."""
+def _bm25_query(
+    query_text: str, filters: dict | None, metadata_types: dict[str, str] | None = None
+) -> dict:
+    """Build the BM25 query on title and body fields."""
     multi_match = {
         "multi_match": {
             "query": query_text,
@@ -78,21 +279,86 @@ def search_bm25(
             "fuzziness": "AUTO",
         }
     }
-    filter_clauses = _build_filter_clauses(filters)
+    filter_clauses = _build_filter_clauses(filters, metadata_types)
 
     if filter_clauses:
-        body = {
-            "size": size,
-            "query": {"bool": {"must": [multi_match], "filter": filter_clauses}},
-        }
-    else:
-        body = {"size": size, "query": multi_match}
+        return {"bool": {"must": [multi_match], "filter": filter_clauses}}
+    return multi_match
+
+
+def _bm25_body(
+    query_text: str,
+    size: int,
+    filters: dict | None,
+    include_body: bool,
+    metadata_types: dict[str, str] | None = None,
+) -> dict:
+    """Build a BM25 search request body."""
+    return {
+        "size": size,
+        "query": _bm25_query(query_text, filters, metadata_types),
+        "_source": _source_filter(include_body),
+        "highlight": _highlight(None),
+    }
+
+
+def search_bm25(
+    client: OpenSearch,
+    index_name: str,
+    query_text: str,
+    filters: dict | None = None,
+    size: int = 10,
+    include_body: bool = False,
+    metadata_types: dict[str, str] | None = None,
+) -> list[dict]:
+    """Perform BM25 text search on title and body fields."""
+    body = _bm25_body(query_text, size, filters, include_body, metadata_types)
 
-    resp = client.search(index=index_name, body=body)
+    with timed("bm25", SEARCH_LEG_SECONDS.labels("opensearch", "bm25")):
+        resp = client.search(index=index_name, body=body)
     hits = resp.get("hits", {}).get("hits", [])
     return _parse_hits(hits)
 
 
+def search_bm25_page(
+    client: OpenSearch,
+    index_name: str,
+    query_text: str,
+    filters: dict | None = None,
+    size: int = 10,
+    pit_id: str | None = None,
+    search_after: list | None = None,
+    include_body: bool = False,
+    metadata_types: dict[str, str] | None = None,
+) -> tuple[list[dict], str | None, list | None]:
+    """
+    Fetch one page of BM25 results from a point-in-time snapshot.
+
+    Pass the returned `pit_id` and `search_after` back in to fetch the next
+    page. `search_after` is None on the last page, and the point in time is
+    closed at that point.
+    """
+    if pit_id is None:
+        resp = client.create_pit(index=index_name, keep_alive=PIT_KEEP_ALIVE)
+        pit_id = resp["pit_id"]
+
+    body = _bm25_body(query_text, size, filters, include_body, metadata_types)
+    body["pit"] = {"id": pit_id, "keep_alive": PIT_KEEP_ALIVE}
+    # doc_id breaks score ties so pages never overlap
+    body["sort"] = [{"_score": "desc"}, {"doc_id": "asc"}]
+    if search_after:
+        body["search_after"] = search_after
+
+    with timed("bm25", SEARCH_LEG_SECONDS.labels("opensearch", "bm25")):
+        resp = client.search(body=body)
+    pit_id = resp.get("pit_id", pit_id)
+    hits = resp.get("hits", {}).get("hits", [])
+    if len(hits) < size:
+        client.delete_pit(body={"pit_id": [pit_id]})
+        return _parse_hits(hits), None, None
+    return _parse_hits(hits), pit_id, hits[-1].get("sort")
+
+
 def search_hybrid(
     client: OpenSearch,
     index_name: str,
@@ -102,6 +368,12 @@ def search_hybrid(
     filters: dict | None = None,
     vector_weight: float = 0.5,
     bm25_weight: float = 0.5,
+    include_body: bool = False,
+    fetch_size: int | None = None,
+    metadata_types: dict[str, str] | None = None,
+    knn_engine: str | None = None,
+    ef_search: int | None = None,
+    doc_count: int | None = None,
 ) -> list[dict]:
     """
     Perform hybrid search combining BM25 and vector search with RRF.
@@ -110,41 +382,98 @@ def search_hybrid(
     RRF(d) = sum(1 / (k + rank(d))) for each ranking
     """
     # Fetch more results for better fusion
-    fetch_size = min(k * 3, 100)
+    if fetch_size is None:
+        fetch_size = min(k * 3, 100)
     
     # Run both searches
-    knn_results = search_knn(client, index_name, query_embedding, k=k, filters=filters, size=fetch_size)
-    bm25_results = search_bm25(client, index_name, query_text, filters=filters, size=fetch_size)
-    
-    # RRF constant (typically 60)
-    rrf_k = 60
-    
-    # Calculate RRF scores
-    doc_scores: dict[str, float] = {}
-    doc_data: dict[str, dict] = {}
-    
-    # Score from vector search
-    for rank, doc in enumerate(knn_results, start=1):
-        doc_id = doc["doc_id"]
-        rrf_score = vector_weight * (1.0 / (rrf_k + rank))
-        doc_scores[doc_id] = doc_scores.get(doc_id, 0) + rrf_score
-        doc_data[doc_id] = doc
-    
-    # Score from BM25 search
-    for rank, doc in enumerate(bm25_results, start=1):
-        doc_id = doc["doc_id"]
-        rrf_score = bm25_weight * (1.0 / (rrf_k + rank))
-        doc_scores[doc_id] = doc_scores.get(doc_id, 0) + rrf_score
-        if doc_id not in doc_data:
-            doc_data[doc_id] = doc
+    knn_results = search_knn(
+        client,
+        index_name,
+        query_embedding,
+        k=k,
+        filters=filters,
+        size=fetch_size,
+        query_text=query_text,
+        include_body=include_body,
+        metadata_types=metadata_types,
+        knn_engine=knn_engine,
+        ef_search=ef_search,
+        doc_count=doc_count,
+    )
+    bm25_results = search_bm25(
+        client,
+        index_name,
+        query_text,
+        filters=filters,
+        size=fetch_size,
+        include_body=include_body,
+        metadata_types=metadata_types,
+    )
     
-    # Sort by RRF score and return top k
-    sorted_docs = sorted(doc_scores.items(), key=lambda x: x[1], reverse=True)[:k]
-    
-    results = []
-    for doc_id, score in sorted_docs:
-        doc = doc_data[doc_id].copy()
-        doc["score"] = score  # Replace original score with RRF score
-        results.append(doc)
-    
-    return results
+    return fuse_rrf(knn_results, bm25_results, k, vector_weight, bm25_weight)
+
+
+def search_batch(client: OpenSearch, queries: list[dict]) -> list[dict]:
+    """
+    Run many searches in a single `_msearch` round trip.
+
+    Each query is a dict with `index_name`, `mode` ("vector", "bm25" or
+    "hybrid"), `query_text`, `query_embedding` (vector and hybrid modes),
+    `k`, and optionally `filters`, `metadata_types`, `knn_engine` and
+    `include_body`. Batched kNN legs skip the exact-search planner.
+    Returns one `{"hits": [...], "error": None}` dict per query, in order; a
+    failing query reports its error without failing the rest of the batch.
+    """
+    lines: list[dict] = []
+    legs: list[list[str]] = []
+    for q in queries:
+        mode = q.get("mode", "hybrid")
+        k = q.get("k", 10)
+        filters = q.get("filters")
+        metadata_types = q.get("metadata_types")
+        include_body = q.get("include_body", False)
+        size = min(k * 3, 100) if mode == "hybrid" else k
+        header = {"index": q["index_name"]}
+        query_legs = []
+        if mode in ("vector", "hybrid"):
+            lines += [
+                header,
+                _knn_body(
+                    q["query_embedding"],
+                    size,
+                    filters,
+                    q["query_text"],
+                    include_body,
+                    metadata_types,
+                    q.get("knn_engine"),
+                ),
+            ]
+            query_legs.append("knn")
+        if mode in ("bm25", "hybrid"):
+            lines += [
+                header, _bm25_body(q["query_text"], size, filters, include_body, metadata_types)
+            ]
+            query_legs.append("bm25")
+        legs.append(query_legs)
+
+    with timed("batch", SEARCH_LEG_SECONDS.labels("opensearch", "batch")):
+        responses = iter(client.msearch(body=lines).get("responses", []))
+
+    out = []
+    for q, query_legs in zip(queries, legs):
+        results: dict[str, list[dict]] = {}
+        error = None
+        for leg in query_legs:
+            resp = next(responses, {})
+            if "error" in resp:
+                err = resp["error"]
+                error = error or (err.get("reason") if isinstance(err, dict) else str(err))
+                continue
+            results[leg] = _parse_hits(resp.get("hits", {}).get("hits", []))
+        if error:
+            out.append({"hits": [], "error": error})
+        elif len(query_legs) == 2:
+            out.append({"hits": fuse_rrf(results["knn"], results["bm25"], q.get("k", 10)), "error": None})
+        else:
+            out.append({"hits": results[query_legs[0]], "error": None})
+    return out
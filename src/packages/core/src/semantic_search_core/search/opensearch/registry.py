@@ -0,0 +1,82 @@
+"""In-process registry of collection indexes.
+
+Caches index metadata (embedding dimension, model, settings, document count)
+for a short TTL so the request path does not need an `indices.exists` round
+trip on every query.
+Only existing collections are cached; a collection created by another process
+is picked up on the next lookup.
+"""
+import os
+import threading
+import time
+
+from opensearchpy import NotFoundError, OpenSearch
+
+from semantic_search_core.search.types import CollectionInfo
+from semantic_search_core.util import safe_index_name
+
+_entries: dict[str, tuple[float, CollectionInfo]] = {}
+_lock = threading.Lock()
+
+
+def _ttl_seconds() -> float:
+    return float(os.environ.get("COLLECTION_CACHE_TTL", "30"))
+
+
+def _load_collection_info(
+    client: OpenSearch, collection_name: str
+) -> CollectionInfo | None:
+    """Fetch collection metadata from the index definition."""
+    index_name = safe_index_name(collection_name)
+    try:
+        resp = client.indices.get(index=index_name)
+    except NotFoundError:
+        return None
+    index = resp.get(index_name, {})
+    mappings = index.get("mappings", {})
+    meta = mappings.get("_meta", {})
+    embedding = mappings.get("properties", {}).get("embedding", {})
+    dim = meta.get("embedding_dim") or embedding.get("dimension")
+    try:
+        doc_count = int(client.count(index=index_name).get("count", 0))
+    except Exception:
+        doc_count = None
+    return CollectionInfo(
+        name=collection_name,
+        index_name=index_name,
+        embedding_dim=int(dim) if dim else None,
+        embed_model=meta.get("embed_model"),
+        metadata_types=meta.get("metadata_types") or {},
+        knn_engine=embedding.get("method", {}).get("engine"),
+        settings=index.get("settings", {}).get("index", {}),
+        doc_count=doc_count,
+    )
+
+
+def get_collection_info(
+    client: OpenSearch, collection_name: str
+) -> CollectionInfo | None:
+    """Get collection metadata, or None if the collection does not exist."""
+    key = safe_index_name(collection_name)
+    now = time.monotonic()
+    with _lock:
+        cached = _entries.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    info = _load_collection_info(client, collection_name)
+    with _lock:
+        if info is None:
+            _entries.pop(key, None)
+        else:
+            _entries[key] = (now + _ttl_seconds(), info)
+    return info
+
+
+def invalidate_collection(collection_name: str | None = None) -> None:
+    """Drop a cached collection (or all collections when name is None)."""
+    with _lock:
+        if collection_name is None:
+            _entries.clear()
+        else:
+            _entries.pop(safe_index_name(collection_name), None)
@@ -0,0 +1,70 @@
+"""Cursors for paging through search results.
+
+Cursors are opaque URL-safe strings wrapping a small JSON state. Ranked
+candidate lists that cannot be paged by the search engine itself (kNN and
+fused hybrid results) are cached in-process for a short TTL and paged by
+offset, so a cursor is only valid on the API process that issued it.
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+
+from semantic_search_core.util import ValidationError, generate_id
+
+MAX_CACHED_CURSORS = 1000
+
+_candidates: dict[str, tuple[float, list[dict]]] = {}
+_lock = threading.Lock()
+
+
+def _ttl_seconds() -> float:
+    return float(os.environ.get("SEARCH_CURSOR_TTL", "300"))
+
+
+def query_fingerprint(*parts) -> str:
+    """Hash the parameters a cursor is bound to (query, mode, filters...)."""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(state: dict) -> str:
+    """Encode cursor state as an opaque string."""
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValidationError("Invalid cursor") from e
+    if not isinstance(state, dict):
+        raise ValidationError("Invalid cursor")
+    return state
+
+
+def store_candidates(results: list[dict]) -> str:
+    """Cache a ranked candidate list and return its id."""
+    cache_id = generate_id()
+    now = time.monotonic()
+    with _lock:
+        for key in [k for k, (expires, _) in _candidates.items() if expires <= now]:
+            del _candidates[key]
+        while len(_candidates) >= MAX_CACHED_CURSORS:
+            del _candidates[next(iter(_candidates))]
+        _candidates[cache_id] = (now + _ttl_seconds(), results)
+    return cache_id
+
+
+def get_candidates(cache_id: str) -> list[dict] | None:
+    """Get a cached candidate list, or None if it expired."""
+    with _lock:
+        entry = _candidates.get(cache_id)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return entry[1]
@@ -0,0 +1,124 @@
+"""Cross-encoder reranking of fused search results.
+
+The top candidates are scored against the query in batches sized from the
+measured cost of scoring one pair, so that each batch fits the time left in
+the budget. Before any cost is known, a single pair is scored first to
+measure it. When the budget runs out, the candidates scored so far are
+reordered and the rest keep their fused order behind them.
+
+The budget cannot interrupt a batch, so a model slower than its recent
+average can still overrun it; the overrun is reported with the result.
+"""
+import os
+import time
+
+import structlog
+
+logger = structlog.get_logger()
+
+DEFAULT_RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+# Cross-encoders truncate around 512 tokens; skip tokenizing text beyond that
+MAX_PASSAGE_CHARS = 2000
+
+_rerank_model = None
+# Running estimate of the seconds to score one pair, shared across requests
+_pair_seconds: float | None = None
+# Weight of the newest batch in the estimate
+PAIR_COST_SMOOTHING = 0.3
+
+
+def get_rerank_model():
+    """Get or load the cross-encoder model (cached)."""
+    global _rerank_model
+    if _rerank_model is None:
+        from sentence_transformers import CrossEncoder
+
+        model_name = os.environ.get("RERANK_MODEL", DEFAULT_RERANK_MODEL)
+        logger.info("loading_rerank_model", model=model_name)
+        _rerank_model = CrossEncoder(model_name)
+    return _rerank_model
+
+
+def _passage(hit: dict) -> str:
+    """Text of a hit to score: title plus body (or snippet when no body)."""
+    text = hit.get("body") or hit.get("snippet") or ""
+    title = hit.get("title")
+    if title and title != hit.get("doc_id"):
+        text = f"{title}\n{text}"
+    return text[:MAX_PASSAGE_CHARS]
+
+
+def _observe_pair_cost(seconds: float, pairs: int) -> None:
+    global _pair_seconds
+    cost = seconds / pairs
+    if _pair_seconds is None:
+        _pair_seconds = cost
+    else:
+        _pair_seconds += PAIR_COST_SMOOTHING * (cost - _pair_seconds)
+
+
+def rerank(
+    query: str,
+    hits: list[dict],
+    model,
+    top_n: int = 50,
+    batch_size: int = 16,
+    time_budget: float = 0.3,
+) -> tuple[list[dict], dict]:
+    """
+    Reorder the first `top_n` hits by cross-encoder score.
+
+    `model` needs a sentence-transformers style `predict(pairs, batch_size=)`.
+    Reranked hits get the cross-encoder score as `rerank_score` and keep
+    their fused `score`, since the two are on different scales; unscored
+    hits follow in their original order with `rerank_score` None.
+
+    Returns `(hits, stats)`: `scored` candidates out of `candidates`,
+    `elapsed_ms`, and `over_budget_ms`, how far scoring ran past
+    `time_budget` seconds (0 when within it). If the model fails, the hits
+    are returned unchanged.
+    """
+    candidates = hits[:top_n]
+    stats = {"scored": 0, "candidates": len(candidates), "elapsed_ms": 0.0, "over_budget_ms": 0.0}
+    if len(candidates) < 2:
+        return hits, stats
+
+    start = time.perf_counter()
+    scores: list[float] = []
+    while len(scores) < len(candidates):
+        remaining = time_budget - (time.perf_counter() - start)
+        if _pair_seconds is None:
+            # Nothing measured yet: one pair tells what a pair costs
+            size = 1
+        else:
+            size = min(batch_size, int(remaining / _pair_seconds)) if _pair_seconds > 0 else batch_size
+        if size < 1:
+            logger.info(
+                "rerank_budget_exhausted",
+                scored=len(scores),
+                candidates=len(candidates),
+            )
+            break
+        batch = candidates[len(scores):len(scores) + size]
+        pairs = [(query, _passage(h)) for h in batch]
+        batch_start = time.perf_counter()
+        try:
+            batch_scores = model.predict(pairs, batch_size=batch_size)
+        except Exception as e:
+            logger.warning("rerank_failed", error=str(e))
+            stats["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            return hits, stats
+        _observe_pair_cost(time.perf_counter() - batch_start, len(pairs))
+        scores.extend(float(s) for s in batch_scores)
+
+    elapsed = time.perf_counter() - start
+    stats["scored"] = len(scores)
+    stats["elapsed_ms"] = round(elapsed * 1000, 1)
+    stats["over_budget_ms"] = round(max(0.0, elapsed - time_budget) * 1000, 1)
+    if stats["over_budget_ms"]:
+        logger.warning("rerank_budget_exceeded", **stats)
+
+    scored = candidates[:len(scores)]
+    order = sorted(range(len(scored)), key=lambda j: scores[j], reverse=True)
+    reranked = [{**scored[j], "rerank_score": scores[j]} for j in order]
+    return reranked + [{**h, "rerank_score": None} for h in hits[len(scores):]], stats
@@ -1,7 +1,12 @@
 """Search type definitions."""
-from typing import Any
+from typing import Annotated, Any
 
-from pydantic import BaseModel
+from pydantic import AfterValidator, BaseModel, Field
+
+from semantic_search_core.search.metadata import check_filters
+
+# Metadata filters in request models (syntax in `search.metadata`)
+Filters = Annotated[dict[str, Any], AfterValidator(check_filters)]
 
 
 class SearchResult(BaseModel):
@@ -12,4 +17,36 @@ class SearchResult(BaseModel):
     snippet: str
     metadata: dict[str, Any]
     score: float | None
-    body: str = ""
+    body: str | None = None
+
+
+class CollectionInfo(BaseModel):
+    """Cached description of a collection's index."""
+
+    name: str
+    index_name: str
+    embedding_dim: int | None = None
+    embed_model: str | None = None
+    metadata_types: dict[str, str] = {}
+    knn_engine: str | None = None
+    settings: dict[str, Any] = {}
+    doc_count: int | None = None
+
+
+class IndexSettings(BaseModel):
+    """Vector index, sharding and refresh parameters for a new collection (None: default)."""
+
+    m: int | None = Field(default=None, ge=2, le=100, description="HNSW graph links per node")
+    ef_construction: int | None = Field(
+        default=None, ge=2, le=4096, description="HNSW candidate list size while indexing"
+    )
+    ef_search: int | None = Field(
+        default=None, ge=1, le=10000, description="HNSW candidate list size while searching"
+    )
+    shards: int | None = Field(default=None, ge=1, le=64, description="Primary shards")
+    replicas: int | None = Field(default=None, ge=0, le=10, description="Replicas per shard")
+    refresh_interval: str | None = Field(
+        default=None,
+        pattern=r"^(-1|\d+(ms|s|m))$",
+        description="How often new documents become searchable, e.g. 1s or 30s",
+    )
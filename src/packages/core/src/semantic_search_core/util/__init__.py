@@ -1,6 +1,7 @@
 """Utility modules."""
 from semantic_search_core.util.ids import generate_id
+from semantic_search_core.util.names import safe_index_name
 from semantic_search_core.util.time import utc_now_iso
-from semantic_search_core.util.errors import ValidationError
+from semantic_search_core.util.errors import CollectionNotFoundError, ValidationError
 
-__all__ = ["generate_id", "utc_now_iso", "ValidationError"]
+__all__ = ["generate_id", "safe_index_name", "utc_now_iso", "ValidationError", "CollectionNotFoundError"]
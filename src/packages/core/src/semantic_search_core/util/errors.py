@@ -5,3 +5,9 @@ class ValidationError(Exception):
     """Validation error."""
 
     pass
+
+
+class CollectionNotFoundError(Exception):
+    """The collection (or its index) does not exist."""
+
+    pass
@@ -0,0 +1,8 @@
+"""Naming utilities."""
+import re
+
+
+def safe_index_name(name: str) -> str:
+    """Convert collection name to safe index name (shared by all search backends)."""
+    safe = re.sub(r"[^a-zA-Z0-9_-]", "_", name).strip("_") or "default"
+    return f"collection_{safe}".lower()
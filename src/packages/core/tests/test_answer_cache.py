@@ -0,0 +1,26 @@
+"""Tests for the semantic answer cache."""
+from semantic_search_core.rag import clear_answers, lookup_answer, store_answer
+
+
+def test_similar_question_hits():
+    clear_answers()
+    store_answer("docs:1", [1.0, 0.0, 0.0], {"answer": "yes"})
+    assert lookup_answer("docs:1", [0.99, 0.05, 0.0], threshold=0.95) == {"answer": "yes"}
+    assert lookup_answer("docs:1", [0.0, 1.0, 0.0], threshold=0.95) is None
+
+
+def test_namespaces_are_isolated():
+    clear_answers()
+    store_answer("docs:1", [1.0, 0.0], "old generation")
+    assert lookup_answer("docs:2", [1.0, 0.0], threshold=0.9) is None
+
+
+def test_lru_eviction():
+    clear_answers()
+    store_answer("ns", [1.0, 0.0], "a", max_entries=2)
+    store_answer("ns", [0.0, 1.0], "b", max_entries=2)
+    # Touch "a" so "b" is the least recently used
+    assert lookup_answer("ns", [1.0, 0.0], threshold=0.9) == "a"
+    store_answer("ns", [-1.0, 0.0], "c", max_entries=2)
+    assert lookup_answer("ns", [0.0, 1.0], threshold=0.9) is None
+    assert lookup_answer("ns", [1.0, 0.0], threshold=0.9) == "a"
@@ -0,0 +1,84 @@
+"""Tests for search backends and backend selection."""
+import pytest
+
+from semantic_search_core.search import get_backend
+from semantic_search_core.search.local import LocalBackend
+from semantic_search_core.search.opensearch import OpenSearchBackend, build_doc
+from semantic_search_core.util import CollectionNotFoundError
+
+DOCS = [
+    ("cats", "Cats", "cats purr and cats sleep", {"kind": "pet"}, [1.0, 0.0]),
+    ("dogs", "Dogs", "dogs bark loudly", {"kind": "pet"}, [0.0, 1.0]),
+    ("cars", "Cars", "cars need fuel, not cats", {"kind": "vehicle"}, [0.7, 0.7]),
+]
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = LocalBackend(root=str(tmp_path))
+    backend.ensure_collection("Docs", 2, "test-model")
+    ok, failed = backend.index_documents("Docs", [
+        build_doc(doc_id, "Docs", title, body, meta, "f.csv", i + 1, emb)
+        for i, (doc_id, title, body, meta, emb) in enumerate(DOCS)
+    ])
+    assert (ok, failed) == (3, 0)
+    return backend
+
+
+def test_collection_lifecycle(backend):
+    info = backend.get_collection_info("Docs")
+    assert info.index_name == "collection_docs"
+    assert info.embedding_dim == 2 and info.embed_model == "test-model"
+    assert info.settings["uuid"]
+    assert backend.list_collections() == ["collection_docs"]
+    backend.delete_collection("Docs")
+    assert backend.get_collection_info("Docs") is None
+    with pytest.raises(CollectionNotFoundError):
+        backend.search_bm25("Docs", "cats")
+
+
+def test_bm25_title_boost_and_filters(backend):
+    hits = backend.search_bm25("Docs", "cats")
+    assert [h["doc_id"] for h in hits] == ["cats", "cars"]
+    hits = backend.search_bm25("Docs", "cats", filters={"kind": "vehicle"}, include_body=True)
+    assert [h["doc_id"] for h in hits] == ["cars"]
+    assert hits[0]["body"] == "cars need fuel, not cats"
+
+
+def test_bm25_pages(backend):
+    hits, pit, after = backend.search_bm25_page("Docs", "cats", size=1)
+    assert [h["doc_id"] for h in hits] == ["cats"] and after == [1]
+    hits, _, after = backend.search_bm25_page("Docs", "cats", size=1, pit_id=pit, search_after=after)
+    assert [h["doc_id"] for h in hits] == ["cars"] and after is None
+
+
+def test_hybrid_and_batch(backend):
+    hits = backend.search_hybrid("Docs", "dogs", [0.0, 1.0], k=2)
+    assert hits[0]["doc_id"] == "dogs"
+    results = backend.search_batch([
+        {"collection_name": "Docs", "mode": "vector", "query_text": "x", "query_embedding": [1.0, 0.0], "k": 1},
+        {"collection_name": "Missing", "mode": "bm25", "query_text": "x", "k": 1},
+    ])
+    assert [h["doc_id"] for h in results[0]["hits"]] == ["cats"]
+    assert results[1]["hits"] == [] and "Missing" in results[1]["error"]
+
+
+def test_get_document(backend):
+    doc = backend.get_document("Docs", "dogs")
+    assert doc["body"] == "dogs bark loudly" and doc["score"] is None
+    assert doc["metadata"] == {"kind": "pet"}
+    assert backend.get_document("Docs", "birds") is None
+    with pytest.raises(CollectionNotFoundError):
+        backend.get_document("Missing", "dogs")
+
+
+def test_get_backend_selection(backend, monkeypatch):
+    monkeypatch.setenv("LOCAL_INDEX_DIR", backend.root)
+    monkeypatch.setenv("SEARCH_BACKEND", "opensearch")
+    assert isinstance(get_backend("Docs"), LocalBackend)
+    assert isinstance(get_backend("Other"), OpenSearchBackend)
+    assert isinstance(get_backend("Other", name="local"), LocalBackend)
+    monkeypatch.setenv("SEARCH_BACKEND", "local")
+    assert isinstance(get_backend("Other"), LocalBackend)
+    with pytest.raises(ValueError):
+        get_backend(name="elastic")
@@ -0,0 +1,28 @@
+"""Tests for the shared OpenSearch client."""
+import pytest
+
+from semantic_search_core.search.opensearch import close_client, get_client
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("OPENSEARCH_URL", "http://localhost:9200")
+    monkeypatch.setenv("OPENSEARCH_POOL_MAXSIZE", "7")
+    monkeypatch.setenv("OPENSEARCH_TIMEOUT", "4")
+    monkeypatch.setenv("OPENSEARCH_MAX_RETRIES", "1")
+    close_client()
+    yield get_client()
+    close_client()
+
+
+def test_settings_reach_the_connection_pool(client):
+    connection = client.transport.get_connection()
+    assert connection.pool.pool.maxsize == 7
+    assert connection.timeout == 4.0
+    assert client.transport.max_retries == 1 and client.transport.retry_on_timeout
+
+
+def test_client_is_shared_until_closed(client):
+    assert get_client() is client
+    close_client()
+    assert get_client() is not client
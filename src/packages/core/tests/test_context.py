@@ -0,0 +1,54 @@
+"""Tests for RAG context packing."""
+from semantic_search_core.embed import chunk_text
+from semantic_search_core.rag import estimate_tokens, pack_context
+
+
+def _chunks_of(parent_id: str, text: str) -> list[dict]:
+    parts = chunk_text(text, chunk_size=100, overlap=20)
+    return [
+        {
+            "doc_id": f"{parent_id}_{i}",
+            "title": "Doc" if i == 0 else f"Doc (part {i + 1})",
+            "body": part,
+            "metadata": {"parent_id": parent_id},
+        }
+        for i, part in enumerate(parts)
+    ]
+
+
+def test_adjacent_chunks_merge_without_overlap():
+    text = " ".join(f"word{i}" for i in range(60))
+    chunks = _chunks_of("p", text)
+    assert len(chunks) > 2
+    # Retrieved out of order, as search ranking would return them
+    passages = pack_context(list(reversed(chunks)), max_tokens=10_000)
+    assert len(passages) == 1
+    assert passages[0]["body"] == text
+    assert passages[0]["title"] == "Doc"
+    assert passages[0]["doc_id"] == "p"
+
+
+def test_duplicates_dropped_and_rank_order_kept():
+    chunks = [
+        {"doc_id": "b", "title": "B", "body": "second doc"},
+        {"doc_id": "a", "title": "A", "body": "first doc"},
+        {"doc_id": "b", "title": "B", "body": "second doc"},
+    ]
+    passages = pack_context(chunks, max_tokens=100)
+    assert [p["doc_id"] for p in passages] == ["b", "a"]
+
+
+def test_budget_skips_chunks_that_do_not_fit():
+    chunks = [
+        {"doc_id": "a", "title": "A", "body": "x" * 40},
+        {"doc_id": "b", "title": "B", "body": "y" * 400},
+        {"doc_id": "c", "title": "C", "body": "z" * 20},
+    ]
+    passages = pack_context(chunks, max_tokens=20)
+    assert [p["doc_id"] for p in passages] == ["a", "c"]
+    assert sum(estimate_tokens(p["body"]) for p in passages) <= 20
+
+
+def test_oversized_top_chunk_is_truncated():
+    passages = pack_context([{"doc_id": "a", "title": "A", "body": "x" * 1000}], max_tokens=10)
+    assert estimate_tokens(passages[0]["body"]) == 10
@@ -0,0 +1,71 @@
+"""Tests for bounded conversation history."""
+from semantic_search_core.rag import compress_history, prefix_keys, put_summary, summary_due
+
+
+def _conversation(turns: int, size: int = 100) -> list[dict]:
+    messages = []
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"question {i} " + "q" * size})
+        messages.append({"role": "assistant", "content": f"answer {i} " + "a" * size})
+    return messages
+
+
+def test_short_history_kept_verbatim():
+    messages = _conversation(2)
+    summary, recent, older = compress_history(messages, max_tokens=1000)
+    assert summary is None
+    assert recent == messages
+    assert older == []
+
+
+def test_long_history_bounded_with_digest():
+    messages = _conversation(20)
+    summary, recent, older = compress_history(messages, max_tokens=300)
+    assert recent == messages[-len(recent):]
+    assert older + recent == messages
+    assert sum(len(m["content"]) for m in recent) <= 200 * 4
+    assert summary.startswith(("User:", "Assistant:"))
+    assert len(summary) <= 100 * 4
+
+
+def test_cached_summary_used_for_prefix():
+    messages = _conversation(20)
+    _, _, older = compress_history(messages, max_tokens=300)
+    put_summary(prefix_keys(older)[-1], "They discussed twenty questions.")
+    summary, _, _ = compress_history(messages, max_tokens=300)
+    assert summary == "They discussed twenty questions."
+
+    # One more turn: cached prefix summary plus a digest of the new older turns
+    longer = messages + _conversation(1)
+    summary, _, _ = compress_history(longer, max_tokens=300)
+    assert summary.startswith("They discussed twenty questions.")
+
+
+def test_prefix_keys_are_chained():
+    messages = _conversation(3)
+    assert prefix_keys(messages)[:3] == prefix_keys(messages[:3])
+    assert prefix_keys(messages)[0] != prefix_keys(messages[1:])[0]
+
+
+def test_recent_starts_with_user_turn():
+    messages = _conversation(10)
+    for budget in range(50, 400, 7):
+        _, recent, older = compress_history(messages, max_tokens=budget)
+        if older and recent:
+            assert recent[0]["role"] == "user"
+
+
+def test_summaries_requested_every_few_turns():
+    messages = _conversation(4, size=120)
+    calls = 0
+    for turn in range(30):
+        messages = messages + [
+            {"role": "user", "content": f"follow-up {turn} " + "f" * 120},
+            {"role": "assistant", "content": f"reply {turn} " + "r" * 120},
+        ]
+        _, _, older = compress_history(messages, max_tokens=300)
+        if summary_due(older, min_tokens=200):
+            calls += 1
+            put_summary(prefix_keys(older)[-1], f"summary {turn}")
+    # Each turn drops about 65 tokens, so a summary is due every few turns
+    assert 5 <= calls <= 10
@@ -0,0 +1,153 @@
+"""Tests for index creation, sizing and bulk indexing."""
+import json
+
+from opensearchpy import JSONSerializer
+
+from semantic_search_core.search import IndexSettings
+from semantic_search_core.search.opensearch import (
+    build_doc,
+    ensure_index,
+    finish_load,
+    index_documents,
+    size_index_settings,
+)
+from semantic_search_core.search.opensearch import index as index_module
+
+
+class _Indices:
+    def __init__(self, existing=None):
+        self.existing = existing
+        self.created = None
+        self.deleted = False
+        self.settings = None
+        self.refreshed = False
+
+    def exists(self, index):
+        return self.existing is not None
+
+    def get(self, index):
+        return {index: self.existing}
+
+    def get_mapping(self, index):
+        return {index: {"mappings": self.existing["mappings"]}}
+
+    def create(self, index, body):
+        self.created = body
+
+    def delete(self, index):
+        self.deleted = True
+
+    def put_settings(self, index, body):
+        self.settings = body
+
+    def refresh(self, index):
+        self.refreshed = True
+
+
+class _Cluster:
+    def health(self):
+        return {"number_of_data_nodes": 3}
+
+
+class _FakeClient:
+    def __init__(self, existing=None):
+        self.indices = _Indices(existing)
+        self.cluster = _Cluster()
+
+
+def test_size_index_settings_thresholds():
+    assert size_index_settings(5_000) == IndexSettings(shards=1, replicas=0)
+    assert size_index_settings(500_000, data_nodes=2) == IndexSettings(
+        shards=1, replicas=1, refresh_interval="10s"
+    )
+    # No replica when there is no other node to hold it
+    assert size_index_settings(500_000, data_nodes=1).replicas == 0
+    assert size_index_settings(9_000_000, data_nodes=3) == IndexSettings(
+        shards=5, replicas=1, refresh_interval="30s"
+    )
+
+
+def test_new_index_sized_with_explicit_overrides():
+    client = _FakeClient()
+    ensure_index(client, "Docs", 4, "m", index_settings=IndexSettings(replicas=0), expected_docs=5_000_000)
+    settings = client.indices.created["settings"]["index"]
+    assert (settings["number_of_shards"], settings["number_of_replicas"]) == (3, 0)
+    assert settings["refresh_interval"] == "30s"
+    assert client.indices.created["mappings"]["_meta"]["index_settings"] == {"replicas": 0}
+
+
+def _existing_index(index_settings=None, **settings):
+    return {
+        "mappings": {"_meta": {"embedding_dim": 4, "index_settings": index_settings or {}}, "properties": {}},
+        "settings": {"index": {"number_of_shards": "1", "number_of_replicas": "0", **settings}},
+    }
+
+
+def test_existing_index_tuned_for_load_without_recreating():
+    client = _FakeClient(_existing_index())
+    ensure_index(client, "Docs", 4, expected_docs=5_000_000)
+    # Never deleted, even when it needs more shards than it has
+    assert not client.indices.deleted and client.indices.created is None
+    assert client.indices.settings == {"index": {"number_of_replicas": 1, "refresh_interval": "30s"}}
+
+    # A smaller load keeps existing replicas; explicit settings win
+    client = _FakeClient(_existing_index({"refresh_interval": "5s"}, number_of_replicas="2", refresh_interval="5s"))
+    ensure_index(client, "Docs", 4, expected_docs=500_000)
+    assert client.indices.settings is None
+
+
+def test_finish_load_restores_refresh_interval():
+    client = _FakeClient(_existing_index(refresh_interval="30s"))
+    finish_load(client, "Docs")
+    assert client.indices.settings == {"index": {"refresh_interval": None}}
+    assert client.indices.refreshed
+
+    client = _FakeClient(_existing_index({"refresh_interval": "5s"}))
+    finish_load(client, "Docs")
+    assert client.indices.settings == {"index": {"refresh_interval": "5s"}}
+
+    client = _FakeClient()
+    finish_load(client, "Docs")
+    assert client.indices.settings is None and not client.indices.refreshed
+
+
+class _Transport:
+    serializer = JSONSerializer()
+
+
+class _BulkClient:
+    """Rejects the first attempt of `rejected` documents with 429 and fails `broken` ones."""
+
+    def __init__(self, rejected=(), broken=()):
+        self.transport = _Transport()
+        self.rejected = set(rejected)
+        self.broken = set(broken)
+        self.bodies = []
+
+    def bulk(self, body):
+        self.bodies.append(body)
+        lines = body.splitlines()
+        items = []
+        for action in lines[::2]:
+            doc_id = json.loads(action)["index"]["_id"]
+            status = 201
+            if doc_id in self.rejected:
+                self.rejected.discard(doc_id)
+                status = 429
+            elif doc_id in self.broken:
+                status = 400
+            items.append({"index": {"_id": doc_id, "status": status}})
+        return {"items": items}
+
+
+def test_bulk_retries_rejected_documents(monkeypatch):
+    monkeypatch.setattr(index_module, "BULK_RETRY_BACKOFF", 0)
+    docs = [build_doc(f"d{i}", "Docs", "", "text", {}, "f.csv", i, [0.0]) for i in range(4)]
+    client = _BulkClient(rejected={"d1", "d2"}, broken={"d3"})
+    stats = {}
+    assert index_documents(client, "collection_docs", docs, stats) == (3, 1)
+    assert stats["requests"] == 2 and stats["retries"] == 1
+    assert stats["bytes"] == sum(len(body.encode("utf-8")) for body in client.bodies)
+    # Only the rejected documents are sent again
+    assert len(client.bodies[1].splitlines()) == 4
+    assert index_documents(client, "collection_docs", []) == (0, 0)
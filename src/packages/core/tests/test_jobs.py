@@ -0,0 +1,54 @@
+"""Tests for the job repository."""
+import sqlite3
+
+from semantic_search_core.jobs import get_job, upsert_job
+from semantic_search_core.jobs import repo
+
+
+def test_profile_persisted_and_kept(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "jobs.db"))
+    upsert_job("j1", "docs", "u1", "queued")
+    assert get_job("j1")["profile"] is None
+
+    upsert_job("j1", "docs", "u1", "processing", 10, 5, 0, profile={"stages_ms": {"embed": 12.5}})
+    # Updates without a profile (e.g. cancelling) keep the stored one
+    upsert_job("j1", "docs", "u1", "cancelled", 10, 5, 0)
+    job = get_job("j1")
+    assert job["status"] == "cancelled"
+    assert job["profile"] == {"stages_ms": {"embed": 12.5}}
+
+
+def test_older_table_migrated(tmp_path, monkeypatch):
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE jobs (job_id TEXT PRIMARY KEY, collection_name TEXT NOT NULL, "
+        "upload_id TEXT NOT NULL, status TEXT NOT NULL, total_records INTEGER DEFAULT 0, "
+        "processed INTEGER DEFAULT 0, failed INTEGER DEFAULT 0, error_sample TEXT, "
+        "created_at TEXT, updated_at TEXT)"
+    )
+    conn.commit()
+    conn.close()
+    monkeypatch.setenv("SQLITE_PATH", str(path))
+    upsert_job("j1", "docs", "u1", "completed", profile={"chunks": 3})
+    assert get_job("j1")["profile"] == {"chunks": 3}
+
+
+class _StaleColumns:
+    """Connection whose table_info predates the profile column, as if read before another process migrated."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, *args):
+        if sql.startswith("PRAGMA"):
+            return [{"name": "job_id"}]
+        return self.conn.execute(sql, *args)
+
+
+def test_migration_tolerates_concurrent_migration(tmp_path):
+    conn = sqlite3.connect(tmp_path / "jobs.db")
+    conn.executescript(repo.SCHEMA)
+    # The ALTER fails with a duplicate column, which is not an error here
+    repo._migrate(_StaleColumns(conn))
+    conn.close()
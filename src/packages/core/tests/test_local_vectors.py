@@ -0,0 +1,102 @@
+"""Tests for the local memory-mapped vector store."""
+import numpy as np
+import pytest
+
+from semantic_search_core.search.local import (
+    append_documents,
+    create_store,
+    delete_store,
+    open_store,
+    search_knn,
+)
+
+
+def _doc(doc_id, embedding, **metadata):
+    return {
+        "doc_id": doc_id,
+        "title": doc_id.upper(),
+        "body": f"body of {doc_id}",
+        "metadata": metadata,
+        "embedding": embedding,
+    }
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    path = str(tmp_path / "collection_docs")
+    create_store(path, 2)
+    append_documents(path, [
+        _doc("a", [1.0, 0.0], lang="en", year=2020),
+        _doc("b", [0.0, 1.0], lang="fr", year=2021),
+        _doc("c", [0.9, 0.1], lang="en", year=2021),
+    ])
+    return path
+
+
+def test_exact_knn_order_and_scores(store_dir):
+    hits = search_knn(open_store(store_dir), [1.0, 0.0], k=2, size=2)
+    assert [h["doc_id"] for h in hits] == ["a", "c"]
+    # OpenSearch l2 score: 1 / (1 + squared distance)
+    assert hits[0]["score"] == pytest.approx(1.0)
+    assert hits[1]["score"] == pytest.approx(1 / (1 + 0.02))
+    assert hits[0]["body"] is None and hits[0]["snippet"] == "body of a"
+
+
+def test_filters_are_masks(store_dir):
+    store = open_store(store_dir)
+    hits = search_knn(store, [1.0, 0.0], k=10, filters={"lang": "en", "year": 2021}, include_body=True)
+    assert [h["doc_id"] for h in hits] == ["c"]
+    assert hits[0]["body"] == "body of c"
+    assert search_knn(store, [1.0, 0.0], filters={"lang": "de"}) == []
+
+
+def test_rewritten_doc_replaces_row_and_reloads(store_dir):
+    assert len(open_store(store_dir)) == 3
+    append_documents(store_dir, [_doc("a", [0.0, 1.0], lang="en")])
+    store = open_store(store_dir)
+    assert len(store) == 3
+    hits = search_knn(store, [0.0, 1.0], k=3, size=3)
+    assert [h["doc_id"] for h in hits][:2] in (["a", "b"], ["b", "a"])
+
+
+def test_reload_reads_only_appended_docs(store_dir):
+    first = open_store(store_dir)
+    append_documents(store_dir, [_doc("d", [0.5, 0.5], lang="de")])
+    store = open_store(store_dir)
+    # Earlier rows are carried over, not parsed again
+    assert store.docs[0] is first.docs[0]
+    assert [d["doc_id"] for d in store.docs] == ["a", "b", "c", "d"]
+
+    delete_store(store_dir)
+    create_store(store_dir, 2)
+    append_documents(store_dir, [_doc("e", [1.0, 0.0])])
+    assert [d["doc_id"] for d in open_store(store_dir).docs] == ["e"]
+
+
+def test_reload_after_docs_written(store_dir):
+    assert len(open_store(store_dir)) == 3
+    # A read between the vector write and the doc line write of an append
+    with open(f"{store_dir}/vectors.bin", "ab") as f:
+        f.write(np.asarray([[0.5, 0.5]], dtype=np.float32).tobytes())
+    assert len(open_store(store_dir)) == 3
+    with open(f"{store_dir}/docs.jsonl", "a") as f:
+        f.write('{"doc_id": "d", "title": "D", "body": "", "metadata": {}}\n')
+    assert len(open_store(store_dir)) == 4
+
+
+def test_float16_store(tmp_path):
+    path = str(tmp_path / "fp16")
+    create_store(path, 3, dtype="float16")
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 3))
+    append_documents(path, [_doc(f"d{i}", v.tolist()) for i, v in enumerate(vectors)])
+    store = open_store(path)
+    assert store.embeddings.dtype == np.float16
+    hits = search_knn(store, vectors[7].tolist(), k=1, size=1)
+    assert hits[0]["doc_id"] == "d7"
+
+
+def test_missing_and_deleted_store(store_dir, tmp_path):
+    assert open_store(str(tmp_path / "nope")) is None
+    delete_store(store_dir)
+    assert open_store(store_dir) is None
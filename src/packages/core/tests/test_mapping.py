@@ -0,0 +1,36 @@
+"""Tests for index mapping configuration."""
+from semantic_search_core.search import IndexSettings
+from semantic_search_core.search.opensearch import get_index_mapping, get_index_settings
+
+
+def test_mapping_excludes_embedding_from_source():
+    mapping = get_index_mapping(384)["mappings"]
+    assert mapping["_source"] == {"excludes": ["embedding"]}
+    assert mapping["_meta"]["embedding_in_source"] is False
+
+
+def test_mapping_can_keep_embedding_in_source():
+    mapping = get_index_mapping(384, exclude_embedding_source=False)["mappings"]
+    assert mapping["_source"] == {}
+    assert mapping["_meta"]["embedding_in_source"] is True
+
+
+def test_mapping_declares_typed_metadata():
+    mapping = get_index_mapping(384, metadata_types={"year": "integer", "lang": "keyword"})["mappings"]
+    assert mapping["properties"]["metadata"]["properties"] == {
+        "year": {"type": "long"},
+        "lang": {"type": "keyword"},
+    }
+    assert mapping["_meta"]["metadata_types"] == {"year": "integer", "lang": "keyword"}
+
+
+def test_mapping_applies_index_settings():
+    settings = IndexSettings(m=32, ef_search=256, shards=3, replicas=1)
+    mapping = get_index_mapping(384, index_settings=settings)
+    assert mapping["settings"]["index"]["number_of_shards"] == 3
+    assert mapping["settings"]["index"]["number_of_replicas"] == 1
+    # faiss reads ef_search from the method, not the index settings
+    assert "knn.algo_param.ef_search" not in mapping["settings"]["index"]
+    parameters = mapping["mappings"]["properties"]["embedding"]["method"]["parameters"]
+    assert parameters == {"m": 32, "ef_construction": 128, "ef_search": 256}
+    assert get_index_settings(settings, engine="nmslib")["knn.algo_param.ef_search"] == 256
@@ -0,0 +1,78 @@
+"""Tests for typed metadata and filters."""
+import pytest
+
+from semantic_search_core.search.local import LocalBackend
+from semantic_search_core.search.metadata import coerce_metadata, parse_filters
+from semantic_search_core.search.opensearch import build_doc, search_knn
+from semantic_search_core.util import ValidationError
+
+
+class _FakeClient:
+    def __init__(self):
+        self.bodies = []
+
+    def search(self, index, body):
+        self.bodies.append(body)
+        return {"hits": {"hits": []}}
+
+    def count(self, index, body):
+        return {"count": 10**6}
+
+
+def test_coerce_metadata():
+    types = {"year": "integer", "score": "float", "draft": "boolean", "lang": "keyword"}
+    meta = {"year": "2021", "score": "0.5", "draft": "no", "lang": 7, "other": "x"}
+    assert coerce_metadata(meta, types) == {
+        "year": 2021, "score": 0.5, "draft": False, "lang": "7", "other": "x"
+    }
+    # Values that do not fit the type are dropped
+    assert coerce_metadata({"year": "soon", "day": "2021-13-01"}, {"year": "integer", "day": "date"}) == {}
+
+
+def test_parse_filters_rejects_malformed():
+    assert parse_filters({"lang": {"not": ["de"]}}) == [("lang", "terms", ["de"], True)]
+    with pytest.raises(ValidationError):
+        parse_filters({"year": {"from": 2020}})
+    with pytest.raises(ValidationError):
+        parse_filters({"lang": []})
+
+
+def test_filter_clauses_use_declared_types():
+    client = _FakeClient()
+    filters = {
+        "lang": ["en", "fr"],
+        "year": {"gte": 2020},
+        "status": {"not": "draft"},
+        "source": "web",
+    }
+    search_knn(client, "idx", [0.1], filters=filters, metadata_types={"lang": "keyword"})
+    clauses = client.bodies[0]["query"]["bool"]["filter"]
+    assert clauses == [
+        {"terms": {"metadata.lang": ["en", "fr"]}},
+        {"range": {"metadata.year": {"gte": 2020}}},
+        {"bool": {"must_not": [{"term": {"metadata.status.keyword": "draft"}}]}},
+        {"term": {"metadata.source.keyword": "web"}},
+    ]
+
+
+def test_local_filters_match_opensearch_semantics(tmp_path):
+    backend = LocalBackend(root=str(tmp_path))
+    backend.ensure_collection("Docs", 2, "test-model", metadata_types={"year": "integer"})
+    rows = [("a", {"year": 2019, "lang": "en"}), ("b", {"year": 2021, "lang": "fr"}), ("c", {"year": 2023})]
+    backend.index_documents("Docs", [
+        build_doc(doc_id, "Docs", "", "text", meta, "f.csv", i + 1, [1.0, 0.0])
+        for i, (doc_id, meta) in enumerate(rows)
+    ])
+
+    def ids(filters):
+        return sorted(h["doc_id"] for h in backend.search_knn("Docs", [1.0, 0.0], k=10, filters=filters))
+
+    assert ids({"year": {"gt": 2019, "lte": 2023}}) == ["b", "c"]
+    assert ids({"lang": ["en", "fr"]}) == ["a", "b"]
+    # A missing field satisfies a negation, as with must_not
+    assert ids({"lang": {"not": "en"}}) == ["b", "c"]
+    assert ids({"year": {"not": {"lt": 2021}}, "lang": "fr"}) == ["b"]
+
+    backend.ensure_collection("Docs", 2, metadata_types={"lang": "keyword"})
+    info = backend.get_collection_info("Docs")
+    assert info.metadata_types == {"year": "integer", "lang": "keyword"}
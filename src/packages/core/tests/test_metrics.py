@@ -0,0 +1,57 @@
+"""Tests for Prometheus metrics."""
+from prometheus_client import REGISTRY
+
+from semantic_search_core.metrics import collect_timings, format_server_timing, render_metrics, timed
+from semantic_search_core.search.local import LocalBackend
+from semantic_search_core.search.opensearch import build_doc
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_search_and_bulk_metrics(tmp_path):
+    backend = LocalBackend(root=str(tmp_path))
+    backend.ensure_collection("Docs", 2, "test-model")
+    bulk_before = _sample("semantic_search_bulk_seconds_count", backend="local")
+    docs_before = _sample("semantic_search_bulk_docs_total", backend="local", result="indexed")
+    knn_before = _sample("semantic_search_leg_seconds_count", backend="local", leg="knn")
+    bm25_before = _sample("semantic_search_leg_seconds_count", backend="local", leg="bm25")
+    fusion_before = _sample("semantic_search_fusion_seconds_count")
+
+    backend.index_documents("Docs", [
+        build_doc("a", "Docs", "A", "cats purr", {}, "f.csv", 1, [1.0, 0.0]),
+        build_doc("b", "Docs", "B", "dogs bark", {}, "f.csv", 2, [0.0, 1.0]),
+    ])
+    backend.search_hybrid("Docs", "cats", [1.0, 0.0], k=2)
+
+    assert _sample("semantic_search_bulk_seconds_count", backend="local") == bulk_before + 1
+    assert _sample("semantic_search_bulk_docs_total", backend="local", result="indexed") == docs_before + 2
+    assert _sample("semantic_search_leg_seconds_count", backend="local", leg="knn") == knn_before + 1
+    assert _sample("semantic_search_leg_seconds_count", backend="local", leg="bm25") == bm25_before + 1
+    assert _sample("semantic_search_fusion_seconds_count") == fusion_before + 1
+
+
+def test_render_metrics():
+    body, content_type = render_metrics()
+    assert content_type.startswith("text/plain")
+    assert b"semantic_search_query_embed_seconds_bucket" in body
+    assert b"# TYPE semantic_search_llm_tokens histogram" in body
+
+
+def test_stage_timings(tmp_path):
+    backend = LocalBackend(root=str(tmp_path))
+    backend.ensure_collection("Docs", 2, "test-model")
+    backend.index_documents("Docs", [build_doc("a", "Docs", "A", "cats purr", {}, "f.csv", 1, [1.0, 0.0])])
+    # Outside a collect_timings block nothing is recorded
+    backend.search_bm25("Docs", "cats")
+
+    with collect_timings() as timings:
+        with timed("collection"):
+            backend.get_collection_info("Docs")
+        backend.search_hybrid("Docs", "cats", [1.0, 0.0], k=1)
+        backend.search_bm25("Docs", "purr")
+    assert list(timings) == ["collection", "knn", "bm25", "fusion"]
+    assert all(ms >= 0 for ms in timings.values())
+
+    assert format_server_timing({"encode": 1.5, "knn": 10.0}) == "encode;dur=1.5, knn;dur=10.0"
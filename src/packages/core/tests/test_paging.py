@@ -0,0 +1,32 @@
+"""Tests for search cursors."""
+import pytest
+
+from semantic_search_core.search.paging import (
+    decode_cursor,
+    encode_cursor,
+    get_candidates,
+    query_fingerprint,
+    store_candidates,
+)
+from semantic_search_core.util import ValidationError
+
+
+def test_cursor_roundtrip():
+    state = {"q": query_fingerprint("docs", "hello"), "pit": "abc", "after": [1.5, "d1"]}
+    assert decode_cursor(encode_cursor(state)) == state
+
+
+def test_invalid_cursor():
+    with pytest.raises(ValidationError):
+        decode_cursor("not-a-cursor!")
+
+
+def test_candidate_cache():
+    cache_id = store_candidates([{"doc_id": "a"}, {"doc_id": "b"}])
+    assert [c["doc_id"] for c in get_candidates(cache_id)] == ["a", "b"]
+    assert get_candidates("unknown") is None
+
+
+def test_fingerprint_depends_on_parameters():
+    assert query_fingerprint("docs", "a", {"x": 1}) == query_fingerprint("docs", "a", {"x": 1})
+    assert query_fingerprint("docs", "a") != query_fingerprint("docs", "b")
@@ -0,0 +1,164 @@
+"""Tests for OpenSearch query building."""
+from semantic_search_core.search.opensearch import (
+    get_document,
+    search_batch,
+    search_bm25,
+    search_bm25_page,
+    search_knn,
+)
+
+
+class _FakeClient:
+    def __init__(self, hits=None):
+        self.hits = hits or []
+        self.bodies = []
+
+    def search(self, index, body):
+        self.bodies.append(body)
+        return {"hits": {"hits": self.hits}}
+
+
+def test_source_never_includes_embedding():
+    client = _FakeClient()
+    search_knn(client, "idx", [0.1, 0.2], size=5)
+    source = client.bodies[0]["_source"]
+    assert "embedding" in source["excludes"]
+    assert "body" not in source["includes"]
+
+    search_bm25(client, "idx", "hello", include_body=True)
+    assert "body" in client.bodies[1]["_source"]["includes"]
+
+
+def test_get_document_by_id():
+    client = _FakeClient([{"_source": {"doc_id": "d1", "title": "T", "body": "full text"}, "_score": 1.0}])
+    doc = get_document(client, "idx", "d1")
+    assert doc["body"] == "full text" and doc["score"] is None
+    body = client.bodies[0]
+    assert body["query"] == {"ids": {"values": ["d1"]}}
+    assert "body" in body["_source"]["includes"]
+    assert get_document(_FakeClient(), "idx", "d2") is None
+
+
+def test_knn_candidates_and_ef_search():
+    client = _FakeClient()
+    search_knn(client, "idx", [0.1], k=40, size=10, ef_search=200)
+    body = client.bodies[0]
+    assert body["size"] == 10
+    assert body["query"]["knn"]["embedding"]["k"] == 40
+    assert body["query"]["knn"]["embedding"]["method_parameters"] == {"ef_search": 200}
+
+
+def test_knn_highlights_against_query_text():
+    client = _FakeClient()
+    search_knn(client, "idx", [0.1], query_text="hello")
+    highlight = client.bodies[0]["highlight"]
+    assert highlight["highlight_query"] == {"match": {"body": "hello"}}
+
+
+def test_snippet_from_highlight():
+    client = _FakeClient(hits=[
+        {
+            "_score": 1.5,
+            "_source": {"doc_id": "a", "title": "A", "metadata": {}},
+            "highlight": {"body": ["the matched hello fragment"]},
+        }
+    ])
+    [hit] = search_bm25(client, "idx", "hello")
+    assert hit["snippet"] == "the matched hello fragment"
+    assert hit["body"] is None
+
+
+def test_bm25_page_uses_point_in_time():
+    class _PitClient(_FakeClient):
+        deleted = None
+
+        def create_pit(self, index, keep_alive):
+            return {"pit_id": "pit-1"}
+
+        def search(self, body, index=None):
+            self.bodies.append(body)
+            return {"pit_id": "pit-1", "hits": {"hits": self.hits}}
+
+        def delete_pit(self, body):
+            self.deleted = body
+
+    hit = {"_score": 2.0, "_source": {"doc_id": "a"}, "sort": [2.0, "a"]}
+    client = _PitClient(hits=[hit])
+    hits, pit_id, after = search_bm25_page(client, "idx", "hello", size=1)
+    assert (pit_id, after) == ("pit-1", [2.0, "a"])
+    assert client.bodies[0]["pit"]["id"] == "pit-1"
+
+    client.hits = []
+    hits, pit_id, after = search_bm25_page(client, "idx", "hello", size=1, pit_id="pit-1", search_after=after)
+    assert hits == [] and after is None
+    assert client.bodies[1]["search_after"] == [2.0, "a"]
+    assert client.deleted == {"pit_id": ["pit-1"]}
+
+
+def test_search_batch_fuses_hybrid_and_reports_errors():
+    class _MsearchClient:
+        def msearch(self, body):
+            self.body = body
+            hit = {"_score": 1.0, "_source": {"doc_id": "a", "title": "A", "metadata": {}}}
+            return {"responses": [
+                {"hits": {"hits": [hit]}},
+                {"hits": {"hits": [hit]}},
+                {"error": {"reason": "no such index"}},
+            ]}
+
+    client = _MsearchClient()
+    out = search_batch(client, [
+        {"index_name": "i1", "mode": "hybrid", "query_text": "q", "query_embedding": [0.1], "k": 5},
+        {"index_name": "i2", "mode": "bm25", "query_text": "q", "k": 5},
+    ])
+    assert len(client.body) == 6
+    assert [h["doc_id"] for h in out[0]["hits"]] == ["a"]
+    assert out[0]["error"] is None
+    assert out[1] == {"hits": [], "error": "no such index"}
+
+
+def test_filtered_knn_plans_by_engine_and_selectivity(monkeypatch):
+    class _CountClient(_FakeClient):
+        matching = 50000
+
+        def count(self, index, body):
+            self.counted = body
+            return {"count": self.matching}
+
+    monkeypatch.setenv("KNN_EXACT_MAX_DOCS", "1000")
+    filters = {"lang": "en"}
+
+    client = _CountClient()
+    search_knn(client, "idx-faiss", [0.1], filters=filters, size=5, knn_engine="faiss")
+    knn = client.bodies[0]["query"]["knn"]["embedding"]
+    assert knn["filter"] == {"bool": {"filter": [{"term": {"metadata.lang.keyword": "en"}}]}}
+    assert client.counted == {"query": knn["filter"]}
+
+    search_knn(client, "idx-nmslib", [0.1], filters=filters, size=5, knn_engine="nmslib")
+    assert "bool" in client.bodies[1]["query"]
+
+    client.matching = 20
+    search_knn(client, "idx-small", [0.1], filters=filters, size=5, knn_engine="faiss")
+    script = client.bodies[2]["query"]["script_score"]
+    assert script["script"]["source"] == "knn_score"
+    assert script["query"] == {"bool": {"filter": [{"term": {"metadata.lang.keyword": "en"}}]}}
+
+
+def test_filter_count_is_cached_and_skipped_on_small_indexes(monkeypatch):
+    class _CountClient(_FakeClient):
+        counts = 0
+
+        def count(self, index, body):
+            self.counts += 1
+            return {"count": 50000}
+
+    monkeypatch.setenv("KNN_EXACT_MAX_DOCS", "1000")
+    client = _CountClient()
+    for _ in range(3):
+        search_knn(client, "idx-repeat", [0.1], filters={"lang": "de"}, size=5, knn_engine="faiss")
+    assert client.counts == 1
+
+    # An index no larger than the exact-search limit is searched exactly uncounted
+    search_knn(client, "idx-tiny", [0.1], filters={"lang": "de"}, size=5, knn_engine="faiss", doc_count=800)
+    assert client.counts == 1
+    assert "script_score" in client.bodies[-1]["query"]
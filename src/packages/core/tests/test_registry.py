@@ -0,0 +1,82 @@
+"""Tests for the collection registry cache."""
+from opensearchpy import NotFoundError
+
+from semantic_search_core.search.opensearch import (
+    OpenSearchBackend,
+    get_collection_info,
+    invalidate_collection,
+)
+
+
+class _FakeIndices:
+    def __init__(self, indexes):
+        self.indexes = indexes
+        self.calls = 0
+
+    def get(self, index):
+        self.calls += 1
+        if index not in self.indexes:
+            raise NotFoundError(404, "index_not_found_exception", {})
+        return {index: self.indexes[index]}
+
+
+class _FakeClient:
+    def __init__(self, indexes):
+        self.indices = _FakeIndices(indexes)
+
+    def count(self, index):
+        return {"count": 7}
+
+
+def test_registry_caches_existing_collection():
+    invalidate_collection()
+    client = _FakeClient({
+        "collection_docs": {
+            "mappings": {
+                "_meta": {"embedding_dim": 384, "embed_model": "mini"},
+                "properties": {},
+            },
+            "settings": {"index": {"number_of_shards": "1"}},
+        }
+    })
+    info = get_collection_info(client, "docs")
+    assert info.index_name == "collection_docs"
+    assert info.embedding_dim == 384
+    assert info.embed_model == "mini"
+    assert info.doc_count == 7
+    assert get_collection_info(client, "docs") is info
+    assert client.indices.calls == 1
+
+    invalidate_collection("docs")
+    get_collection_info(client, "docs")
+    assert client.indices.calls == 2
+
+
+def test_registry_does_not_cache_missing_collection():
+    invalidate_collection()
+    client = _FakeClient({})
+    assert get_collection_info(client, "missing") is None
+    assert get_collection_info(client, "missing") is None
+    assert client.indices.calls == 2
+
+
+def test_registry_reads_dim_from_legacy_mapping():
+    invalidate_collection()
+    client = _FakeClient({
+        "collection_old": {
+            "mappings": {"properties": {"embedding": {"dimension": 768}}},
+        }
+    })
+    info = get_collection_info(client, "old")
+    assert info.embedding_dim == 768
+    assert info.embed_model is None
+
+
+def test_finished_indexing_drops_cached_count(monkeypatch):
+    invalidate_collection()
+    client = _FakeClient({"collection_docs": {"mappings": {"properties": {}}}})
+    get_collection_info(client, "docs")
+    monkeypatch.setattr("semantic_search_core.search.opensearch.backend.finish_load", lambda c, name: None)
+    OpenSearchBackend(client).finish_indexing("docs")
+    get_collection_info(client, "docs")
+    assert client.indices.calls == 2
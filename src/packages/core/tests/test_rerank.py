@@ -0,0 +1,79 @@
+"""Tests for cross-encoder reranking."""
+import time
+
+import pytest
+
+from semantic_search_core.search import rerank as rerank_module
+from semantic_search_core.search.rerank import rerank
+
+
+class FakeCrossEncoder:
+    """Scores a passage by how often the query appears in it."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches: list[int] = []
+
+    def predict(self, pairs, batch_size=32):
+        time.sleep(self.delay)
+        self.batches.append(len(pairs))
+        return [passage.count(query) for query, passage in pairs]
+
+
+def _hits(*bodies):
+    return [{"doc_id": f"d{i}", "title": f"d{i}", "body": b, "score": 1.0 / (i + 1)} for i, b in enumerate(bodies)]
+
+
+@pytest.fixture(autouse=True)
+def _no_pair_cost(monkeypatch):
+    monkeypatch.setattr(rerank_module, "_pair_seconds", None)
+
+
+def test_rerank_orders_top_n_by_score():
+    hits = _hits("x", "cat cat", "cat", "cat cat cat")
+    out, stats = rerank("cat", hits, FakeCrossEncoder(), top_n=3, batch_size=2)
+    assert stats["scored"] == 3 and stats["over_budget_ms"] == 0
+    assert [h["doc_id"] for h in out] == ["d1", "d2", "d0", "d3"]
+    assert out[0]["rerank_score"] == 2.0 and out[0]["score"] == 0.5
+    assert out[3]["rerank_score"] is None
+    # Input hits are not modified
+    assert "rerank_score" not in hits[1]
+
+
+def test_rerank_scores_in_batches():
+    model = FakeCrossEncoder()
+    rerank("cat", _hits(*["cat"] * 6), model, top_n=6, batch_size=2)
+    # One pair first to measure the cost, then full batches
+    assert model.batches == [1, 2, 2, 1]
+
+
+def test_rerank_sizes_batches_to_the_budget(monkeypatch):
+    monkeypatch.setattr(rerank_module, "_pair_seconds", 0.02)
+    model = FakeCrossEncoder(delay=0.02)
+    hits = _hits("x", "cat", "cat cat", "cat cat cat", "cat", "cat")
+    out, stats = rerank("cat", hits, model, top_n=6, batch_size=4, time_budget=0.05)
+    # Only what fits the budget is scored; the rest keeps the fused order
+    assert model.batches[0] == 2 and stats["scored"] < 6
+    scored = stats["scored"]
+    assert [h["doc_id"] for h in out[scored:]] == [h["doc_id"] for h in hits[scored:]]
+    best = max(hits[:scored], key=lambda h: h["body"].count("cat"))
+    assert out[0]["doc_id"] == best["doc_id"]
+
+
+def test_rerank_reports_overrun():
+    model = FakeCrossEncoder(delay=0.05)
+    hits = _hits("x", "cat")
+    out, stats = rerank("cat", hits, model, top_n=2, batch_size=2, time_budget=0.01)
+    # The first pair alone overruns the budget, and its score is still used
+    assert stats["scored"] == 1 and stats["over_budget_ms"] > 0
+    assert [h["doc_id"] for h in out] == ["d0", "d1"]
+
+
+def test_rerank_falls_back_on_model_error():
+    class Broken:
+        def predict(self, pairs, batch_size=32):
+            raise RuntimeError("boom")
+
+    hits = _hits("a", "b")
+    out, stats = rerank("q", hits, Broken())
+    assert out is hits and stats["scored"] == 0